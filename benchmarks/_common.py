@@ -0,0 +1,128 @@
+"""基准测试公共工具"""
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from starlette.requests import Request
+from tortoise import Tortoise
+
+from quark import config
+
+
+def init_config(**kwargs: Any) -> None:
+    """初始化基准测试配置"""
+    config.init(
+        {
+            "APP_NAME": "QuarkPy",
+            "APP_VERSION": "bench",
+            "APP_SECRET_KEY": "bench-secret-key",
+            "MODULE_PATH": os.path.join(os.path.dirname(__file__), "app"),
+            **kwargs,
+        }
+    )
+
+
+async def init_db(seed: bool = True) -> None:
+    """初始化内存数据库"""
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={"models": ["quark.models"]},
+        use_tz=False,
+    )
+    await Tortoise.generate_schemas()
+    if seed:
+        from quark.install import setup_all
+
+        await setup_all()
+
+
+async def close_db() -> None:
+    """关闭数据库连接"""
+    await Tortoise.close_connections()
+
+
+def make_request(
+    path: str,
+    query_string: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    method: str = "GET",
+    app: Any = None,
+) -> Request:
+    """构造请求对象"""
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [
+            (key.lower().encode(), value.encode())
+            for key, value in (headers or {}).items()
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+        "state": {},
+    }
+    if app is not None:
+        scope["app"] = app
+    return Request(scope)
+
+
+async def call_asgi(app: Any, scope: Dict[str, Any], body: bytes = b"") -> int:
+    """直接调用 ASGI 应用，返回响应状态码"""
+    status = 0
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+def http_scope(
+    path: str,
+    query_string: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    method: str = "GET",
+) -> Dict[str, Any]:
+    """构造 ASGI http scope"""
+    return dict(make_request(path, query_string, headers, method).scope)
+
+
+async def measure(fn: Callable, iterations: int) -> List[float]:
+    """执行并记录每次耗时（毫秒）"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: List[float]) -> Dict[str, float]:
+    """输出 p50/p99 统计"""
+    ordered = sorted(samples)
+    result = {
+        "p50": statistics.median(ordered),
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        "mean": statistics.fmean(ordered),
+    }
+    print(
+        f"{name:<32} p50={result['p50']:.3f}ms "
+        f"p99={result['p99']:.3f}ms mean={result['mean']:.3f}ms"
+    )
+    return result
@@ -0,0 +1,101 @@
+"""
+图片地址解析基准：逐行查询附件 vs 整页批量预加载
+
+渲染 100 行带头像（附件ID）的用户列表，统计每次请求的查询次数
+
+用法：python benchmarks/attachment_urls.py
+"""
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from _common import close_db, init_config, init_db, make_request, measure, report
+
+from quark import config_cache
+from quark.component.form import field
+from quark.models import Attachment
+from quark.services import attachment as attachment_module
+from quark.template.row_serializer import RowSerializer
+
+ROWS = 100
+ITERATIONS = 30
+
+
+class QueryCounter(logging.Handler):
+    """按数据库客户端日志统计查询次数"""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+async def legacy_image_url(id) -> str:
+    """改造前的实现：每个附件ID一次查询"""
+    attachment = await Attachment.filter(id=id, status=1).first()
+    return attachment.url if attachment else "/admin/default.png"
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    await config_cache.load()
+
+    attachments = [
+        Attachment(
+            name=f"avatar-{i}.png",
+            type="IMAGE",
+            path=f"./web/app/storage/images/avatar-{i}.png",
+            url=f"./web/app/storage/images/avatar-{i}.png",
+            hash=f"hash-{i}",
+        )
+        for i in range(ROWS)
+    ]
+    await Attachment.bulk_create(attachments)
+    ids = await Attachment.all().order_by("id").values_list("id", flat=True)
+    rows = [SimpleNamespace(id=i, avatar=id) for i, id in enumerate(ids)]
+
+    request = make_request("/api/admin/user/index")
+    fields = [field.id("id", "ID"), field.image("avatar", "头像")]
+
+    counter = QueryCounter()
+    db_logger = logging.getLogger("tortoise.db_client")
+    db_logger.setLevel(logging.DEBUG)
+    db_logger.addHandler(counter)
+
+    async def before():
+        return [await legacy_image_url(row.avatar) for row in rows]
+
+    async def after():
+        attachment_module.forget(ids)
+        return await RowSerializer(request, fields).serialize_all(rows)
+
+    async def after_warm():
+        return await RowSerializer(request, fields).serialize_all(rows)
+
+    for name, fn in (
+        ("before (query per row)", before),
+        ("after (batched, cold cache)", after),
+        ("after (batched, warm cache)", after_warm),
+    ):
+        counter.count = 0
+        await fn()
+        print(f"{name}: queries/request={counter.count}")
+
+    db_logger.removeHandler(counter)
+    db_logger.setLevel(logging.WARNING)
+
+    result = await after()
+    assert all(row["avatar"].endswith(".png") for row in result)
+
+    report("before (query per row)", await measure(before, ITERATIONS))
+    report("after (batched, cold cache)", await measure(after, ITERATIONS))
+    report("after (batched, warm cache)", await measure(after_warm, ITERATIONS))
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""
+缓存后端基准：共享缓存逐个读取 vs 批量读取 vs 两级缓存（本地 LRU + 远端）
+
+未设置 CACHE_URL 环境变量时，远端为进程内替身：每次调用模拟一次网络往返，
+并以进程内队列模拟 Redis 发布订阅；设置 CACHE_URL=redis://... 时使用真实 Redis
+
+两个 TieredBackend 实例模拟两个 worker，验证一方写入后另一方的本地副本失效
+
+用法：python benchmarks/cache_backends.py
+"""
+import asyncio
+import os
+from typing import AsyncIterator, Dict, List
+
+from _common import measure, report
+
+from quark import cache
+
+ITERATIONS = 500
+
+# 模拟的网络往返（秒）
+RTT = 0.0005
+
+KEYS = [f"bench:{i}" for i in range(20)]
+
+
+class RemoteStandIn(cache.MemoryBackend):
+    """远端替身：每次调用等待一次往返，值经过 JSON 编码，支持发布订阅"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def get(self, key):
+        await asyncio.sleep(RTT)
+        return await super().get(key)
+
+    async def get_many(self, keys):
+        await asyncio.sleep(RTT)
+        result = {}
+        for key in keys:
+            value = await super().get(key)
+            if value is not None:
+                result[key] = value
+        return result
+
+    async def get_with_ttl(self, key):
+        await asyncio.sleep(RTT)
+        return await super().get_with_ttl(key)
+
+    async def get_many_with_ttl(self, keys):
+        await asyncio.sleep(RTT)
+        result = {}
+        for key in keys:
+            value, ttl = await super().get_with_ttl(key)
+            if value is not None:
+                result[key] = (value, ttl)
+        return result
+
+    async def set(self, key, value, expire=None):
+        await asyncio.sleep(RTT)
+        await super().set(key, value, expire)
+
+    async def set_many(self, mapping, expire=None):
+        await asyncio.sleep(RTT)
+        for key, value in mapping.items():
+            await super().set(key, value, expire)
+
+    async def publish(self, channel: str, message: str) -> None:
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait(message)
+
+    async def listen(self, channel: str) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self.subscribers.setdefault(channel, []).append(queue)
+        while True:
+            yield await queue.get()
+
+
+async def main() -> None:
+    url = os.environ.get("CACHE_URL")
+    if url:
+        remote = cache.RedisBackend(url)
+        other_remote = cache.RedisBackend(url)
+    else:
+        remote = other_remote = RemoteStandIn()
+
+    channel = "quark-bench:invalidate"
+    worker = cache.TieredBackend(remote, 1000, 5, channel)
+    other = cache.TieredBackend(other_remote, 1000, 5, channel)
+    worker.start()
+    other.start()
+    await asyncio.sleep(0.05)
+
+    await remote.set_many({key: {"value": key} for key in KEYS}, 60)
+
+    async def remote_get():
+        for key in KEYS:
+            await remote.get(key)
+
+    async def remote_get_many():
+        await remote.get_many(KEYS)
+
+    async def tiered_get_many():
+        await worker.get_many(KEYS)
+
+    print(f"read {len(KEYS)} keys per iteration")
+    report("before (remote get x20)", await measure(remote_get, ITERATIONS // 10))
+    report("after (remote get_many)", await measure(remote_get_many, ITERATIONS))
+    report("after (tiered get_many)", await measure(tiered_get_many, ITERATIONS))
+    print(
+        f"   tiered hits={worker.hits} misses={worker.misses} local={len(worker._local)}"
+    )
+
+    # 另一个 worker 写入后，本 worker 的本地副本通过发布订阅失效
+    assert await worker.get(KEYS[0]) == {"value": KEYS[0]}
+    await other.set(KEYS[0], {"value": "changed"}, 60)
+    await asyncio.sleep(0.05)
+    assert await worker.get(KEYS[0]) == {"value": "changed"}
+    await other.delete(KEYS[1])
+    await asyncio.sleep(0.05)
+    assert await worker.get(KEYS[1]) is None
+    print("cross-worker invalidation: ok")
+
+    await worker.close()
+    await other.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+验证码接口基准：每次请求渲染 vs 预渲染验证码池
+
+用法：python benchmarks/captcha_pool.py
+"""
+import asyncio
+import base64
+import random
+import string
+import uuid
+
+from _common import make_request, measure, report
+
+from quark import Message, cache, captcha_pool
+from quark.captcha_pool import render_captcha
+from quark.template.auth import Auth
+
+ITERATIONS = 100
+
+
+async def legacy_captcha() -> Message:
+    """改造前的实现：每次请求同步渲染"""
+    id = str(uuid.uuid4())
+    captcha_text = "".join(random.choices(string.digits, k=4))
+    await cache.set(id, captcha_text, 60)
+    image = render_captcha(captcha_text)
+    return Message.success(
+        "获取成功",
+        {
+            "captchaEnabled": True,
+            "img": base64.b64encode(image).decode("utf-8"),
+            "uuid": id,
+        },
+    )
+
+
+async def main() -> None:
+    cache.init("bench")
+    request = make_request("/api/admin/auth/index/captcha")
+    auth = Auth()
+
+    report("before (render per request)", await measure(legacy_captcha, ITERATIONS))
+
+    captcha_pool.init(size=ITERATIONS, watermark=0)
+    captcha_pool.start()
+    while captcha_pool.stats()["refilling"]:
+        await asyncio.sleep(0.05)
+
+    report(
+        "after (pre-rendered pool)",
+        await measure(lambda: auth.captcha(request), ITERATIONS),
+    )
+    print("  ", captcha_pool.stats())
+
+    report(
+        "after (pool drained)",
+        await measure(lambda: auth.captcha(request), 20),
+    )
+    print("  ", captcha_pool.stats())
+    await captcha_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+组件响应编码基准：jsonable_encoder + json.dumps vs pydantic-core 直接编码
+
+编码 /api/admin/user/index 页面的组件树，并校验两者输出一致
+
+用法：python benchmarks/component_response.py
+"""
+import asyncio
+import json
+
+from _common import close_db, init_config, init_db, make_request, measure, report
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from quark import ComponentResponse, loader
+from quark.models import User
+
+USERS = 20
+ITERATIONS = 200
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    await User.bulk_create(
+        [
+            User(
+                username=f"bench{i}",
+                nickname=f"用户{i}",
+                email=f"bench{i}@example.com",
+                phone=f"1380000{i:04d}",
+                password="",
+                status=1,
+                last_login_ip=None if i % 2 else "127.0.0.1",
+            )
+            for i in range(USERS)
+        ]
+    )
+
+    request = make_request("/api/admin/user/index")
+    res = await loader.load_resource_object(request, "user", "Resource")
+    page = await res.index_render(request)
+
+    def before():
+        return JSONResponse(content=jsonable_encoder(page, exclude_none=True))
+
+    def after():
+        return ComponentResponse(page)
+
+    old, new = before().body, after().body
+    assert json.loads(old) == json.loads(new)
+    print(f"payload={len(new) / 1024:.1f}KB identical={old == new}")
+
+    async def run_before():
+        return before()
+
+    async def run_after():
+        return after()
+
+    report("before (jsonable_encoder)", await measure(run_before, ITERATIONS))
+    report("after (model_dump_json)", await measure(run_after, ITERATIONS))
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
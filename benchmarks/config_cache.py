@@ -0,0 +1,60 @@
+"""
+网站配置读取基准：每个服务实例加载配置表 vs 进程级配置缓存
+
+模拟图片列表页：每行创建 AttachmentService 并解析图片地址
+
+用法：python benchmarks/config_cache.py
+"""
+import asyncio
+from typing import Dict
+
+from _common import close_db, init_config, init_db, measure, report
+
+from quark import config_cache
+from quark.models.config import Config
+from quark.services.attachment import AttachmentService
+from quark.services.config import ConfigService
+
+ROWS = 20
+ITERATIONS = 50
+
+
+class LegacyConfigService:
+    """改造前的实现：每个实例首次读取时加载整张配置表"""
+
+    def __init__(self):
+        self.web_config: Dict[str, str] = {}
+
+    async def get_value(self, key: str) -> str:
+        if not self.web_config:
+            configs = await Config.filter(status=1).all()
+            self.web_config = {config.name: config.value for config in configs}
+        return self.web_config.get(key, "")
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    await ConfigService().set_value("WEB_SITE_DOMAIN", "example.com")
+    await config_cache.load()
+
+    async def before():
+        for i in range(ROWS):
+            service = AttachmentService()
+            service.config_service = LegacyConfigService()
+            await service.get_image_url(f"./web/app/storage/images/{i}.png")
+
+    async def after():
+        for i in range(ROWS):
+            await AttachmentService().get_image_url(f"./web/app/storage/images/{i}.png")
+
+    print(f"rows/request={ROWS} configs={await Config.all().count()}")
+    report("before (load per service)", await measure(before, ITERATIONS))
+    report("after (process cache)", await measure(after, ITERATIONS))
+    print(config_cache.stats())
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
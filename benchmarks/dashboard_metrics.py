@@ -0,0 +1,89 @@
+"""
+仪表盘渲染基准：逐个计算指标（阻塞 CPU 采样）vs 并发计算、指标缓存及后台采样
+
+用法：python benchmarks/dashboard_metrics.py
+"""
+import asyncio
+import platform
+import sys
+
+import psutil
+from _common import close_db, init_config, init_db, make_request, measure, report
+
+from quark import config, metric_cache, system_monitor
+from quark.app.dashboard import Index
+from quark.app.metrics.system_info import SystemInfo
+from quark.component.descriptions.fields.text import Text
+from quark.models import ActionLog
+
+LOGS = 200000
+ITERATIONS = 20
+
+
+class LegacySystemInfo(SystemInfo):
+    """改造前的实现"""
+
+    cache_ttl: float = 0
+
+    async def calculate(self):
+        memory = psutil.virtual_memory()
+        cpu_percent = psutil.cpu_percent(interval=1)
+        return self.result(
+            [
+                Text().set_label("应用名称").set_value(config.get("APP_NAME")),
+                Text().set_label("应用版本").set_value(config.get("APP_VERSION")),
+                Text().set_label("Python版本").set_value(sys.version.split(" ")[0]),
+                Text()
+                .set_label("服务器操作系统")
+                .set_value(f"{platform.system()} {platform.machine()}"),
+                Text()
+                .set_label("内存信息")
+                .set_value(f"{memory.total // (1024 * 1024)}MB / {memory.percent}%"),
+                Text().set_label("CPU使用率").set_value(f"{cpu_percent}%"),
+            ]
+        )
+
+
+async def legacy_render(cards):
+    """改造前的实现：逐个等待"""
+    return [await v.calculate() for v in cards]
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    await ActionLog.bulk_create(
+        [
+            ActionLog(
+                uid=1, username="bench", url="/", remark="", ip="127.0.0.1", type="ADMIN"
+            )
+            for _ in range(LOGS)
+        ],
+        batch_size=5000,
+    )
+
+    request = make_request("/api/admin/dashboard/index/index")
+    dashboard = Index()
+    cards = await dashboard.cards(request)
+    legacy_cards = [
+        LegacySystemInfo() if isinstance(v, SystemInfo) else v for v in cards
+    ]
+
+    report(
+        "before (sequential, blocking)",
+        await measure(lambda: legacy_render(legacy_cards), 3),
+    )
+
+    system_monitor.start()
+    await dashboard.render(request)
+    report("after (concurrent, cached)", await measure(
+        lambda: dashboard.render(request), ITERATIONS
+    ))
+    print("  ", metric_cache.stats(), await system_monitor.snapshot())
+
+    await system_monitor.close()
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
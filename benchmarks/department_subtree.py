@@ -0,0 +1,81 @@
+"""
+部门子树展开基准：逐层递归查询 vs 部门索引
+
+模拟用户列表按部门筛选时展开全部子部门 ID
+
+用法：python benchmarks/department_subtree.py
+"""
+import asyncio
+
+from _common import close_db, init_config, init_db, measure, report
+
+from quark import department_index
+from quark.models import Department
+
+# 组织架构：每个部门 FANOUT 个子部门，共 DEPTH 层
+FANOUT = 4
+DEPTH = 5
+ITERATIONS = 50
+
+
+async def seed() -> int:
+    """构造多层组织架构，返回根部门ID"""
+    root = await Department.create(name="bench", pid=0, sort=0, status=1)
+    parents = [root.id]
+    for level in range(DEPTH):
+        await Department.bulk_create(
+            [
+                Department(name=f"bench-{level}-{i}", pid=pid, sort=i, status=1)
+                for pid in parents
+                for i in range(FANOUT)
+            ]
+        )
+        parents = await Department.filter(name__startswith=f"bench-{level}-").values_list(
+            "id", flat=True
+        )
+    return root.id
+
+
+async def legacy_children_ids(pid: int, counter: list) -> list:
+    """改造前的实现：每个节点一次查询"""
+    counter[0] += 1
+    departments = await Department.filter(pid=pid, status=1).all()
+    ids = []
+    for department in departments:
+        ids.extend(await legacy_children_ids(department.id, counter))
+        ids.append(department.id)
+    return ids
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    root_id = await seed()
+    total = await Department.all().count()
+
+    counter = [0]
+    legacy_ids = await legacy_children_ids(root_id, counter)
+    ids = await department_index.get_children_ids(root_id)
+    assert set(legacy_ids) == set(ids)
+    print(f"departments={total} subtree={len(ids)} legacy queries/request={counter[0]}")
+
+    async def before():
+        await legacy_children_ids(root_id, [0])
+
+    async def after():
+        await department_index.get_subtree_ids([root_id])
+
+    async def after_cold():
+        department_index.invalidate()
+        await department_index.get_subtree_ids([root_id])
+
+    report("before (recursive queries)", await measure(before, ITERATIONS))
+    report("after (cached index)", await measure(after, ITERATIONS))
+    report("after (reload every request)", await measure(after_cold, ITERATIONS))
+    print(department_index.stats())
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+阻塞任务卸载基准：事件循环内执行 vs 执行池
+
+并发执行登录密码校验（bcrypt）与验证码渲染，同时用心跳任务测量事件循环延迟
+
+用法：python benchmarks/executor_offload.py
+"""
+import asyncio
+import time
+
+from quark import executor, utils
+from quark.captcha_pool import render_captcha
+
+LOGINS = 10
+CAPTCHAS = 50
+TICK = 0.005
+
+
+async def heartbeat(stop: asyncio.Event, lags: list) -> None:
+    """每隔 TICK 唤醒一次，记录实际唤醒的延迟"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def inline_login(hashed: str) -> bool:
+    return utils.verify_password("123456", hashed)
+
+
+async def inline_captcha() -> bytes:
+    return render_captcha("1234")
+
+
+async def offload_login(hashed: str) -> bool:
+    return await executor.run(utils.verify_password, "123456", hashed)
+
+
+async def offload_captcha() -> bytes:
+    return await executor.run_cpu(render_captcha, "1234")
+
+
+async def run(name: str, login, captcha, hashed: str) -> None:
+    stop = asyncio.Event()
+    lags: list = []
+    ticker = asyncio.create_task(heartbeat(stop, lags))
+    await asyncio.sleep(TICK * 2)
+
+    start = time.perf_counter()
+    tasks = [login(hashed) for _ in range(LOGINS)]
+    tasks += [captcha() for _ in range(CAPTCHAS)]
+    results = await asyncio.gather(*tasks)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    stop.set()
+    await ticker
+    assert all(results[:LOGINS])
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] * 1000 if lags else 0.0
+    print(
+        f"{name:<28} total={elapsed:.0f}ms loop_lag_max={lags[-1] * 1000:.1f}ms "
+        f"p99={p99:.1f}ms ticks={len(lags)}"
+    )
+
+
+async def main() -> None:
+    hashed = utils.hash_password("123456")
+    print(f"logins={LOGINS} captchas={CAPTCHAS}")
+    await run("before (event loop)", inline_login, inline_captcha, hashed)
+
+    executor.init(threads=8)
+    await run("after (thread pool)", offload_login, offload_captcha, hashed)
+    print("  ", executor.stats())
+
+    executor.init(threads=8, processes=4)
+    await run("after (threads + processes)", offload_login, offload_captcha, hashed)
+    print("  ", executor.stats())
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+导出基准：全量加载 + 内存工作簿 vs 分批查询 + 只写模式流式导出
+
+用法：python benchmarks/export_stream.py [行数]，默认 50000，
+可传入 1000000 验证百万级日志导出的内存占用（超过 200000 行时跳过旧方式）
+
+每种方式执行两次：一次计时，一次在 tracemalloc 下统计内存峰值
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from io import BytesIO
+from typing import Any, List
+
+from _common import close_db, init_config, init_db, make_request
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+from quark import Request, Resource, loader, models
+from quark.component.form import field
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+BATCH = 10000
+
+
+class ExportActionLog(Resource):
+    """无回调字段的操作日志资源"""
+
+    async def init(self, request: Request):
+        self.model = models.ActionLog
+        return self
+
+    async def fields(self, request: Request) -> List[Any]:
+        return [
+            field.id("id", "ID"),
+            field.text("username", "用户名"),
+            field.text("url", "行为"),
+            field.text("ip", "IP"),
+            field.switch("status", "状态")
+            .set_true_value("正常")
+            .set_false_value("禁用"),
+            field.datetime("created_at", "发生时间"),
+        ]
+
+
+async def seed() -> None:
+    now = datetime.now()
+    for start in range(0, ROWS, BATCH):
+        await models.ActionLog.bulk_create(
+            [
+                models.ActionLog(
+                    uid=1,
+                    username="admin",
+                    url=f"/api/admin/user/index?page={i}",
+                    remark="",
+                    ip="127.0.0.1",
+                    type="ADMIN",
+                    status=i % 2,
+                    created_at=now,
+                )
+                for i in range(start, min(start + BATCH, ROWS))
+            ]
+        )
+
+
+async def legacy_export(fields: List[Any]) -> int:
+    """改造前的方式：全量加载后逐个单元格写入内存工作簿"""
+    items = await models.ActionLog.all().order_by("-id")
+    wb = Workbook()
+    ws = wb.active
+    for col_idx, f in enumerate(fields, start=1):
+        ws[f"{get_column_letter(col_idx)}1"] = f.label
+    for row_idx, item in enumerate(items, start=2):
+        for col_idx, f in enumerate(fields, start=1):
+            value = getattr(item, f.name, None)
+            if f.component == "switchField":
+                value = f.get_option_label(value)
+            elif f.component == "datetimeField" and isinstance(value, datetime):
+                value = value.strftime("%Y-%m-%d %H:%M:%S")
+            ws[f"{get_column_letter(col_idx)}{row_idx}"] = value
+    output = BytesIO()
+    wb.save(output)
+    return len(output.getvalue())
+
+
+async def stream_export(res: Resource, request: Request) -> int:
+    response = await res.export_render(request)
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+
+async def run(name: str, fn) -> None:
+    start = time.perf_counter()
+    size = await fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<28} {elapsed:8.2f}s  peak={peak / 1024 / 1024:8.1f}MB  "
+        f"size={size / 1024 / 1024:.1f}MB"
+    )
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    loader.register_resource(ExportActionLog, name="export_action_log")
+    await seed()
+    print(f"rows={ROWS}")
+
+    request = make_request("/api/admin/export_action_log/export")
+    res = await loader.load_resource_object(request, "export_action_log", "Resource")
+    fields = await res.fields(request)
+
+    if ROWS <= 200000:
+        await run("before (in-memory workbook)", lambda: legacy_export(fields))
+    await run("after (streaming xlsx)", lambda: stream_export(res, request))
+    res.export_format = "csv"
+    await run("after (streaming csv)", lambda: stream_export(res, request))
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
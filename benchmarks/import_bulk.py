@@ -0,0 +1,123 @@
+"""
+导入基准：逐行验证 + 单行事务写入 vs 分批按列验证 + bulk_create
+
+用法：python benchmarks/import_bulk.py [行数]，默认 50000；
+旧方式只导入前 LEGACY_ROWS 行并按行数折算总耗时
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from _common import close_db, init_config, init_db, make_request
+
+from openpyxl import Workbook
+from tortoise.transactions import in_transaction
+
+from quark import loader
+from quark.app.user import User as UserResource
+from quark.models import Attachment, User
+from quark.template.performs_validation import PerformsValidation
+from quark.template.resolves_fields import ResolvesFields
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+LEGACY_ROWS = 2000
+
+
+class ImportUser(UserResource):
+    """补齐导入模板中没有的必填字段"""
+
+    async def before_saving(self, request, submit_data):
+        submit_data["email"] = f"{submit_data['username']}@example.com"
+        submit_data["password"] = ""
+        return submit_data
+
+
+def make_file(path: str) -> None:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(["头像", "用户名", "昵称", "手机号", "性别", "状态"])
+    for i in range(ROWS):
+        ws.append(
+            [None, f"member{i:07d}", f"会员{i}", f"1{i:010d}", "女" if i % 2 else "男", "正常"]
+        )
+    wb.save(path)
+
+
+def make_import_request(file_id: int):
+    body = json.dumps({"fileId": [{"id": file_id}]}).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    request = make_request("/api/admin/import_user/import", method="POST")
+    request.scope["path_params"] = {"resource": "import_user"}
+    request._receive = receive
+    return request
+
+
+async def legacy_import(res, request, path: str) -> None:
+    """改造前的方式：逐行验证（唯一性逐行查询）并在单独事务中写入"""
+    from openpyxl import load_workbook
+
+    fields = ResolvesFields(
+        request=request, fields=await res.fields(request)
+    ).import_fields_without_when()
+    validation = PerformsValidation(request=request, fields=fields)
+    rules = await validation.rules_for_import()
+    names = [field.name for field in fields]
+
+    wb = load_workbook(path, read_only=True)
+    rows = wb.active.iter_rows(min_row=2, max_row=LEGACY_ROWS + 1, values_only=True)
+    for row in rows:
+        values = dict(zip(names, row))
+        values["username"] = f"old{values['username']}"
+        values["phone"] = f"2{values['phone'][1:]}"
+        if await validation.validator(rules, values):
+            continue
+        values = await res.before_saving(request, values)
+        values["sex"] = 1
+        values["status"] = 1
+        async with in_transaction():
+            await User.create(**values)
+    wb.close()
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    loader.register_resource(ImportUser, name="import_user")
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    make_file(path)
+    attachment = await Attachment.create(
+        name="import.xlsx", type="FILE", ext="xlsx", path=path, url="", hash="bench"
+    )
+    print(f"rows={ROWS}")
+
+    request = make_import_request(attachment.id)
+    res = await loader.load_resource_object(request, "import_user", "Resource")
+
+    start = time.perf_counter()
+    await legacy_import(res, request, path)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'before (row by row)':<26} {elapsed:8.2f}s for {LEGACY_ROWS} rows, "
+        f"~{elapsed / LEGACY_ROWS * ROWS:.0f}s for {ROWS} rows"
+    )
+
+    start = time.perf_counter()
+    result = await res.import_render(request)
+    elapsed = time.perf_counter() - start
+    imported = await User.filter(username__startswith="member").count()
+    print(f"{'after (chunked bulk)':<26} {elapsed:8.2f}s imported={imported} msg={result.msg}")
+
+    os.remove(path)
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
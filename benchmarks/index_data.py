@@ -0,0 +1,95 @@
+"""
+列表数据接口基准：表格轮询 / 翻页时获取完整列表页 vs 仅获取数据
+
+渲染 /api/admin/user/index 与 /api/admin/user/index/data，比较响应大小及耗时，
+并演示数据未变化时 If-None-Match 返回 304
+
+用法：python benchmarks/index_data.py
+"""
+import asyncio
+import json
+
+from _common import close_db, init_config, init_db, make_request, measure, report
+
+from quark import loader
+from quark.models import User as UserModel
+from quark.response import dumps, etag_response
+from quark.services.auth import AuthService
+
+ITERATIONS = 200
+
+USERS = 200
+
+PAGINATION = json.dumps({"current": 2, "pageSize": 10})
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    await UserModel.bulk_create(
+        [
+            UserModel(
+                username=f"user{i}",
+                nickname=f"用户{i}",
+                email=f"user{i}@example.com",
+                phone=f"138{i:08d}",
+                password="",
+                department_id=1,
+            )
+            for i in range(USERS)
+        ]
+    )
+
+    admin = await UserModel.get(username="administrator")
+    token = AuthService(make_request("/")).create_token(
+        {"id": admin.id, "username": admin.username, "guard_name": "admin"}
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def render(path: str, extra=None):
+        request = make_request(
+            f"/api/admin/user/{path}",
+            query_string=f"pagination={PAGINATION}",
+            headers={**headers, **(extra or {})},
+        )
+        res = await loader.load_resource_object(request, "user", "Resource")
+        if path == "index":
+            return request, await res.index_render(request)
+        return request, await res.index_data_render(request)
+
+    # 数据接口与完整页面中的表格数据一致
+    _, page = await render("index")
+    _, data = await render("index/data")
+    table = json.loads(dumps(page))["data"]
+    rows = json.loads(dumps(data))["data"]
+    assert rows["items"] == table["datasource"]
+    assert rows["total"] == table["pagination"]["total"]
+    assert rows["current"] == table["pagination"]["current"] == 2
+    print(f"index: {len(dumps(page))} bytes, index/data: {len(dumps(data))} bytes")
+
+    async def before():
+        request, content = await render("index")
+        etag_response(request, content)
+
+    async def after():
+        request, content = await render("index/data")
+        etag_response(request, content)
+
+    report("before (full index page)", await measure(before, ITERATIONS))
+    report("after (data only)", await measure(after, ITERATIONS))
+
+    request, content = await render("index/data")
+    response = etag_response(request, content)
+    etag = response.headers["etag"]
+    request, content = await render("index/data", {"If-None-Match": etag})
+    revalidated = etag_response(request, content)
+    print(
+        f"etag={etag} first={response.status_code} ({len(response.body)} bytes) "
+        f"revalidated={revalidated.status_code} ({len(revalidated.body)} bytes)"
+    )
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+列表分页基准：offset 分页 + 精确总数 vs cursor 分页 + 缓存总数
+
+在较大的操作日志表上读取靠后的页面，按用户筛选并按创建时间倒序
+
+用法：python benchmarks/index_pagination.py
+"""
+import asyncio
+
+from _common import close_db, init_config, init_db, measure, report
+
+from quark import cache
+from quark.models import ActionLog
+from quark.template.performs_pagination import (
+    COUNT_CACHED,
+    COUNT_EXACT,
+    PAGINATION_CURSOR,
+    PAGINATION_OFFSET,
+    PerformsPagination,
+)
+
+ROWS = 200000
+PAGE_SIZE = 20
+ITERATIONS = 30
+ORDER = ["-created_at"]
+
+
+async def seed() -> None:
+    batch = []
+    for i in range(ROWS):
+        batch.append(
+            ActionLog(
+                uid=i % 5 + 1,
+                username="bench",
+                url=f"/api/admin/bench/{i}",
+                remark="",
+                ip="127.0.0.1",
+                type="ADMIN",
+            )
+        )
+        if len(batch) == 10000:
+            await ActionLog.bulk_create(batch)
+            batch = []
+
+
+def paginator(mode: str, count_mode: str) -> PerformsPagination:
+    return PerformsPagination(
+        ActionLog.filter(uid=1),
+        ORDER,
+        mode=mode,
+        count_mode=count_mode,
+    )
+
+
+async def main() -> None:
+    init_config()
+    cache.init("bench")
+    await init_db(seed=False)
+    await seed()
+
+    total = await ActionLog.filter(uid=1).count()
+    deep = total // PAGE_SIZE - 10
+    print(f"rows={ROWS} filtered={total} page={deep} page_size={PAGE_SIZE}")
+
+    # 逐页翻到目标页的前一页，取得翻页游标
+    cursor_pages = paginator(PAGINATION_CURSOR, COUNT_CACHED)
+    cursor = None
+    for current in range(1, deep):
+        _, _, cursor = await cursor_pages.paginate(current, PAGE_SIZE, cursor)
+
+    offset_items, offset_total, _ = await paginator(
+        PAGINATION_OFFSET, COUNT_EXACT
+    ).paginate(deep, PAGE_SIZE)
+    cursor_items, cursor_total, _ = await cursor_pages.paginate(deep, PAGE_SIZE, cursor)
+    assert offset_total == cursor_total
+    assert [item.id for item in offset_items] == [item.id for item in cursor_items]
+
+    async def before():
+        await paginator(PAGINATION_OFFSET, COUNT_EXACT).paginate(deep, PAGE_SIZE)
+
+    async def after():
+        await paginator(PAGINATION_CURSOR, COUNT_CACHED).paginate(
+            deep, PAGE_SIZE, cursor
+        )
+
+    async def after_remembered():
+        # 不传游标，使用上一页请求时缓存的游标
+        await paginator(PAGINATION_CURSOR, COUNT_CACHED).paginate(deep, PAGE_SIZE)
+
+    report("before (offset + count)", await measure(before, ITERATIONS))
+    report("after (cursor + cached count)", await measure(after, ITERATIONS))
+    report("after (remembered cursor)", await measure(after_remembered, ITERATIONS))
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+中间件吞吐基准：BaseHTTPMiddleware 实现 vs 纯 ASGI 实现
+
+用法：python benchmarks/middleware_throughput.py
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from _common import call_asgi, close_db, http_scope, init_config, init_db, make_request
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from quark import Message, action_logger
+from quark.middleware import Middleware
+from quark.models import ActionLog
+from quark.routes import resource
+from quark.services import AuthService
+
+ITERATIONS = 500
+
+
+class LegacyMiddleware(BaseHTTPMiddleware):
+    """改造前的中间件：先执行路由处理函数，再认证、鉴权"""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        url_path = request.url.path
+        route = request.scope.get("route")
+        route_path = route.path if route else url_path
+
+        if "api/admin" not in url_path or "/auth/" in route_path:
+            return response
+
+        auth_service = AuthService(request)
+        try:
+            admin_info = await auth_service.get_current_admin()
+        except Exception as e:
+            return JSONResponse(
+                status_code=401,
+                content=jsonable_encoder(Message.error(str(e)), exclude_none=True),
+            )
+
+        if admin_info.id != 1:
+            results = []
+            for path in [route_path, url_path]:
+                results.append(
+                    await auth_service.check_permission(path, request.method)
+                )
+            if not any(results):
+                return JSONResponse(
+                    status_code=403,
+                    content=jsonable_encoder(
+                        Message.error("403 Forbidden"), exclude_none=True
+                    ),
+                )
+
+        await action_logger.put(
+            ActionLog(
+                uid=admin_info.id,
+                username=admin_info.username,
+                url=url_path,
+                ip="",
+                type="ADMIN",
+                remark="",
+            )
+        )
+        return response
+
+
+def build_app(middleware, static_dir: str) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+    app.include_router(resource.router)
+    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+    return app
+
+
+async def throughput(app, scope, iterations: int) -> float:
+    """顺序发送请求，返回每秒请求数"""
+    status = await call_asgi(app, dict(scope))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call_asgi(app, dict(scope))
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed, status
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    action_logger.init(flush_interval=0.5)
+
+    token = AuthService(make_request("/")).create_token(
+        {"id": 1, "guard_name": "admin"}
+    )
+    auth = {"Authorization": f"Bearer {token}"}
+
+    with tempfile.TemporaryDirectory() as static_dir:
+        with open(os.path.join(static_dir, "app.js"), "w") as f:
+            f.write("console.log('quark');" * 100)
+
+        cases = [
+            ("/static/app.js", http_scope("/static/app.js")),
+            (
+                "/api/admin/{resource}/index",
+                http_scope("/api/admin/user/index", headers=auth),
+            ),
+            (
+                "/api/admin/{resource}/index (401)",
+                http_scope("/api/admin/user/index"),
+            ),
+        ]
+        apps = [
+            ("BaseHTTPMiddleware", build_app(LegacyMiddleware, static_dir)),
+            ("ASGI Middleware", build_app(Middleware, static_dir)),
+        ]
+
+        for case_name, scope in cases:
+            for app_name, app in apps:
+                rps, status = await throughput(app, scope, ITERATIONS)
+                print(f"{case_name:<36} {app_name:<20} {rps:>9.1f} req/s  [{status}]")
+
+    await action_logger.close()
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+对象存储上传基准：分片并发上传吞吐量
+
+默认启动本地 moto S3 服务（pip install "moto[server]"），
+也可通过 S3_ENDPOINT / S3_ACCESS_KEY / S3_SECRET_KEY 指向 MinIO 等兼容服务
+
+用法：python benchmarks/object_storage.py
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from starlette.datastructures import Headers, UploadFile
+
+from quark import Storage, object_storage
+from quark.schemas import MinioConfig
+
+SIZE = 256 * 1024 * 1024
+BUCKET = "quark-bench"
+
+
+def make_upload(source: str) -> UploadFile:
+    file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    with open(source, "rb") as f:
+        shutil.copyfileobj(f, file)
+    file.seek(0)
+    headers = Headers({"content-type": "application/octet-stream"})
+    return UploadFile(file=file, size=SIZE, filename="bench.bin", headers=headers)
+
+
+def start_server():
+    """未指定服务地址时在子进程中启动 moto S3 服务，避免其内存计入统计"""
+    endpoint = os.environ.get("S3_ENDPOINT")
+    if endpoint:
+        return None, endpoint
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "moto.server", "-p", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.1)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def main() -> None:
+    server, endpoint = start_server()
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, "source.bin")
+    with open(source, "wb") as f:
+        f.write(os.urandom(SIZE))
+    with open(source, "rb") as f:
+        expected = hashlib.md5(f.read()).hexdigest()
+
+    def config(concurrency: int, presign: int = 0) -> MinioConfig:
+        return MinioConfig(
+            endpoint=endpoint,
+            access_key=os.environ.get("S3_ACCESS_KEY", "testing"),
+            secret_key=os.environ.get("S3_SECRET_KEY", "testing"),
+            bucket=BUCKET,
+            secure=False,
+            path_prefix="bench",
+            presign_expires=presign,
+            max_concurrency=concurrency,
+        )
+
+    try:
+        client = await object_storage.get_client(config(4))
+        try:
+            await client.create_bucket(Bucket=BUCKET)
+        except client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+
+        print(f"endpoint={endpoint} size={SIZE // 1024 // 1024}MB")
+        for concurrency in (1, 4, 8):
+            upload = make_upload(source)
+            storage = Storage(
+                file=upload, driver="minio", minio_config=config(concurrency)
+            )
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = await storage.path("files").name(f"bench-{concurrency}.bin").save()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            await upload.close()
+
+            key = result.path.split("/", 3)[3]
+            response = await client.get_object(Bucket=BUCKET, Key=key)
+            async with response["Body"] as body:
+                assert hashlib.md5(await body.read()).hexdigest() == expected
+            print(
+                f"concurrency={concurrency:<2} {SIZE / 1024 / 1024 / elapsed:7.1f}MB/s "
+                f"peak={peak / 1024 / 1024:.1f}MB url={result.url}"
+            )
+
+        object_storage.register(config(4, presign=600))
+        print("presigned:", (await object_storage.presign_url(result.path))[:96], "...")
+    finally:
+        await object_storage.close()
+        shutil.rmtree(directory)
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
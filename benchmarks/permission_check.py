@@ -0,0 +1,122 @@
+"""
+中间件权限校验基准：原始 SQL 查询 vs 内存权限索引
+
+用法：python benchmarks/permission_check.py
+"""
+import asyncio
+import random
+
+from _common import close_db, init_config, init_db, make_request, measure, report
+
+from quark import permission_index
+from quark.models import Permission, Role, RolePermission, User, UserRole
+from quark.services.auth import AuthService
+from quark.services.role import RoleService
+
+PERMISSIONS = 500
+ROLES = 50
+PERMISSIONS_PER_ROLE = 100
+ITERATIONS = 2000
+
+
+async def seed() -> int:
+    """构造 500 个权限、50 个角色，返回测试管理员ID"""
+    random.seed(7)
+    await Permission.bulk_create(
+        [
+            Permission(
+                name=f"Bench{i}",
+                guard_name="admin",
+                path=f"/api/admin/bench{i}/index",
+                method="Any" if i % 5 == 0 else "GET",
+            )
+            for i in range(PERMISSIONS)
+        ]
+    )
+    permission_ids = await Permission.all().values_list("id", flat=True)
+
+    await Role.bulk_create(
+        [Role(name=f"bench-role-{i}", guard_name="admin") for i in range(ROLES)]
+    )
+    role_ids = await Role.filter(name__startswith="bench-role-").values_list(
+        "id", flat=True
+    )
+    await RolePermission.bulk_create(
+        [
+            RolePermission(role_id=role_id, permission_id=permission_id)
+            for role_id in role_ids
+            for permission_id in random.sample(permission_ids, PERMISSIONS_PER_ROLE)
+        ]
+    )
+
+    user = await User.create(
+        username="bench",
+        nickname="bench",
+        email="bench@example.com",
+        phone="10010",
+        password="",
+        status=1,
+    )
+    await UserRole.bulk_create(
+        [UserRole(uid=user.id, role_id=role_id) for role_id in role_ids[:3]]
+    )
+    return user.id
+
+
+async def legacy_check(request, path: str, method: str) -> bool:
+    """改造前的校验方式：每次重新解析用户并执行两次原始 SQL"""
+    admin_info = await AuthService(request).get_current_user("admin")
+    role_ids = await RoleService().get_role_ids_by_user_id(admin_info.id)
+    if not role_ids:
+        return False
+
+    placeholders = ",".join(str(role_id) for role_id in role_ids)
+    for check_method in ("Any", method):
+        rows = await RolePermission.raw(
+            f"""
+            SELECT p.id FROM role_permissions rhp
+            JOIN permissions p ON rhp.permission_id = p.id
+            WHERE rhp.role_id IN ({placeholders}) AND p.guard_name = 'admin'
+            AND p.path = '{path}' AND p.method = '{check_method}'
+            """
+        )
+        if rows:
+            return True
+    return False
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    user_id = await seed()
+    await permission_index.load()
+
+    token = AuthService(make_request("/")).create_token(
+        {"id": user_id, "guard_name": "admin"}
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    route_path = "/api/admin/{resource}/index"
+    url_path = "/api/admin/bench42/index"
+
+    async def before():
+        request = make_request(url_path, headers=headers)
+        await AuthService(request).get_current_user("admin")
+        for path in (route_path, url_path):
+            await legacy_check(request, path, "GET")
+
+    async def after():
+        request = make_request(url_path, headers=headers)
+        auth_service = AuthService(request)
+        await auth_service.get_current_admin()
+        for path in (route_path, url_path):
+            await auth_service.check_permission(path, "GET")
+
+    print(f"permissions={PERMISSIONS} roles={ROLES} index={permission_index.stats()}")
+    report("before (raw SQL)", await measure(before, ITERATIONS))
+    report("after (permission index)", await measure(after, ITERATIONS))
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
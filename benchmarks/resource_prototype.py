@@ -0,0 +1,64 @@
+"""
+资源对象构建基准：每次请求重新构建 vs 原型复制 + 静态字段缓存
+
+模拟 /api/admin/user/index，统计延迟及每次请求的内存分配峰值
+用法：python benchmarks/resource_prototype.py
+"""
+import asyncio
+import time
+import tracemalloc
+
+from _common import close_db, init_config, init_db, make_request, report
+
+from quark import loader
+from quark.app.user import User
+
+ITERATIONS = 300
+
+
+class PrototypeUser(User):
+    """开启原型缓存及静态字段的用户资源"""
+
+    cache_prototype = True
+    static_fields = True
+
+
+async def render(resource: str) -> None:
+    request = make_request("/api/admin/user/index")
+    res = await loader.load_resource_object(request, resource, "Resource")
+    await res.index_render(request)
+
+
+async def run(name: str, resource: str) -> None:
+    await render(resource)
+
+    samples = []
+    peaks = []
+    tracemalloc.start()
+    for _ in range(ITERATIONS):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        await render(resource)
+        samples.append((time.perf_counter() - start) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - base)
+    tracemalloc.stop()
+
+    report(name, samples)
+    print(f"{'':<32} peak alloc={sum(peaks) / len(peaks) / 1024:.1f}KB/request")
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    loader.register_resource(PrototypeUser, name="prototype_user")
+
+    await run("rebuild per request", "user")
+    await run("prototype + static fields", "prototype_user")
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+列表行序列化基准：逐行逐字段判断 vs 按字段编译的行序列化
+
+渲染 1000 行 × 20 个字段，含日期、JSON、选项及行为列
+
+用法：python benchmarks/row_serializer.py
+"""
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from _common import init_config, make_request, measure, report
+
+from quark.app import actions
+from quark.component.form import field
+from quark.template.resolves_actions import ResolvesActions
+from quark.template.row_serializer import RowSerializer
+
+ROWS = 1000
+ITERATIONS = 20
+
+
+def build_fields() -> list:
+    fields = [
+        field.id("id", "ID"),
+        field.datetime("created_at", "创建时间"),
+        field.date("birthday", "生日"),
+        field.checkbox("role_ids", "角色"),
+        field.select("status", "状态"),
+        field.action("actions", "操作").set_items(
+            [actions.EditLink(), actions.Delete()]
+        ),
+    ]
+    fields += [field.text(f"text_{i}", f"文本{i}") for i in range(14)]
+    return fields
+
+
+def build_rows() -> list:
+    now = datetime.now()
+    rows = []
+    for i in range(ROWS):
+        row = {
+            "id": i,
+            "created_at": now,
+            "birthday": now.date(),
+            "role_ids": json.dumps([1, 2, 3]),
+            "status": 1,
+        }
+        row.update({f"text_{n}": f"text {i} {n}" for n in range(14)})
+        rows.append(SimpleNamespace(**row))
+    return rows
+
+
+async def legacy_performs_list(request, index_fields, items) -> list:
+    """改造前的实现"""
+    result = []
+    for item in items:
+        fields = {}
+        for field in index_fields:
+            component = field.component
+            name = field.name
+            if component == "actionField":
+                items_callback = field.callback
+                if items_callback:
+                    action_items = await items_callback(item)
+                else:
+                    action_items = field.items
+                rendered_actions = []
+                for action in action_items:
+                    rendered_actions.append(
+                        await ResolvesActions(request).build_action(action)
+                    )
+                fields[name] = rendered_actions
+            else:
+                callback = field.callback
+                if callback:
+                    fields[name] = await callback(item)
+                else:
+                    value = getattr(item, name, None)
+                    if value is None:
+                        continue
+                    if isinstance(value, str):
+                        if value.startswith("[") or value.startswith("{"):
+                            try:
+                                value = json.loads(value)
+                            except:
+                                pass
+                    if component in ["datetimeField", "dateField"]:
+                        format_str = field.format
+                        format_str = format_str.replace("YYYY", "%Y")
+                        format_str = format_str.replace("MM", "%m")
+                        format_str = format_str.replace("DD", "%d")
+                        format_str = format_str.replace("HH", "%H")
+                        format_str = format_str.replace("mm", "%M")
+                        format_str = format_str.replace("ss", "%S")
+                        value = value.strftime(format_str)
+                    fields[name] = value
+        result.append(fields)
+    return result
+
+
+async def main() -> None:
+    init_config()
+    request = make_request("/api/admin/user/index")
+    fields = build_fields()
+    rows = build_rows()
+
+    legacy = await legacy_performs_list(request, fields, rows)
+    compiled = await RowSerializer(request, fields).serialize_all(rows)
+    dump = lambda data: json.dumps(data, default=lambda c: c.model_dump(), sort_keys=True)
+    assert dump(legacy) == dump(compiled)
+    print(f"rows={ROWS} fields={len(fields)}")
+
+    async def before():
+        await legacy_performs_list(request, fields, rows)
+
+    async def after():
+        await RowSerializer(request, fields).serialize_all(rows)
+
+    report("before (per-row field dispatch)", await measure(before, ITERATIONS))
+    report("after (compiled row serializer)", await measure(after, ITERATIONS))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
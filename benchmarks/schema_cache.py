@@ -0,0 +1,83 @@
+"""
+页面结构缓存基准：每次请求重建表格结构 vs 按角色缓存结构、只填充数据
+
+渲染 /api/admin/user/index，并演示 ETag / If-None-Match 返回 304
+
+用法：python benchmarks/schema_cache.py
+"""
+import asyncio
+import re
+
+from _common import close_db, init_config, init_db, make_request, measure, report
+
+from quark import loader, schema_cache
+from quark.app.user import User
+from quark.models import User as UserModel
+from quark.response import dumps, etag_response
+from quark.services.auth import AuthService
+
+ITERATIONS = 200
+
+
+def normalize(body: bytes) -> bytes:
+    """部分组件的 componentkey 为随机值，比较前移除"""
+    body = body.replace(b"uncached_user", b"user")
+    return re.sub(rb'"componentkey":"[0-9a-f]+",?', b"", body)
+
+
+class UncachedUser(User):
+    """改造前：每次请求重建页面结构"""
+
+    cache_schema = False
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+    loader.register_resource(UncachedUser, name="uncached_user")
+
+    admin = await UserModel.get(username="administrator")
+    token = AuthService(make_request("/")).create_token(
+        {"id": admin.id, "username": admin.username, "guard_name": "admin"}
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def render(resource: str, extra=None):
+        request = make_request(
+            f"/api/admin/{resource}/index", headers={**headers, **(extra or {})}
+        )
+        res = await loader.load_resource_object(request, resource, "Resource")
+        return request, await res.index_render(request)
+
+    # 缓存前后输出一致；未缓存时随机 componentkey 每次不同，缓存后输出稳定
+    _, uncached = await render("uncached_user")
+    _, first = await render("user")
+    _, cached = await render("user")
+    assert normalize(dumps(uncached)) == normalize(dumps(cached))
+    assert dumps(first) == dumps(cached)
+
+    async def before():
+        await render("uncached_user")
+
+    async def after():
+        await render("user")
+
+    report("before (rebuild schema)", await measure(before, ITERATIONS))
+    report("after (cached schema)", await measure(after, ITERATIONS))
+    print("  ", schema_cache.stats())
+
+    request, page = await render("user")
+    response = etag_response(request, page)
+    etag = response.headers["etag"]
+    request, page = await render("user", {"If-None-Match": etag})
+    revalidated = etag_response(request, page)
+    print(
+        f"etag={etag} first={response.status_code} ({len(response.body)} bytes) "
+        f"revalidated={revalidated.status_code} ({len(revalidated.body)} bytes)"
+    )
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+上传保存基准：整体读入内存 vs 分块流式写入
+
+模拟上传前按哈希去重（get_hash）后保存文件，比较耗时与 Python 堆内存峰值
+
+用法：python benchmarks/storage_stream.py
+"""
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from starlette.datastructures import Headers, UploadFile
+
+from quark import Storage
+
+SIZE = 200 * 1024 * 1024
+
+
+def make_upload(source: str) -> UploadFile:
+    """构造已落盘的上传文件"""
+    file = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    with open(source, "rb") as f:
+        shutil.copyfileobj(f, file)
+    file.seek(0)
+    headers = Headers({"content-type": "application/octet-stream"})
+    return UploadFile(file=file, size=SIZE, filename="bench.bin", headers=headers)
+
+
+async def legacy_save(upload: UploadFile, directory: str) -> str:
+    """改造前的实现"""
+    file_bytes = await upload.read()
+    file_hash = hashlib.md5(file_bytes + upload.filename.encode()).hexdigest()
+    with open(os.path.join(directory, "legacy.bin"), "wb") as f:
+        f.write(file_bytes)
+    return file_hash
+
+
+async def stream_save(upload: UploadFile, directory: str) -> str:
+    storage = Storage(file=upload, driver="local", save_path=directory)
+    file_hash = await storage.get_hash()
+    await storage.name("stream.bin").save()
+    return file_hash
+
+
+async def run(name: str, fn, source: str, directory: str) -> str:
+    upload = make_upload(source)
+    tracemalloc.start()
+    start = time.perf_counter()
+    file_hash = await fn(upload, directory)
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await upload.close()
+    print(f"{name:<32} time={elapsed:.1f}ms peak={peak / 1024 / 1024:.1f}MB")
+    return file_hash
+
+
+async def main() -> None:
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, "source.bin")
+    with open(source, "wb") as f:
+        for _ in range(SIZE // (1024 * 1024)):
+            f.write(os.urandom(1024 * 1024))
+
+    try:
+        print(f"size={SIZE // 1024 // 1024}MB")
+        before = await run("before (read whole file)", legacy_save, source, directory)
+        after = await run("after (chunked stream)", stream_save, source, directory)
+        assert before == after
+        assert os.path.getsize(os.path.join(directory, "stream.bin")) == SIZE
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
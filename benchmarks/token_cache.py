@@ -0,0 +1,59 @@
+"""
+令牌验证基准：每次请求解码 JWT 并查询用户 vs 令牌及用户快照缓存
+
+用法：python benchmarks/token_cache.py
+"""
+import asyncio
+
+from _common import close_db, init_config, init_db, make_request, measure, report
+from fastapi import HTTPException
+from jose import jwt
+
+from quark import config, token_cache
+from quark.models import User
+from quark.services.auth import AuthService
+
+ITERATIONS = 2000
+
+
+async def main() -> None:
+    init_config()
+    await init_db()
+
+    user = await User.get(username="administrator")
+    token = AuthService(make_request("/")).create_token(
+        {"id": user.id, "username": user.username, "guard_name": "admin"}
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def before():
+        """改造前的实现"""
+        payload = jwt.decode(token, config.get("APP_SECRET_KEY"))
+        current = await User.get(id=payload["id"])
+        assert current.status == 1
+        return current
+
+    async def after():
+        return await AuthService(
+            make_request("/api/admin/user/index", headers=headers)
+        ).get_current_user("admin")
+
+    report("before (decode + query)", await measure(before, ITERATIONS))
+    report("after (cached)", await measure(after, ITERATIONS))
+    print("  ", token_cache.stats())
+
+    # 禁用后立即生效
+    await User.filter(id=user.id).update(status=0)
+    token_cache.forget_users([user.id])
+    try:
+        await after()
+        raise AssertionError("disabled user accepted")
+    except HTTPException as e:
+        assert e.status_code == 403
+    print("disabled user rejected after invalidation")
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+树结构构建基准：递归 + JSON 深拷贝 vs 单次遍历
+
+用法：python benchmarks/tree_build.py
+"""
+import json
+import random
+import time
+
+from _common import init_config
+
+from quark.component.table.tree_bar import TreeBar
+from quark.utils import list_to_tree
+
+# 旧实现在大数据量下耗时过长，只在较小规模下对比
+LEGACY_SIZES = (1000,)
+SIZES = (1000, 10000, 100000)
+
+
+def legacy_list_to_tree(data, pk, pid, child, root):
+    """改造前的实现：每层递归都对整个列表做一次 JSON 深拷贝"""
+    result = json.loads(json.dumps(data))
+    tree_list = []
+    for item in result:
+        if item.get(pid) == root:
+            children = legacy_list_to_tree(data, pk, pid, child, item.get(pk))
+            item[child] = children if children else None
+            tree_list.append(item)
+    return tree_list
+
+
+def make_nodes(size: int, fanout: int = 8):
+    """构造部门/菜单风格的节点，每个节点最多 fanout 个子节点"""
+    nodes = [
+        {
+            "id": i,
+            "pid": 0 if i <= fanout else (i - 1) // fanout,
+            "name": f"部门{i}",
+            "sort": i,
+            "status": 1,
+        }
+        for i in range(1, size + 1)
+    ]
+    random.Random(size).shuffle(nodes)
+    return nodes
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    init_config()
+    tree_bar = TreeBar()
+
+    for size in SIZES:
+        nodes = make_nodes(size)
+        if size in LEGACY_SIZES:
+            elapsed = timed(legacy_list_to_tree, nodes, "id", "pid", "children", 0)
+            print(f"n={size:<7} {'legacy list_to_tree':<26} {elapsed:10.1f}ms")
+        elapsed = timed(list_to_tree, nodes, "id", "pid", "children", 0)
+        print(f"n={size:<7} {'list_to_tree':<26} {elapsed:10.1f}ms")
+        elapsed = timed(tree_bar.list_to_tree_data, nodes, 0, "pid", "id", "name")
+        print(f"n={size:<7} {'TreeBar.list_to_tree_data':<26} {elapsed:10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from fastapi.staticfiles import StaticFiles
 
 from . import cache, config, utils
 from .message import Message
+from .response import ComponentResponse
 from .quark import Quark
 from .storage import Storage
 from .template.dashboard import Dashboard
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from .models.action_log import ActionLog
+
+logger = logging.getLogger(__name__)
+
+# 队列满时的处理策略
+OVERFLOW_DROP_NEW = "drop_new"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_BLOCK = "block"
+
+
+class ActionLogWriter:
+    """
+    操作日志批量写入器
+
+    日志先进入有界队列，由后台任务按数量或时间批量写入数据库
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        overflow: str = OVERFLOW_DROP_NEW,
+        block_timeout: float = 0.5,
+    ):
+        # 队列容量
+        self.queue_size = queue_size
+
+        # 单次写入条数
+        self.batch_size = batch_size
+
+        # 最长写入间隔（秒）
+        self.flush_interval = flush_interval
+
+        # 队列满时的处理策略
+        self.overflow = overflow
+
+        # block 策略下的最长等待时间（秒）
+        self.block_timeout = block_timeout
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.stopping = False
+
+        # 统计
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self) -> None:
+        """启动后台写入任务"""
+        if self.running:
+            return
+        self.stopping = False
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.task = asyncio.create_task(self._run())
+
+    async def put(self, action_log: ActionLog) -> bool:
+        """日志入队，返回是否被接收"""
+
+        # 未启动时直接写入
+        if not self.running or self.stopping:
+            await self._write([action_log])
+            return True
+
+        try:
+            self.queue.put_nowait(action_log)
+        except asyncio.QueueFull:
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                self.queue.get_nowait()
+                self.dropped += 1
+                self.queue.put_nowait(action_log)
+            elif self.overflow == OVERFLOW_BLOCK:
+                try:
+                    await asyncio.wait_for(
+                        self.queue.put(action_log), self.block_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.dropped += 1
+                    return False
+            else:
+                self.dropped += 1
+                return False
+
+        self.enqueued += 1
+        return True
+
+    async def _next_batch(self) -> List[ActionLog]:
+        """取出一批日志，数量达到上限或等待超时即返回"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        batch: List[ActionLog] = []
+        while len(batch) < self.batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0 or self.stopping:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while not (self.stopping and self.queue.empty()):
+            batch = await self._next_batch()
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: List[ActionLog]) -> None:
+        try:
+            await ActionLog.bulk_create(batch)
+            self.written += len(batch)
+            self.flushes += 1
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error("操作日志写入失败: %s", e)
+
+    async def close(self) -> None:
+        """停止后台任务，并写入队列中剩余的日志"""
+        if not self.running:
+            return
+        self.stopping = True
+        await self.task
+        self.task = None
+
+    def stats(self) -> Dict[str, int]:
+        """队列统计"""
+        return {
+            "depth": self.queue.qsize() if self.queue is not None else 0,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
+
+
+# 全局写入器
+writer = ActionLogWriter()
+
+
+def init(
+    queue_size: int = 10000,
+    batch_size: int = 200,
+    flush_interval: float = 1.0,
+    overflow: str = OVERFLOW_DROP_NEW,
+    block_timeout: float = 0.5,
+) -> None:
+    """初始化并启动写入器"""
+    writer.queue_size = queue_size
+    writer.batch_size = batch_size
+    writer.flush_interval = flush_interval
+    writer.overflow = overflow
+    writer.block_timeout = block_timeout
+    writer.start()
+
+
+async def put(action_log: ActionLog) -> bool:
+    return await writer.put(action_log)
+
+
+async def close() -> None:
+    await writer.close()
+
+
+def stats() -> Dict[str, int]:
+    return writer.stats()
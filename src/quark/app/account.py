@@ -3,7 +3,7 @@ from typing import Any, Dict, List
 
 from tortoise import Model
 
-from quark import Message, Request, Resource, models, utils
+from quark import Message, Request, Resource, executor, models, token_cache, utils
 from quark.app import actions
 from quark.component.form import field
 from quark.component.form.rule import Rule
@@ -87,13 +87,16 @@ class Account(Resource):
 
         # 加密密码
         if data.get("password"):
-            data["password"] = utils.hash_password(data["password"])
+            data["password"] = await executor.run(
+                utils.hash_password, data["password"]
+            )
 
         try:
             # 获取登录管理员信息
             admin_info = await AuthService(request).get_current_admin()
             model = await UserService().get_info_by_id(admin_info.id)
             await model.update_from_dict(data)
+            await token_cache.users_changed([admin_info.id])
         except Exception as e:
             return Message.error(str(e))
 
@@ -9,6 +9,9 @@ class ActionLog(Resource):
     操作日志管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request):
 
         # 页面标题
@@ -5,7 +5,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.queryset import QuerySet
 from tortoise.transactions import in_transaction
 
-from quark import Message, Request
+from quark import Message, Request, permission_index
 from quark.loader import load_resource_classes
 from quark.models import Permission
 from quark.template.action import Action
@@ -74,6 +74,7 @@ class SyncPermission(Action):
                 "/api/admin/login/{resource}/handle",
                 "/api/admin/logout/{resource}/handle",
                 "/api/admin/{resource}/index",
+                "/api/admin/{resource}/index/data",
                 "/api/admin/{resource}/editable",
                 "/api/admin/{resource}/create",
                 "/api/admin/{resource}/store",
@@ -180,6 +181,10 @@ class SyncPermission(Action):
                 "path": "/api/admin/{resource}/index",
                 "method": "GET",
             },
+            {
+                "path": "/api/admin/{resource}/index/data",
+                "method": "GET",
+            },
             {
                 "path": "/api/admin/{resource}/editable",
                 "method": "GET",
@@ -342,4 +347,7 @@ class SyncPermission(Action):
         except IntegrityError as e:
             return Message.error(str(e))
 
+        # 重建权限索引
+        await permission_index.changed()
+
         return Message.success("操作成功")
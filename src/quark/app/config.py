@@ -1,6 +1,8 @@
-from typing import Any, List
+from typing import Any, Dict, List
 
-from quark import Request, Resource, models
+from tortoise.queryset import QuerySet
+
+from quark import Request, Resource, config_cache, models
 from quark.app import actions, searches
 from quark.component.form import field
 from quark.component.form.rule import Rule
@@ -11,6 +13,9 @@ class Config(Resource):
     配置管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request):
 
         # 页面标题
@@ -78,3 +83,17 @@ class Config(Resource):
             actions.EditDrawer(self),
             actions.Delete(),
         ]
+
+    async def after_saved(
+        self, request: Request, id: int, data: Dict[str, Any], result: Any
+    ):
+        """新增或编辑保存后刷新配置缓存，编辑通过 QuerySet.update 保存，不触发模型信号"""
+        await config_cache.changed()
+
+    async def after_editable(self, request: Request, id: Any, field: str, value: Any):
+        """行内编辑后刷新配置缓存"""
+        await config_cache.changed()
+
+    async def after_action(self, request: Request, uri_key: str, query: QuerySet):
+        """行为执行后刷新配置缓存"""
+        await config_cache.changed()
@@ -1,6 +1,8 @@
-from typing import Any, List
+from typing import Any, Dict, List
 
-from quark import Request, Resource, models, services
+from tortoise.queryset import QuerySet
+
+from quark import Request, Resource, department_index, models, services
 from quark.app import actions, searches
 from quark.component.form import field
 from quark.component.form.rule import Rule
@@ -12,6 +14,9 @@ class Department(Resource):
     部门管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request):
 
         self.table.set_expandable(Expandable(default_expanded_row_keys=[1]))
@@ -82,3 +87,17 @@ class Department(Resource):
             actions.EditModal(self),
             actions.DeleteSpecial(),
         ]
+
+    async def after_saved(
+        self, request: Request, id: int, data: Dict[str, Any], result: Any
+    ):
+        """保存后刷新部门索引，并通知其他进程"""
+        await department_index.changed()
+
+    async def after_editable(self, request: Request, id: Any, field: str, value: Any):
+        """行内编辑后刷新部门索引，并通知其他进程"""
+        await department_index.changed()
+
+    async def after_action(self, request: Request, uri_key: str, query: QuerySet):
+        """行为执行后刷新部门索引，并通知其他进程"""
+        await department_index.changed()
@@ -6,6 +6,7 @@ from tortoise.queryset import QuerySet
 from quark import Request, Resource, models
 from quark.app import actions, searches
 from quark.component.form import field
+from quark.services import attachment
 from quark.services.attachment import AttachmentService
 
 
@@ -14,6 +15,9 @@ class Image(Resource):
     图片管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request):
 
         self.title = "图片"
@@ -73,3 +77,8 @@ class Image(Resource):
             actions.BatchDelete(),
             actions.Delete(),
         ]
+
+    async def after_action(self, request: Request, uri_key: str, query: QuerySet):
+        """删除等行为不触发模型信号，执行后移除附件地址缓存，未指定ID时移除全部"""
+        ids = attachment.attachment_ids(request.query_params.get("id", "").split(","))
+        attachment.forget(ids or None)
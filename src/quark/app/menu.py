@@ -12,6 +12,9 @@ class Menu(Resource):
     菜单管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request):
         self.title = "菜单"
         self.model = models.Menu
@@ -1,9 +1,7 @@
 import platform
 import sys
 
-import psutil
-
-from quark import config
+from quark import config, system_monitor
 from quark.component.descriptions.fields.text import Text
 from quark.template.metric.descriptions import Descriptions
 
@@ -11,10 +9,11 @@ from quark.template.metric.descriptions import Descriptions
 class SystemInfo(Descriptions):
     title: str = "系统信息"
     col: int = 12
+    cache_ttl: float = 1
 
     async def calculate(self) -> any:
-        memory = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # 读取后台采样结果，不阻塞事件循环
+        system = await system_monitor.snapshot()
         return self.result(
             [
                 Text().set_label("应用名称").set_value(config.get("APP_NAME")),
@@ -25,7 +24,10 @@ class SystemInfo(Descriptions):
                 .set_value(f"{platform.system()} {platform.machine()}"),
                 Text()
                 .set_label("内存信息")
-                .set_value(f"{memory.total // (1024 * 1024)}MB / {memory.percent}%"),
-                Text().set_label("CPU使用率").set_value(f"{cpu_percent}%"),
+                .set_value(
+                    f"{system['memory_total'] // (1024 * 1024)}MB"
+                    f" / {system['memory_percent']}%"
+                ),
+                Text().set_label("CPU使用率").set_value(f"{system['cpu_percent']}%"),
             ]
         )
@@ -5,6 +5,7 @@ from quark.template.metric.descriptions import Descriptions
 class TeamInfo(Descriptions):
     title: str = "团队信息"
     col: int = 12
+    cache_ttl: float = 3600
 
     async def calculate(self):
         return self.result(
@@ -6,6 +6,7 @@ from quark.services.user import UserService
 class TotalAdmin(Value):
     title: str = "用户数量"
     col: int = 6
+    cache_ttl: float = 30
 
     async def calculate(self) -> Statistic:
         """计算数值"""
@@ -6,6 +6,7 @@ from quark.services.attachment import AttachmentService
 class TotalImage(Value):
     title: str = "图片数量"
     col: int = 6
+    cache_ttl: float = 30
 
     async def calculate(self) -> Statistic:
         """计算数值"""
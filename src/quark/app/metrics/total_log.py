@@ -6,6 +6,7 @@ from quark.services.action_log import ActionLogService
 class TotalLog(Value):
     title: str = "日志数量"
     col: int = 6
+    cache_ttl: float = 60
 
     async def calculate(self) -> Statistic:
         """计算数值"""
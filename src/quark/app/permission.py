@@ -1,6 +1,8 @@
-from typing import Any, List
+from typing import Any, Dict, List
 
-from quark import Request, Resource, models
+from tortoise.queryset import QuerySet
+
+from quark import Request, Resource, models, permission_index
 from quark.app import actions, searches
 from quark.component.form import Rule, field
 
@@ -10,6 +12,9 @@ class Permission(Resource):
     权限管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request):
 
         # 页面标题
@@ -72,3 +77,17 @@ class Permission(Resource):
             actions.FormBack(),
             actions.FormExtraBack(),
         ]
+
+    async def after_saved(
+        self, request: Request, id: int, data: Dict[str, Any], result: Any
+    ):
+        """新增或修改权限（路径、方法）后重建权限索引并通知其他进程"""
+        await permission_index.changed()
+
+    async def after_editable(self, request: Request, id: Any, field: str, value: Any):
+        """行内编辑后重建权限索引并通知其他进程"""
+        await permission_index.changed()
+
+    async def after_action(self, request: Request, uri_key: str, query: QuerySet):
+        """删除、批量删除等行为执行后重建权限索引并通知其他进程"""
+        await permission_index.changed()
@@ -11,6 +11,9 @@ class Position(Resource):
     职位管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request):
 
         # 页面标题
@@ -11,6 +11,9 @@ class Role(Resource):
     角色管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request):
 
         # 页面标题
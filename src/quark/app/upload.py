@@ -4,12 +4,19 @@ from typing import Any
 
 from fastapi import Request
 
-from quark import Message, Storage, Upload
+from quark import Message, Storage, Upload, object_storage
 from quark.models import Attachment
 from quark.schemas import FileInfo, ImageCropRequest, ImageDeleteRequest
 from quark.services import AttachmentCategoryService, AttachmentService, AuthService
 
 
+async def display_url(url: str) -> str:
+    """预签名模式下数据库保存 s3://bucket/key，返回给前端时转换为预签名地址"""
+    if url and url.startswith(object_storage.SCHEME):
+        return await object_storage.presign_url(url)
+    return url
+
+
 class Image(Upload):
 
     async def init(self, request: Request):
@@ -190,7 +197,7 @@ class Image(Upload):
                 "size": updated_attachment.size,
                 "ext": updated_attachment.ext,
                 "path": updated_attachment.path,
-                "url": updated_attachment.url,
+                "url": await display_url(updated_attachment.url),
                 "hash": updated_attachment.hash,
                 "extra": (
                     json.loads(updated_attachment.extra)
@@ -221,7 +228,7 @@ class Image(Upload):
                     "size": image_info.size,
                     "ext": image_info.ext,
                     "path": image_info.path,
-                    "url": image_info.url,
+                    "url": await display_url(image_info.url),
                     "hash": image_info.hash,
                     "extra": extra,
                 }
@@ -273,7 +280,7 @@ class Image(Upload):
                     "name": result.name,
                     "path": result.path,
                     "size": result.size,
-                    "url": result.url,
+                    "url": await display_url(result.url),
                     "extra": result.extra,
                 },
             )
@@ -358,7 +365,7 @@ class File(Upload):
                 size=file_info.size,
                 ext=file_info.ext,
                 path=file_info.path,
-                url=file_info.url,
+                url=await display_url(file_info.url),
                 hash=file_info.hash,
                 extra=extra,
             )
@@ -424,7 +431,7 @@ class File(Upload):
                 "name": result.name,
                 "path": result.path,
                 "size": result.size,
-                "url": result.url,
+                "url": await display_url(result.url),
                 "extra": result.extra,
             },
         )
@@ -4,7 +4,7 @@ from typing import Any, Dict, List
 from tortoise.expressions import Q
 from tortoise.queryset import QuerySet
 
-from quark import Request, Resource, models, services, utils
+from quark import Request, Resource, executor, models, services, token_cache, utils
 from quark.app import actions, searches
 from quark.component.form import Rule, field
 
@@ -14,6 +14,9 @@ class User(Resource):
     用户管理
     """
 
+    # 页面结构只与管理员角色相关，按角色缓存
+    cache_schema = True
+
     async def init(self, request: Request) -> Any:
 
         # 部门列表
@@ -52,13 +55,7 @@ class User(Resource):
             return query
 
         # 拓展 ids 为包含所有子部门 ID
-        all_ids = ids.copy()
-        for dep_id in ids:
-            children_ids = await services.DepartmentService().get_children_ids(dep_id)
-            all_ids.extend(children_ids)
-
-        # 去重
-        all_ids = list(set(all_ids))
+        all_ids = await services.DepartmentService().get_subtree_ids(ids)
 
         # 构建筛选条件
         return query.filter(Q(department_id__in=all_ids))
@@ -212,9 +209,20 @@ class User(Resource):
 
         # 密码处理
         if submit_data.get("password"):
-            submit_data["password"] = utils.hash_password(submit_data["password"])
+            submit_data["password"] = await executor.run(
+                utils.hash_password, submit_data["password"]
+            )
 
         return submit_data
 
     async def after_saved(self, request, id, data, result):
         await services.RoleService().save_roles_by_user_id(id, data["role_ids"])
+        await token_cache.users_changed([id])
+
+    async def after_editable(self, request: Request, id: Any, field: str, value: Any):
+        """行内编辑（如启用/禁用）后移除用户快照，并通知其他进程"""
+        await token_cache.users_changed([id])
+
+    async def after_action(self, request: Request, uri_key: str, query: QuerySet):
+        """批量行为（如批量禁用、删除）执行后移除全部用户快照，并通知其他进程"""
+        await token_cache.users_changed()
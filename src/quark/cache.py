@@ -1,16 +1,624 @@
-from typing import Any
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlparse
+
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.inmemory import InMemoryBackend
 
+logger = logging.getLogger(__name__)
+
+# 缓存驱动：memory 仅当前进程可见，redis / memcached 在多进程、多实例间共享
+DRIVER: str = "memory"
+
+# 连接地址，如 redis://127.0.0.1:6379/0、memcached://127.0.0.1:11211
+URL: Optional[str] = None
+
+# 键前缀，多个应用共用同一缓存服务时互不干扰
+PREFIX: str = "quark-cache"
+
+# 连接池大小
+POOL_SIZE: int = 10
+
+# 本地缓存条数，驱动为 redis 且大于 0 时启用两级缓存
+LOCAL_SIZE: int = 0
+
+# 本地缓存有效期（秒），失效通知丢失时最多读到该时长内的旧值
+LOCAL_TTL: float = 5
+
+# 内存缓存每写入多少次清理一次过期键
+SWEEP_INTERVAL = 1000
+
+# memcached 将超过 30 天的过期时间视为 Unix 时间戳
+MEMCACHED_MAX_RELATIVE_EXPIRE = 30 * 24 * 3600
+
+# 其他进程写入或删除缓存时的回调
+_listeners: List[Callable[[List[str]], Any]] = []
+
+
+def encode(value: Any) -> bytes:
+    """
+    编码缓存值
+
+    共享缓存中的数据可能由其他进程写入，使用 JSON 而非 pickle，读取时不会执行任意代码
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def decode(raw: Optional[bytes]) -> Any:
+    """解码缓存值"""
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+def _seconds(expire: Optional[float]) -> Optional[int]:
+    """过期时间取整为秒，未设置或不大于 0 时不过期"""
+    if not expire or expire <= 0:
+        return None
+    return max(1, math.ceil(expire))
+
+
+class Backend:
+    """缓存后端"""
+
+    async def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """批量读取，仅返回存在的键"""
+        values = await asyncio.gather(*(self.get(key) for key in keys))
+        return {k: v for k, v in zip(keys, values) if v is not None}
+
+    async def get_with_ttl(self, key: str) -> Tuple[Any, Optional[float]]:
+        """读取值及剩余有效期（秒），不过期或无法获取时有效期为 None"""
+        return await self.get(key), None
+
+    async def get_many_with_ttl(
+        self, keys: List[str]
+    ) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """批量读取值及剩余有效期"""
+        return {k: (v, None) for k, v in (await self.get_many(keys)).items()}
+
+    async def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def set_many(
+        self, mapping: Dict[str, Any], expire: Optional[float] = None
+    ) -> None:
+        """批量写入"""
+        await asyncio.gather(*(self.set(k, v, expire) for k, v in mapping.items()))
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    def fastapi_backend(self) -> Any:
+        """对应的 fastapi-cache 后端，使路由缓存装饰器共用同一存储"""
+        return InMemoryBackend()
+
+
+class MemoryBackend(Backend):
+    """
+    进程内缓存
+
+    值与共享缓存一样编码为 JSON 保存，切换驱动时读取到的类型不变，
+    修改读取到的对象也不会影响缓存中的值
+    """
+
+    def __init__(self) -> None:
+        # 键 -> (值, 过期时间)
+        self._values: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._writes = 0
+
+    def _item(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        item = self._values.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= time.monotonic():
+            del self._values[key]
+            return None
+        return item
+
+    async def get(self, key: str) -> Any:
+        item = self._item(key)
+        return None if item is None else decode(item[0])
+
+    async def get_with_ttl(self, key: str) -> Tuple[Any, Optional[float]]:
+        item = self._item(key)
+        if item is None:
+            return None, None
+        ttl = item[1] - time.monotonic() if item[1] is not None else None
+        return decode(item[0]), ttl
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        result = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+
+    async def get_many_with_ttl(
+        self, keys: List[str]
+    ) -> Dict[str, Tuple[Any, Optional[float]]]:
+        result = {}
+        for key in keys:
+            value, ttl = await self.get_with_ttl(key)
+            if value is not None:
+                result[key] = (value, ttl)
+        return result
+
+    async def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        seconds = _seconds(expire)
+        deadline = time.monotonic() + seconds if seconds else None
+        self._values[key] = (encode(value), deadline)
+        self._writes += 1
+        if self._writes % SWEEP_INTERVAL == 0:
+            self.sweep()
+
+    async def set_many(
+        self, mapping: Dict[str, Any], expire: Optional[float] = None
+    ) -> None:
+        for key, value in mapping.items():
+            await self.set(key, value, expire)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._values.pop(key, None)
+
+    def sweep(self) -> None:
+        """清理过期键，如生成后未被校验的验证码"""
+        now = time.monotonic()
+        expired = [
+            k for k, (_, deadline) in self._values.items() if deadline and deadline <= now
+        ]
+        for key in expired:
+            del self._values[key]
+
+
+class RedisBackend(Backend):
+    """Redis 缓存，连接由连接池复用"""
+
+    def __init__(self, url: str, pool_size: int = 10) -> None:
+        from redis.asyncio import Redis
+
+        self.client = Redis.from_url(url, max_connections=pool_size)
+
+    async def get(self, key: str) -> Any:
+        return decode(await self.client.get(key))
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+        values = await self.client.mget(keys)
+        return {k: decode(v) for k, v in zip(keys, values) if v is not None}
+
+    async def get_with_ttl(self, key: str) -> Tuple[Any, Optional[float]]:
+        return (await self.get_many_with_ttl([key])).get(key, (None, None))
+
+    async def get_many_with_ttl(
+        self, keys: List[str]
+    ) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """值及剩余有效期在同一次往返中读取"""
+        if not keys:
+            return {}
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.mget(keys)
+            for key in keys:
+                pipe.pttl(key)
+            values, *ttls = await pipe.execute()
+        return {
+            k: (decode(v), ttl / 1000 if ttl and ttl > 0 else None)
+            for k, v, ttl in zip(keys, values, ttls)
+            if v is not None
+        }
+
+    async def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        await self.client.set(key, encode(value), ex=_seconds(expire))
+
+    async def set_many(
+        self, mapping: Dict[str, Any], expire: Optional[float] = None
+    ) -> None:
+        if not mapping:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, encode(value), ex=_seconds(expire))
+            await pipe.execute()
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self.client.publish(channel, message)
+
+    async def listen(self, channel: str) -> AsyncIterator[str]:
+        """订阅频道，逐条返回消息"""
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = message["data"]
+                yield data.decode("utf-8") if isinstance(data, bytes) else data
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def fastapi_backend(self) -> Any:
+        from fastapi_cache.backends.redis import RedisBackend as FastAPIRedisBackend
+
+        return FastAPIRedisBackend(self.client)
+
+
+class MemcachedBackend(Backend):
+    """Memcached 缓存，连接由连接池复用"""
+
+    def __init__(self, host: str, port: int = 11211, pool_size: int = 10) -> None:
+        import aiomcache
+
+        self.client = aiomcache.Client(host, port, pool_size=pool_size)
 
-def init(prefix: str) -> None:
+    @staticmethod
+    def _key(key: str) -> bytes:
+        """memcached 的键最长 250 字节且不能包含空白及控制字符，超出时使用摘要"""
+        raw = key.encode("utf-8")
+        if len(raw) > 250 or any(c <= 32 or c == 127 for c in raw):
+            return b"sha1:" + hashlib.sha1(raw).hexdigest().encode("ascii")
+        return raw
+
+    async def get(self, key: str) -> Any:
+        return decode(await self.client.get(self._key(key)))
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+        values = await self.client.multi_get(*(self._key(k) for k in keys))
+        return {k: decode(v) for k, v in zip(keys, values) if v is not None}
+
+    async def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        await self.client.set(
+            self._key(key), encode(value), exptime=self._exptime(expire)
+        )
+
+    @staticmethod
+    def _exptime(expire: Optional[float]) -> int:
+        """过期时间超过 30 天时转换为 Unix 时间戳，0 表示不过期"""
+        seconds = _seconds(expire) or 0
+        if seconds > MEMCACHED_MAX_RELATIVE_EXPIRE:
+            return int(time.time()) + seconds
+        return seconds
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            await self.client.delete(self._key(key))
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def fastapi_backend(self) -> Any:
+        from fastapi_cache.backends.memcached import MemcachedBackend as FastAPIMemcached
+
+        return FastAPIMemcached(self.client)
+
+
+class TieredBackend(Backend):
+    """
+    两级缓存：进程内 LRU 在前，Redis 在后
+
+    写入及删除后通过发布订阅通知其他进程移除本地副本，
+    通知丢失（如订阅断线）时本地副本最多保留 LOCAL_TTL 秒；
+    本地副本不超过远端的剩余有效期，与其他驱动一样保存编码后的值
+    """
+
+    def __init__(
+        self,
+        remote: Any,
+        size: int,
+        ttl: float,
+        channel: str,
+        on_invalidate: Optional[Callable[[List[str]], Any]] = None,
+    ) -> None:
+        self.remote = remote
+        self.size = size
+        self.ttl = ttl
+        self.channel = channel
+        self.on_invalidate = on_invalidate
+
+        # 本进程标识，忽略自己发出的通知
+        self.id = uuid.uuid4().hex
+
+        # 键 -> (编码后的值, 过期时间)
+        self._local: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+
+        # 失效版本号，读取远端期间收到失效通知时不写入本地
+        self._version = 0
+
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_local(self, key: str) -> Tuple[bool, Any]:
+        item = self._local.get(key)
+        if item is None:
+            return False, None
+        if item[1] <= time.monotonic():
+            del self._local[key]
+            return False, None
+        self._local.move_to_end(key)
+        return True, decode(item[0])
+
+    def _put_local(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        ttl = min(self.ttl, expire) if expire and expire > 0 else self.ttl
+        self._local[key] = (encode(value), time.monotonic() + ttl)
+        self._local.move_to_end(key)
+        while len(self._local) > self.size:
+            self._local.popitem(last=False)
+
+    def forget(self, keys: Optional[Iterable[str]] = None) -> None:
+        """移除本地副本，keys 为 None 时移除全部"""
+        self._version += 1
+        if keys is None:
+            self._local.clear()
+            return
+        for key in keys:
+            self._local.pop(key, None)
+
+    async def get(self, key: str) -> Any:
+        found, value = self._get_local(key)
+        if found:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        version = self._version
+        value, ttl = await self.remote.get_with_ttl(key)
+        if value is not None and version == self._version:
+            self._put_local(key, value, ttl)
+        return value
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        result = {}
+        missing = []
+        for key in keys:
+            found, value = self._get_local(key)
+            if found:
+                result[key] = value
+            else:
+                missing.append(key)
+        self.hits += len(result)
+        self.misses += len(missing)
+        if not missing:
+            return result
+
+        version = self._version
+        values = await self.remote.get_many_with_ttl(missing)
+        for key, (value, ttl) in values.items():
+            if version == self._version:
+                self._put_local(key, value, ttl)
+            result[key] = value
+        return result
+
+    async def set(self, key: str, value: Any, expire: Optional[float] = None) -> None:
+        await self.remote.set(key, value, expire)
+        self.forget([key])
+        self._put_local(key, value, expire)
+        await self.publish([key])
+
+    async def set_many(
+        self, mapping: Dict[str, Any], expire: Optional[float] = None
+    ) -> None:
+        if not mapping:
+            return
+        await self.remote.set_many(mapping, expire)
+        self.forget(mapping)
+        for key, value in mapping.items():
+            self._put_local(key, value, expire)
+        await self.publish(list(mapping))
+
+    async def delete(self, *keys: str) -> None:
+        await self.remote.delete(*keys)
+        self.forget(keys)
+        await self.publish(list(keys))
+
+    async def publish(self, keys: List[str]) -> None:
+        """通知其他进程移除本地副本，发送失败时其他进程的副本在有效期后过期"""
+        if not keys:
+            return
+        try:
+            await self.remote.publish(
+                self.channel, json.dumps({"id": self.id, "keys": keys})
+            )
+        except Exception:
+            logger.exception("cache invalidation publish failed")
+
+    def receive(self, message: str) -> None:
+        """处理失效通知"""
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        if data.get("id") == self.id:
+            return
+        keys = data.get("keys") or []
+        self.forget(keys)
+        if self.on_invalidate is not None:
+            self.on_invalidate(keys)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async for message in self.remote.listen(self.channel):
+                    self.receive(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("cache invalidation subscription failed")
+            # 断线期间可能错过通知，重连前清空本地副本
+            self.forget()
+            await asyncio.sleep(1)
+
+    def start(self) -> None:
+        """启动失效订阅，已启动时忽略"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._local.clear()
+        await self.remote.close()
+
+    def fastapi_backend(self) -> Any:
+        return self.remote.fastapi_backend()
+
+
+# 当前缓存后端，未初始化时使用进程内缓存
+_backend: Backend = MemoryBackend()
+
+
+def create_backend(driver: str, url: Optional[str], pool_size: int) -> Backend:
+    """按驱动创建缓存后端"""
+    if driver == "memory":
+        return MemoryBackend()
+    if driver == "redis":
+        return RedisBackend(url or "redis://127.0.0.1:6379/0", pool_size)
+    if driver == "memcached":
+        parsed = urlparse(url or "memcached://127.0.0.1:11211")
+        return MemcachedBackend(
+            parsed.hostname or "127.0.0.1", parsed.port or 11211, pool_size
+        )
+    raise ValueError(f"Unsupported cache driver: {driver}")
+
+
+def init(
+    prefix: str = "quark-cache",
+    driver: str = "memory",
+    url: Optional[str] = None,
+    pool_size: int = 10,
+    local_size: int = 0,
+    local_ttl: float = 5,
+) -> None:
     """初始化缓存"""
-    FastAPICache.init(InMemoryBackend(), prefix=prefix)
+    global _backend, DRIVER, URL, PREFIX, POOL_SIZE, LOCAL_SIZE, LOCAL_TTL
+    DRIVER = driver
+    URL = url
+    PREFIX = prefix
+    POOL_SIZE = pool_size
+    LOCAL_SIZE = local_size
+    LOCAL_TTL = local_ttl
+
+    backend = create_backend(driver, url, pool_size)
+    if driver == "redis" and local_size > 0:
+        backend = TieredBackend(
+            backend, local_size, local_ttl, namespaced("invalidate"), _notify
+        )
+    _backend = backend
+    FastAPICache.init(backend.fastapi_backend(), prefix=prefix)
+
+
+def start() -> None:
+    """启动两级缓存的失效订阅"""
+    if isinstance(_backend, TieredBackend):
+        _backend.start()
+
+
+async def close() -> None:
+    """关闭缓存连接"""
+    global _backend
+    await _backend.close()
+    _backend = MemoryBackend()
+
+
+def backend() -> Backend:
+    """当前缓存后端"""
+    return _backend
 
 
-async def set(key: str, value: Any, expire: int | None = None) -> None:
-    await FastAPICache.get_backend().set(key, value, expire)
+def namespaced(name: str) -> str:
+    """加上命名空间前缀的键"""
+    return f"{PREFIX}:{name}"
+
+
+def on_invalidate(callback: Callable[[List[str]], Any]) -> None:
+    """
+    注册失效回调
+
+    两级缓存模式下，其他进程写入或删除缓存时以不含前缀的键调用，进程内缓存可据此同步失效
+    """
+    _listeners.append(callback)
+
+
+def _notify(keys: List[str]) -> None:
+    start = len(PREFIX) + 1
+    names = [k[start:] for k in keys if k.startswith(PREFIX + ":")]
+    for callback in _listeners:
+        try:
+            callback(names)
+        except Exception:
+            logger.exception("cache invalidation callback failed")
+
+
+async def set(key: str, value: Any, expire: Optional[float] = None) -> None:
+    await _backend.set(namespaced(key), value, expire)
 
 
 async def get(key: str) -> Any:
-    return await FastAPICache.get_backend().get(key)
+    return await _backend.get(namespaced(key))
+
+
+async def get_many(keys: Iterable[str]) -> Dict[str, Any]:
+    """批量读取，返回存在的键及其值"""
+    names = list(keys)
+    values = await _backend.get_many([namespaced(name) for name in names])
+    return {
+        name: values[namespaced(name)] for name in names if namespaced(name) in values
+    }
+
+
+async def set_many(mapping: Dict[str, Any], expire: Optional[float] = None) -> None:
+    """批量写入"""
+    await _backend.set_many({namespaced(k): v for k, v in mapping.items()}, expire)
+
+
+async def delete(*keys: str) -> None:
+    await _backend.delete(*(namespaced(k) for k in keys))
+
+
+def stats() -> Dict[str, Any]:
+    """缓存统计"""
+    result: Dict[str, Any] = {"driver": DRIVER}
+    if isinstance(_backend, TieredBackend):
+        result.update(
+            local=len(_backend._local), hits=_backend.hits, misses=_backend.misses
+        )
+    return result
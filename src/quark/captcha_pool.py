@@ -0,0 +1,131 @@
+import asyncio
+import base64
+import logging
+import random
+import string
+import uuid
+from collections import deque
+from io import BytesIO
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from captcha.image import ImageCaptcha
+
+from . import executor
+
+logger = logging.getLogger(__name__)
+
+# 预渲染的验证码数量
+SIZE: int = 200
+
+# 剩余数量低于该值时触发后台补充
+WATERMARK: int = 50
+
+# 每次提交到执行池渲染的数量
+BATCH_SIZE: int = 10
+
+# 预渲染的验证码 (id, 答案, base64 PNG)
+_pool: Deque[Tuple[str, str, str]] = deque()
+
+# 后台补充任务
+_refill_task: Optional[asyncio.Task] = None
+
+# 统计
+_hits = 0
+_misses = 0
+
+
+def render_captcha(text: str) -> bytes:
+    """渲染验证码 PNG 图片"""
+    image = ImageCaptcha(width=170, height=50).generate_image(text)
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_batch(count: int) -> List[Tuple[str, str, str]]:
+    """批量生成验证码，在执行池中运行以减少调度开销"""
+    items = []
+    for _ in range(count):
+        text = "".join(random.choices(string.digits, k=4))
+        image = base64.b64encode(render_captcha(text)).decode("utf-8")
+        items.append((str(uuid.uuid4()), text, image))
+    return items
+
+
+def init(size: int = 200, watermark: int = 50) -> None:
+    """设置验证码池大小及补充水位"""
+    global SIZE, WATERMARK
+    SIZE = max(0, size)
+    WATERMARK = min(max(0, watermark), SIZE)
+
+
+def start() -> None:
+    """启动后台预渲染"""
+    refill()
+
+
+async def close() -> None:
+    """停止后台补充并清空验证码池"""
+    global _refill_task
+    if _refill_task is not None:
+        _refill_task.cancel()
+        try:
+            await _refill_task
+        except asyncio.CancelledError:
+            pass
+    _refill_task = None
+    _pool.clear()
+
+
+def refill() -> None:
+    """后台补充验证码池，已有补充任务时不重复启动"""
+    global _refill_task
+    if SIZE <= 0 or len(_pool) >= SIZE:
+        return
+    if _refill_task is not None and not _refill_task.done():
+        return
+    _refill_task = asyncio.create_task(_refill())
+
+
+async def _refill() -> None:
+    while len(_pool) < SIZE:
+        count = min(BATCH_SIZE, SIZE - len(_pool))
+        try:
+            items = await executor.run_cpu(render_batch, count)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("captcha pool refill failed")
+            return
+        _pool.extend(items)
+
+
+async def get() -> Tuple[str, str, str]:
+    """
+    取出一个验证码 (id, 答案, base64 PNG)
+
+    验证码池为空时直接渲染
+    """
+    global _hits, _misses
+    try:
+        item = _pool.popleft()
+        _hits += 1
+    except IndexError:
+        _misses += 1
+        item = (await executor.run_cpu(render_batch, 1))[0]
+
+    if len(_pool) < WATERMARK or not _pool:
+        refill()
+    return item
+
+
+def stats() -> Dict[str, Any]:
+    """验证码池统计"""
+    return {
+        "size": len(_pool),
+        "capacity": SIZE,
+        "watermark": WATERMARK,
+        "hits": _hits,
+        "misses": _misses,
+        "refilling": _refill_task is not None and not _refill_task.done(),
+    }
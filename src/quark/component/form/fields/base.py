@@ -233,6 +233,11 @@ class Base(Component):
     回调函数
     """
 
+    json_decode: Optional[bool] = Field(exclude=True, default=None)
+    """
+    列表页、详情页是否将 JSON 字符串解析为对象，为 None 时按组件类型判断
+    """
+
     @model_validator(mode="after")
     def init(self):
         self.set_key()
@@ -255,9 +260,12 @@ class Base(Component):
         return self
 
     def set_width(self, width: Any):
-        """设置组件的宽度。"""
+        """设置组件的宽度，None 表示不限制宽度。"""
         style = self.style.copy() if self.style else {}
-        style["width"] = width
+        if width is None:
+            style.pop("width", None)
+        else:
+            style["width"] = width
         self.style = style
         return self
 
@@ -674,6 +682,11 @@ class Base(Component):
             self.callback = closure
         return self
 
+    def set_json_decode(self, json_decode: bool):
+        """设置列表页、详情页是否将 JSON 字符串解析为对象。"""
+        self.json_decode = json_decode
+        return self
+
     def get_callback(self) -> Optional[Callable[[Dict[str, Any]], Any]]:
         """获取回调函数。"""
         return self.callback
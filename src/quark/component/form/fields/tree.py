@@ -1,5 +1,6 @@
 from typing import Any, Dict, List, Optional
 
+from ....utils import build_tree, get_item_value
 from .base import Base
 
 
@@ -529,7 +530,7 @@ class Tree(Base):
         self, items: Any, pid: int, parent_key_name: str, key_name: str, title_name: str
     ) -> List[TreeData]:
         """
-        使用反射构建树结构。
+        单次遍历构建树结构，支持对象和字典两种格式。
 
         Args:
             items (Any): 包含树节点数据的对象。
@@ -541,30 +542,17 @@ class Tree(Base):
         Returns:
             List[TreeData]: 构建好的树节点数据列表。
         """
-        tree = []
-
-        for item in items:
-            # 支持对象和字典两种格式
-            if hasattr(item, key_name):
-                key = getattr(item, key_name)
-                parent_key = getattr(item, parent_key_name)
-                title = getattr(item, title_name)
-            elif isinstance(item, dict):
-                key = item.get(key_name)
-                parent_key = item.get(parent_key_name)
-                title = item.get(title_name)
-            else:
-                # 如果既不是对象也不是字典，跳过该项
-                continue
-
-            if parent_key == pid:
-                children = self.build_tree(
-                    items, key, parent_key_name, key_name, title_name
-                )
-                option = TreeData(title=title, key=key, children=children)
-                tree.append(option)
-
-        return tree
+        return build_tree(
+            items,
+            key_name,
+            parent_key_name,
+            pid,
+            lambda item, children: TreeData(
+                title=get_item_value(item, title_name),
+                key=get_item_value(item, key_name),
+                children=children,
+            ),
+        )
 
     def list_to_tree_data(
         self,
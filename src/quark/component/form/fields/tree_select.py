@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
+from ....utils import build_tree, get_item_value
 from .base import Base
 
 
@@ -361,30 +362,17 @@ class TreeSelect(Base):
         title_name: str,
         value_name: str,
     ) -> List[TreeData]:
-        tree = []
-
-        for item in items:
-            # 支持对象和字典两种格式
-            if hasattr(item, value_name):
-                value = getattr(item, value_name)
-                parent_key = getattr(item, parent_key_name)
-                title = getattr(item, title_name)
-            elif isinstance(item, dict):
-                value = item.get(value_name)
-                parent_key = item.get(parent_key_name)
-                title = item.get(title_name)
-            else:
-                # 如果既不是对象也不是字典，跳过该项
-                continue
-
-            if parent_key == pid:
-                children = self.build_tree(
-                    items, value, parent_key_name, title_name, value_name
-                )
-                option = TreeData(title=title, value=value, children=children)
-                tree.append(option)
-
-        return tree
+        return build_tree(
+            items,
+            value_name,
+            parent_key_name,
+            pid,
+            lambda item, children: TreeData(
+                title=get_item_value(item, title_name),
+                value=get_item_value(item, value_name),
+                children=children,
+            ),
+        )
 
     def list_to_tree_data(
         self,
@@ -128,11 +128,12 @@ class Column(Component):
         else:
             get_options = options
 
-        self.editable = {
-            "name": name,
-            "options": get_options,
-            "action": action,
-        }
+        # 值为 None 的键不输出，保持组件树可直接序列化
+        editable = {"name": name}
+        if get_options is not None:
+            editable["options"] = get_options
+        editable["action"] = action
+        self.editable = editable
         return self
 
     def set_actions(self, actions: Any):
@@ -139,6 +139,7 @@ class Table(Component):
         total: int,
         default_current: int,
         page_size_options: list,
+        cursor: Optional[str] = None,
     ):
         self.pagination = {
             "current": current,
@@ -147,6 +148,8 @@ class Table(Component):
             "defaultCurrent": default_current,
             "pageSizeOptions": page_size_options,
         }
+        if cursor:
+            self.pagination["cursor"] = cursor
         return self
 
     def set_polling(self, polling: int):
@@ -1,5 +1,6 @@
 from pydantic import Field, model_validator
 from typing import Any, List, Optional, Union
+from ...utils import build_tree, get_item_value
 from ..component import Component
 
 
@@ -470,7 +471,7 @@ class TreeBar(Component):
         title_name: str,
     ) -> List[TreeData]:
         """
-        使用递归构建树结构。
+        单次遍历构建树结构，支持对象和字典两种格式。
 
         Args:
             items (Any): 树节点数据列表。
@@ -482,30 +483,17 @@ class TreeBar(Component):
         Returns:
             List[TreeData]: 树结构数据列表。
         """
-        tree = []
-
-        for item in items:
-            # 支持对象和字典两种格式
-            if hasattr(item, key_name):
-                key = getattr(item, key_name)
-                parent_key = getattr(item, parent_key_name)
-                title = getattr(item, title_name)
-            elif isinstance(item, dict):
-                key = item.get(key_name)
-                parent_key = item.get(parent_key_name)
-                title = item.get(title_name)
-            else:
-                # 如果既不是对象也不是字典，跳过该项
-                continue
-
-            if parent_key == pid:
-                children = self.build_tree(
-                    items, key, parent_key_name, key_name, title_name
-                )
-                option = TreeData(title=title, key=key, children=children)
-                tree.append(option)
-
-        return tree
+        return build_tree(
+            items,
+            key_name,
+            parent_key_name,
+            pid,
+            lambda item, children: TreeData(
+                title=get_item_value(item, title_name),
+                key=get_item_value(item, key_name),
+                children=children,
+            ),
+        )
 
     def list_to_tree_data(
         self,
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from tortoise.signals import post_delete, post_save
+
+from . import cache
+from .models.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 共享版本号的键，修改配置后写入新值：两级缓存模式下其他进程收到失效通知，
+# 其他共享驱动（redis、memcached）下其他进程按间隔检查
+VERSION_KEY = "config_cache:version"
+
+# 配置项名称 -> 值
+_values: Dict[str, str] = {}
+
+# 缓存有效期（秒），缓存驱动为 memory 时，其他进程的修改在过期后生效；0 表示不过期
+TTL: float = 60
+
+# 加载时间，为 None 表示需要重新加载
+_loaded_at: Optional[float] = None
+
+# 失效版本号，加载期间发生写入时不标记为已加载
+_version = 0
+
+# 重建锁
+_lock = asyncio.Lock()
+
+# 共享版本号的检查间隔（秒）
+_sync_interval: float = 1.0
+
+# 上次检查共享版本号的时间
+_checked_at: float = 0
+
+# 当前缓存对应的共享版本号，为 None 表示尚未检查，其他进程未修改过配置时为空字符串
+_synced_version: Optional[str] = None
+
+# 统计
+_loads = 0
+_hits = 0
+
+
+def init(sync_interval: float = 1.0, ttl: float = 60) -> None:
+    """设置共享版本号的检查间隔及缓存有效期，跨进程同步使用 quark.cache 的缓存驱动"""
+    global _sync_interval, _checked_at, _synced_version, TTL
+    TTL = ttl
+    _sync_interval = sync_interval
+    _checked_at = 0
+    _synced_version = None
+
+
+def invalidate() -> None:
+    """标记缓存失效，下次读取时重新加载"""
+    global _loaded_at, _version
+    _loaded_at = None
+    _version += 1
+
+
+def _expired() -> bool:
+    if _loaded_at is None:
+        return True
+    return bool(TTL) and time.monotonic() - _loaded_at > TTL
+
+
+async def load() -> None:
+    """加载启用的配置项"""
+    global _values, _loaded_at, _loads
+    async with _lock:
+        if not _expired():
+            return
+
+        version = _version
+        loaded_at = time.monotonic()
+        rows = await Config.filter(status=1).values_list("name", "value")
+        _values = {name: value for name, value in rows}
+        _loads += 1
+        if version == _version:
+            _loaded_at = loaded_at
+
+
+def _polling() -> bool:
+    """共享缓存驱动且没有失效通知时，按间隔检查共享版本号"""
+    return cache.DRIVER != "memory" and not isinstance(
+        cache.backend(), cache.TieredBackend
+    )
+
+
+async def _sync() -> None:
+    """按间隔检查共享版本号，其他进程修改过配置时标记失效"""
+    global _checked_at, _synced_version
+    now = time.monotonic()
+    if now - _checked_at < _sync_interval:
+        return
+    _checked_at = now
+
+    try:
+        version = await cache.get(VERSION_KEY) or ""
+    except Exception as e:
+        logger.warning("config sync failed: %s", e)
+        return
+
+    if version != _synced_version:
+        if _synced_version is not None:
+            invalidate()
+        _synced_version = version
+
+
+async def publish() -> None:
+    """本进程修改配置后写入新的共享版本号，通知其他进程"""
+    global _synced_version
+    version = uuid.uuid4().hex
+    try:
+        await cache.set(VERSION_KEY, version)
+        _synced_version = version
+    except Exception as e:
+        logger.warning("config publish failed: %s", e)
+
+
+async def get_all() -> Dict[str, str]:
+    """获取全部启用的配置项"""
+    global _hits
+    if _polling():
+        await _sync()
+    if _expired():
+        await load()
+    else:
+        _hits += 1
+    return _values
+
+
+async def get(key: str, default: str = "") -> str:
+    """获取配置项的值"""
+    values = await get_all()
+    value = values.get(key)
+    return default if value is None else value
+
+
+def stats() -> Dict[str, int]:
+    """缓存统计"""
+    return {
+        "configs": len(_values),
+        "loads": _loads,
+        "hits": _hits,
+    }
+
+
+async def changed() -> None:
+    """配置已修改：本进程缓存失效并通知其他进程"""
+    invalidate()
+    await publish()
+
+
+def _on_invalidate(names: List[str]) -> None:
+    if VERSION_KEY in names:
+        invalidate()
+
+
+cache.on_invalidate(_on_invalidate)
+
+
+@post_save(Config)
+async def _on_save(sender, instance, created, using_db, update_fields) -> None:
+    await changed()
+
+
+@post_delete(Config)
+async def _on_delete(sender, instance, using_db) -> None:
+    await changed()
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tortoise.signals import post_delete, post_save
+
+from . import cache
+from .models.department import Department
+
+logger = logging.getLogger(__name__)
+
+# 两级缓存模式下，部门修改后删除该键，其他进程收到失效通知后重新加载
+CHANGED_KEY = "department_index:changed"
+
+# 索引有效期（秒），批量 update/delete 不触发模型信号，过期后重新加载；0 表示不过期
+TTL: float = 300
+
+# 父级ID -> 启用状态的子部门ID，按ID排序
+_children: Dict[int, List[int]] = {}
+
+# 先序遍历顺序，每棵子树在其中连续排列
+_order: List[int] = []
+
+# 部门ID -> (左值, 右值)，即子树在先序序列中的区间 [左值, 右值)，等价于嵌套集合编号
+_spans: Dict[int, Tuple[int, int]] = {}
+
+# 加载时间，为 None 表示需要重新加载
+_loaded_at: Optional[float] = None
+
+# 失效版本号，加载期间发生写入时不标记为已加载
+_version = 0
+
+# 重建锁
+_lock = asyncio.Lock()
+
+# 统计
+_loads = 0
+_hits = 0
+
+
+def init(ttl: float = 300) -> None:
+    """设置索引有效期"""
+    global TTL
+    TTL = ttl
+    invalidate()
+
+
+def invalidate() -> None:
+    """标记索引失效，下次查询时重新加载"""
+    global _loaded_at, _version
+    _loaded_at = None
+    _version += 1
+
+
+async def publish() -> None:
+    """
+    通知其他进程部门已修改
+
+    仅两级缓存模式（CACHE_DRIVER=redis 且 CACHE_LOCAL_SIZE > 0）会发送通知，
+    其他模式下其他进程在索引过期后重新加载
+    """
+    try:
+        await cache.delete(CHANGED_KEY)
+    except Exception as e:
+        logger.warning("department index publish failed: %s", e)
+
+
+async def changed() -> None:
+    """部门已修改：标记本进程索引失效并通知其他进程"""
+    invalidate()
+    await publish()
+
+
+def _expired() -> bool:
+    if _loaded_at is None:
+        return True
+    return bool(TTL) and time.monotonic() - _loaded_at > TTL
+
+
+def _number(children: Dict[int, List[int]], ids: List[int]) -> Tuple[list, dict]:
+    """
+    计算先序序列与子树区间
+
+    从父级不在启用部门中的节点（含顶级部门）开始遍历，
+    处于循环引用中的部门不可达，不会出现在序列中
+    """
+    active = set(ids)
+    order: List[int] = []
+    spans: Dict[int, Tuple[int, int]] = {}
+    starts: Dict[int, int] = {}
+
+    roots = [
+        child
+        for pid, items in children.items()
+        if pid not in active
+        for child in items
+    ]
+    for root in roots:
+        stack = [(root, False)]
+        while stack:
+            id, done = stack.pop()
+            if done:
+                spans[id] = (starts[id], len(order))
+                continue
+            if id in starts:
+                continue
+            starts[id] = len(order)
+            order.append(id)
+            stack.append((id, True))
+            for child in reversed(children.get(id, ())):
+                stack.append((child, False))
+
+    return order, spans
+
+
+async def load() -> None:
+    """加载部门表并重建索引"""
+    global _children, _order, _spans, _loaded_at, _loads
+    async with _lock:
+        if not _expired():
+            return
+
+        version = _version
+        loaded_at = time.monotonic()
+        rows = (
+            await Department.filter(status=1).order_by("id").values_list("id", "pid")
+        )
+        children: Dict[int, List[int]] = {}
+        for id, pid in rows:
+            children.setdefault(pid, []).append(id)
+
+        _children = children
+        _order, _spans = _number(children, [id for id, _ in rows])
+        _loads += 1
+        if version == _version:
+            _loaded_at = loaded_at
+
+
+async def _ensure_loaded() -> None:
+    global _hits
+    if _expired():
+        await load()
+    else:
+        _hits += 1
+
+
+def _descendants(pid: int) -> List[int]:
+    ids: List[int] = []
+    for child in _children.get(pid, ()):
+        span = _spans.get(child)
+        if span:
+            ids.extend(_order[span[0] : span[1]])
+    return ids
+
+
+async def get_children_ids(pid: int) -> List[int]:
+    """获取启用状态的全部子孙部门ID，不含自身"""
+    await _ensure_loaded()
+    return _descendants(pid)
+
+
+async def get_subtree_ids(ids: Iterable[int]) -> List[int]:
+    """获取部门及其全部子孙部门ID，已去重"""
+    await _ensure_loaded()
+    result: Dict[int, None] = {}
+    for id in ids:
+        result[id] = None
+        for child in _descendants(id):
+            result[child] = None
+    return list(result)
+
+
+def stats() -> Dict[str, int]:
+    """索引统计"""
+    return {
+        "departments": len(_order),
+        "loads": _loads,
+        "hits": _hits,
+    }
+
+
+def _on_invalidate(names: List[str]) -> None:
+    if CHANGED_KEY in names:
+        invalidate()
+
+
+cache.on_invalidate(_on_invalidate)
+
+
+@post_save(Department)
+async def _on_save(sender, instance, created, using_db, update_fields) -> None:
+    await changed()
+
+
+@post_delete(Department)
+async def _on_delete(sender, instance, using_db) -> None:
+    await changed()
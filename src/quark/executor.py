@@ -0,0 +1,152 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# 线程池大小
+THREADS: int = 8
+
+# 进程池大小，0 表示不启用，CPU 密集任务改用线程池
+PROCESSES: int = 0
+
+# 每个池允许的最大待执行任务数（执行中 + 排队），超出后调用方等待
+MAX_PENDING: int = 256
+
+
+class Pool:
+    """
+    有界执行池
+
+    通过信号量限制待执行任务数，并记录排队深度与等待时间
+    """
+
+    def __init__(self, name: str, executor: Executor, workers: int, max_pending: int):
+        self.name = name
+        self.executor = executor
+        self.workers = workers
+        self.semaphore = asyncio.Semaphore(max_pending)
+
+        # 统计
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.pending = 0
+        self.max_queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """在池中执行函数并等待结果"""
+        submitted_at = time.time()
+        self.pending += 1
+        # 超出工作线程（进程）数的部分视为排队
+        self.max_queued = max(self.max_queued, self.pending - self.workers)
+        try:
+            async with self.semaphore:
+                self.submitted += 1
+                loop = asyncio.get_running_loop()
+                call = functools.partial(_timed, fn, args, kwargs)
+                started_at, result = await loop.run_in_executor(self.executor, call)
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        wait = max(0.0, started_at - submitted_at)
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """执行池统计，等待时间单位为毫秒"""
+        finished = self.completed or 1
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending": self.pending,
+            "queued": max(0, self.pending - self.workers),
+            "max_queued": self.max_queued,
+            "wait_avg_ms": round(self.wait_total / finished * 1000, 3),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+def _timed(fn: Callable, args: Tuple, kwargs: Dict) -> Tuple[float, Any]:
+    """在工作线程或进程中执行，返回开始执行的时间"""
+    return time.time(), fn(*args, **kwargs)
+
+
+# 线程池
+_threads: Optional[Pool] = None
+
+# 进程池
+_processes: Optional[Pool] = None
+
+
+def init(threads: int = 8, processes: int = 0, max_pending: int = 256) -> None:
+    """设置执行池大小，已创建的执行池会被关闭并按新配置重建"""
+    global THREADS, PROCESSES, MAX_PENDING
+    shutdown(wait=False)
+    THREADS = threads
+    PROCESSES = processes
+    MAX_PENDING = max_pending
+
+
+def shutdown(wait: bool = True) -> None:
+    """关闭执行池"""
+    global _threads, _processes
+    for pool in (_threads, _processes):
+        if pool is not None:
+            pool.executor.shutdown(wait=wait, cancel_futures=not wait)
+    _threads = None
+    _processes = None
+
+
+def _thread_pool() -> Pool:
+    global _threads
+    if _threads is None:
+        _threads = Pool(
+            "thread",
+            ThreadPoolExecutor(THREADS, thread_name_prefix="quark-executor"),
+            THREADS,
+            MAX_PENDING,
+        )
+    return _threads
+
+
+def _process_pool() -> Pool:
+    global _processes
+    if _processes is None:
+        _processes = Pool(
+            "process", ProcessPoolExecutor(PROCESSES), PROCESSES, MAX_PENDING
+        )
+    return _processes
+
+
+async def run(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    """在线程池中执行阻塞函数，如 bcrypt、文件读写"""
+    return await _thread_pool().run(fn, *args, **kwargs)
+
+
+async def run_cpu(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    执行 CPU 密集函数，如图片编解码
+
+    启用进程池时在子进程中执行，函数及参数须可序列化；否则在线程池中执行
+    """
+    if PROCESSES > 0:
+        return await _process_pool().run(fn, *args, **kwargs)
+    return await _thread_pool().run(fn, *args, **kwargs)
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """各执行池统计"""
+    result = {}
+    for pool in (_threads, _processes):
+        if pool is not None:
+            result[pool.name] = pool.stats()
+    return result
@@ -1,14 +1,46 @@
+import ast
+import hashlib
+import importlib
 import importlib.util
+import json
+import logging
 import os
-from typing import Any, Dict, List
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import inflection
 
 from . import Request, config
 
+logger = logging.getLogger(__name__)
+
 # 全局缓存字典，用于缓存已加载的类
 _LOADED_CLASSES_CACHE: Dict[str, List[type]] = {}
 
+# 资源类型
+RESOURCE_TYPES = ("Resource", "Dashboard", "Auth", "Upload", "Layout", "Login")
+
+# 资源注册表：(资源类型, 资源名称) -> 资源类
+_RESOURCE_REGISTRY: Dict[Tuple[str, str], type] = {}
+
+# 按资源类型分组的资源类，保持注册顺序
+_RESOURCE_CLASSES: Dict[str, List[type]] = {}
+
+# 注册表是否已构建
+_REGISTRY_BUILT = False
+
+# 资源原型缓存：资源类 -> 已初始化的原型对象
+_PROTOTYPES: Dict[type, Any] = {}
+
+# 模块导入耗时：文件路径 -> 秒
+_IMPORT_TIMES: Dict[str, float] = {}
+
+# 预扫描清单文件
+MANIFEST_NAME = "quark_manifest.json"
+MANIFEST_VERSION = 1
+
 # 禁止扫描的目录（防止导入用户虚拟环境）
 IGNORE_DIRS = {
     "venv",
@@ -57,33 +89,19 @@ def load_method(
     return method(*args, **kwargs)
 
 
-def get_classes_in_package(package_path: str) -> List[type]:
-    """安全扫描指定目录，加载其中的类（带缓存）"""
-    global _LOADED_CLASSES_CACHE
-
-    # 检查缓存
-    if package_path in _LOADED_CLASSES_CACHE:
-        return _LOADED_CLASSES_CACHE[package_path]
-
-    classes = []
-    package_dir = os.path.abspath(package_path)
-
-    if not os.path.exists(package_dir):
-        _LOADED_CLASSES_CACHE[package_path] = classes
-        return classes
-
+def _iter_module_files(package_dir: str) -> List[Tuple[str, str]]:
+    """遍历目录下的模块文件，返回 (相对模块名, 文件路径)"""
+    module_files = []
     for root, dirs, files in os.walk(package_dir):
         # 过滤不应该扫描的目录
         dirs[:] = [d for d in dirs if d not in IGNORE_DIRS and not d.startswith(".")]
 
-        for file_name in files:
+        for file_name in sorted(files):
             if not file_name.endswith(".py"):
                 continue
             if file_name == "__init__.py":
                 continue
 
-            module_path = os.path.join(root, file_name)
-
             # 构造模块名（安全版本）
             rel_path = os.path.relpath(root, package_dir)
             rel_path = rel_path.replace(os.sep, ".")
@@ -97,74 +115,328 @@ def get_classes_in_package(package_path: str) -> List[type]:
             if not full_module_name.replace(".", "").isidentifier():
                 continue
 
+            module_files.append((full_module_name, os.path.join(root, file_name)))
+    return module_files
+
+
+def _package_prefix(package_dir: str) -> Optional[str]:
+    """推断目录对应的包名，无法通过 sys.path 导入时返回 None"""
+    if package_dir == os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"):
+        return f"{__package__}.app"
+
+    for path in sys.path:
+        base = os.path.abspath(path or os.getcwd())
+        if not package_dir.startswith(base + os.sep):
+            continue
+        parts = os.path.relpath(package_dir, base).split(os.sep)
+        if not all(part.isidentifier() for part in parts):
+            continue
+
+        # 避免与已导入的同名模块冲突
+        top_module = sys.modules.get(parts[0])
+        if top_module is not None:
+            top_paths = [
+                os.path.abspath(p) for p in getattr(top_module, "__path__", [])
+            ]
+            if os.path.join(base, parts[0]) not in top_paths:
+                continue
+        return ".".join(parts)
+    return None
+
+
+def _import_module(prefix: Optional[str], package_dir: str, name: str, path: str):
+    """导入模块，结果缓存于 sys.modules"""
+    if prefix is not None:
+        return importlib.import_module(f"{prefix}.{name}")
+
+    # 无法作为包导入时，使用稳定的模块名从文件加载
+    digest = hashlib.md5(package_dir.encode()).hexdigest()[:8]
+    module_name = f"_quark_modules_{digest}.{name}"
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if not spec or not spec.loader:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+def _scan_classes(path: str) -> Dict[str, List[str]]:
+    """通过 AST 获取文件中定义的类及其父类名称，不执行模块代码"""
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    classes = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = []
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                bases.append(base.id)
+            elif isinstance(base, ast.Attribute):
+                bases.append(base.attr)
+        classes[node.name] = bases
+    return classes
+
+
+def _load_manifest(manifest_path: str) -> Dict[str, Any]:
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest.get("files", {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _save_manifest(manifest_path: str, files: Dict[str, Any]) -> None:
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": files}, f)
+        os.replace(tmp_path, manifest_path)
+    except OSError:
+        pass
+
+
+def prescan_package(
+    package_dir: str, known_bases: Optional[Set[str]] = None
+) -> List[Tuple[str, str]]:
+    """
+    预扫描目录，只返回定义了资源类的模块文件
+
+    类定义通过 AST 获取，并按文件修改时间缓存到 __pycache__ 下的清单文件中
+    """
+    manifest_path = os.path.join(package_dir, "__pycache__", MANIFEST_NAME)
+    cached = _load_manifest(manifest_path)
+    files: Dict[str, Any] = {}
+    changed = False
+
+    module_files = _iter_module_files(package_dir)
+    for name, path in module_files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entry = cached.get(name)
+        if (
+            entry is None
+            or entry.get("mtime_ns") != stat.st_mtime_ns
+            or entry.get("size") != stat.st_size
+        ):
             try:
-                spec = importlib.util.spec_from_file_location(
-                    full_module_name, module_path
-                )
-                if not spec or not spec.loader:
-                    continue
+                classes = _scan_classes(path)
+            except (SyntaxError, ValueError, OSError):
+                # 无法解析的文件交由导入阶段报告错误
+                classes = {"*": []}
+            entry = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "classes": classes,
+            }
+            changed = True
+        files[name] = entry
+
+    if changed or len(files) != len(cached):
+        _save_manifest(manifest_path, files)
+
+    # 计算所有直接或间接继承资源类型的类名
+    resource_names = set(RESOURCE_TYPES) | (known_bases or set())
+    all_classes = [
+        (class_name, bases)
+        for entry in files.values()
+        for class_name, bases in entry["classes"].items()
+    ]
+    while True:
+        found = {
+            class_name
+            for class_name, bases in all_classes
+            if class_name not in resource_names
+            and any(base in resource_names for base in bases)
+        }
+        if not found:
+            break
+        resource_names |= found
+
+    return [
+        (name, path)
+        for name, path in module_files
+        if name in files
+        and any(
+            class_name == "*"
+            or any(base in resource_names for base in bases)
+            for class_name, bases in files[name]["classes"].items()
+        )
+    ]
+
+
+def get_classes_in_package(
+    package_path: str, known_bases: Optional[Set[str]] = None
+) -> List[type]:
+    """安全扫描指定目录，导入其中定义资源类的模块并返回模块内定义的类（带缓存）"""
+    global _LOADED_CLASSES_CACHE
+
+    # 检查缓存
+    if package_path in _LOADED_CLASSES_CACHE:
+        return _LOADED_CLASSES_CACHE[package_path]
+
+    classes = []
+    package_dir = os.path.abspath(package_path)
 
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+    if not os.path.exists(package_dir):
+        _LOADED_CLASSES_CACHE[package_path] = classes
+        return classes
 
-                # 遍历类
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if isinstance(attr, type):
-                        classes.append(attr)
+    if config.get("MODULE_PRESCAN", True):
+        module_files = prescan_package(package_dir, known_bases)
+    else:
+        module_files = _iter_module_files(package_dir)
+
+    prefix = _package_prefix(package_dir)
+    for full_module_name, module_path in module_files:
+        try:
+            start = time.perf_counter()
+            module = _import_module(
+                prefix, package_dir, full_module_name, module_path
+            )
+            _IMPORT_TIMES[module_path] = time.perf_counter() - start
+            if module is None:
+                continue
 
-            except Exception as e:
-                print(f"[WARN] 模块加载失败: {module_path} | {e}")
+            # 遍历模块内定义的类
+            for attr in vars(module).values():
+                if isinstance(attr, type) and attr.__module__ == module.__name__:
+                    classes.append(attr)
+
+        except Exception as e:
+            logger.warning("模块加载失败: %s | %s", module_path, e)
 
     # 缓存结果
     _LOADED_CLASSES_CACHE[package_path] = classes
     return classes
 
 
-def load_resource_classes(class_type: str) -> List[type]:
-    """从应用程序目录或quark包加载资源类"""
-    get_classes = []
+def get_import_report() -> List[Tuple[str, float]]:
+    """获取模块导入耗时（秒），按耗时倒序"""
+    return sorted(_IMPORT_TIMES.items(), key=lambda item: item[1], reverse=True)
 
-    # 遍历应用目录下的所有类
-    app_classes = get_classes_in_package(config.get("MODULE_PATH"))
 
-    # 遍历quark包目录下的所有类
-    quark_package_classes = get_classes_in_package(
-        os.path.join(os.path.dirname(__file__), "app")
-    )
+def log_import_report(limit: int = 10) -> None:
+    """输出模块导入耗时"""
+    report = get_import_report()
+    total = sum(elapsed for _, elapsed in report)
+    logger.info("资源模块导入: %d 个模块, 共 %.1fms", len(report), total * 1000)
+    for module_path, elapsed in report[:limit]:
+        logger.info("  %8.1fms  %s", elapsed * 1000, module_path)
 
-    # 查找指定类名的类
-    for getclass in app_classes + quark_package_classes:
-        if getclass.__bases__[0].__name__ == class_type:
-            get_classes.append(getclass)
 
-    return get_classes
+@lru_cache(maxsize=4096)
+def resource_key(name: str) -> str:
+    """资源名称转换为注册表键，如 action_log、actionLog 均为 ActionLog"""
+    return inflection.camelize(name)
 
 
-def load_resource(resource: str, class_type: str) -> Any:
-    """从应用程序目录或quark包加载资源类对象"""
-    app_class = None
+def get_class_type(cls: type) -> Optional[str]:
+    """获取类所属的资源类型，支持多层继承"""
+    for base in cls.__mro__[1:]:
+        if base.__name__ in RESOURCE_TYPES:
+            return base.__name__
+    return None
+
+
+def _add_resource(cls: type, name: str, class_type: str, override: bool) -> None:
+    key = (class_type, resource_key(name))
+    if key in _RESOURCE_REGISTRY and not override:
+        return
+    previous = _RESOURCE_REGISTRY.get(key)
+    classes = _RESOURCE_CLASSES.setdefault(class_type, [])
+    if previous is not None and previous in classes:
+        classes.remove(previous)
+    _RESOURCE_REGISTRY[key] = cls
+    if cls not in classes:
+        classes.append(cls)
 
-    # 遍历应用目录下的所有类
-    app_classes = get_classes_in_package(config.get("MODULE_PATH"))
+
+def register_resource(
+    cls: Optional[type] = None,
+    name: Optional[str] = None,
+    class_type: Optional[str] = None,
+) -> Any:
+    """
+    注册资源类，显式注册的资源优先于目录扫描结果
+
+    可直接调用 register_resource(User)，也可作为装饰器 @register_resource()
+    """
+
+    def decorator(target: type) -> type:
+        target_type = class_type or get_class_type(target)
+        if target_type is None:
+            raise ValueError(f"无法识别资源类型: {target.__name__}")
+        _add_resource(target, name or target.__name__, target_type, True)
+        return target
+
+    if cls is None:
+        return decorator
+    return decorator(cls)
+
+
+def build_registry() -> None:
+    """扫描应用目录及quark包目录，构建资源注册表"""
+    global _REGISTRY_BUILT
 
     # 遍历quark包目录下的所有类
     quark_package_classes = get_classes_in_package(
         os.path.join(os.path.dirname(__file__), "app")
     )
 
-    target_name = inflection.camelize(resource)
+    # 遍历应用目录下的所有类，应用可继承quark包内的资源
+    app_classes = []
+    if config.get("MODULE_DISCOVERY", True):
+        app_classes = get_classes_in_package(
+            config.get("MODULE_PATH"),
+            {getclass.__name__ for getclass in quark_package_classes},
+        )
 
-    # 查找指定类名的类
-    for getclass in app_classes + quark_package_classes:
-        if (
-            getclass.__name__ == target_name
-            and getclass.__bases__[0].__name__ == class_type
-        ):
-            app_class = getclass
-            break
+    classes = app_classes + quark_package_classes
+
+    for getclass in classes:
+        class_type = get_class_type(getclass)
+        if class_type is not None:
+            _add_resource(getclass, getclass.__name__, class_type, False)
+
+    _REGISTRY_BUILT = True
+
+
+def clear_registry() -> None:
+    """清空资源注册表"""
+    global _REGISTRY_BUILT
+    _RESOURCE_REGISTRY.clear()
+    _RESOURCE_CLASSES.clear()
+    _REGISTRY_BUILT = False
 
-    return app_class
+
+def load_resource_classes(class_type: str) -> List[type]:
+    """从资源注册表加载指定类型的资源类"""
+    if not _REGISTRY_BUILT:
+        build_registry()
+    return list(_RESOURCE_CLASSES.get(class_type, []))
+
+
+def load_resource(resource: str, class_type: str) -> Any:
+    """从资源注册表加载资源类"""
+    if not _REGISTRY_BUILT:
+        build_registry()
+    return _RESOURCE_REGISTRY.get((class_type, resource_key(resource)))
 
 
 async def load_resource_object(
@@ -174,4 +446,22 @@ async def load_resource_object(
     app_class = load_resource(resource, resource_class_type)
     if app_class is None:
         return None
+
+    # 开启原型缓存的资源只初始化一次，之后每个请求复制原型
+    if getattr(app_class, "cache_prototype", False):
+        prototype = _PROTOTYPES.get(app_class)
+        if prototype is None:
+            prototype = await app_class().init(request)
+            _PROTOTYPES[app_class] = prototype
+        clone = getattr(prototype, "clone", None) or prototype.model_copy
+        return clone()
+
     return await app_class().init(request)
+
+
+def clear_prototypes(app_class: Optional[type] = None) -> None:
+    """清除资源原型缓存"""
+    if app_class is None:
+        _PROTOTYPES.clear()
+    else:
+        _PROTOTYPES.pop(app_class, None)
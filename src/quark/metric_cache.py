@@ -0,0 +1,76 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+# 指标键 -> (计算结果, 过期时间)
+_values: Dict[str, Tuple[Any, float]] = {}
+
+# 指标键 -> 计算中的任务，并发请求共享同一次计算
+_pending: Dict[str, asyncio.Future] = {}
+
+# 统计
+_hits = 0
+_misses = 0
+
+
+def metric_key(metric: Any) -> str:
+    """按指标类及其参数生成缓存键"""
+    cls = type(metric)
+    params = metric.model_dump() if hasattr(metric, "model_dump") else {}
+    return f"{cls.__module__}.{cls.__qualname__}:" + json.dumps(
+        params, sort_keys=True, default=str
+    )
+
+
+async def evaluate(metric: Any) -> Any:
+    """
+    计算指标
+
+    指标的 cache_ttl 大于 0 时，结果在有效期内复用，过期前的并发请求共享同一次计算
+    """
+    global _hits, _misses
+    ttl = getattr(metric, "cache_ttl", None) or 0
+    if ttl <= 0:
+        return await metric.calculate()
+
+    key = metric_key(metric)
+    item = _values.get(key)
+    if item is not None and time.monotonic() < item[1]:
+        _hits += 1
+        return item[0]
+
+    pending = _pending.get(key)
+    if pending is not None:
+        _hits += 1
+        return await asyncio.shield(pending)
+
+    _misses += 1
+    future = asyncio.get_running_loop().create_future()
+    _pending[key] = future
+    try:
+        value = await metric.calculate()
+    except BaseException as e:
+        future.set_exception(e)
+        # 没有其他等待者时避免未获取异常的警告
+        future.exception()
+        raise
+    else:
+        _values[key] = (value, time.monotonic() + ttl)
+        future.set_result(value)
+        return value
+    finally:
+        _pending.pop(key, None)
+
+
+def forget(metric: Optional[Any] = None) -> None:
+    """移除指标缓存，metric 为 None 时移除全部"""
+    if metric is None:
+        _values.clear()
+    else:
+        _values.pop(metric_key(metric), None)
+
+
+def stats() -> Dict[str, int]:
+    """缓存统计"""
+    return {"metrics": len(_values), "hits": _hits, "misses": _misses}
@@ -1,86 +1,92 @@
+import logging
+from typing import Dict, Tuple
+
 from fastapi import Request
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import JSONResponse
+from starlette.routing import Match, Route
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from quark import Message
+from quark import Message, action_logger
 from quark.models import ActionLog
-from quark.services import ActionLogService, AuthService
+from quark.services import AuthService
+
+logger = logging.getLogger(__name__)
+
+# 后台路由前缀
+ADMIN_PREFIX = "/api/admin"
+
+# 登录路由
+LOGIN_ROUTES = {
+    "/api/admin/auth/{resource}/index",
+    "/api/admin/auth/{resource}/captcha",
+    "/api/admin/auth/{resource}/login",
+    "/api/admin/auth/{resource}/handle",
+}
+
+# 路由解析缓存上限
+ROUTE_CACHE_SIZE = 4096
 
 
 # 自定义中间件
-class Middleware(BaseHTTPMiddleware):
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
-        url_path = request.url.path
-        route = request.scope.get("route")
-        route_path = route.path if route else url_path
-
-        # 登录路由
-        login_routes = [
-            {
-                "path": "/api/admin/auth/{resource}/index",
-                "method": "GET",
-            },
-            {
-                "path": "/api/admin/auth/{resource}/captcha",
-                "method": "GET",
-            },
-            {
-                "path": "/api/admin/auth/{resource}/login",
-                "method": "POST",
-            },
-            {
-                "path": "/api/admin/auth/{resource}/handle",
-                "method": "GET",
-            },
-        ]
+class Middleware:
+    """
+    后台认证中间件
 
-        # 判断是否在登录路由中
-        in_login_route = any(v["path"] == route_path for v in login_routes)
-        if in_login_route:
-            return response
+    在执行路由处理函数之前完成路由解析、认证与鉴权，
+    静态资源及非后台请求直接透传
+    """
 
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+        # (method, path) -> 路由模板
+        self.route_cache: Dict[Tuple[str, str], str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # 排除非后台路由
-        if "api/admin" not in url_path:
-            return response
+        if scope["type"] != "http" or not scope["path"].startswith(ADMIN_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        url_path = scope["path"]
+        method = scope["method"]
+        route_path = self.resolve_route_path(scope)
+
+        # 判断是否在登录路由中
+        if route_path in LOGIN_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
 
         # 获取管理员信息
         auth_service = AuthService(request)
         try:
             admin_info = await auth_service.get_current_admin()
         except Exception as e:
-            return JSONResponse(
-                status_code=401,
-                content=jsonable_encoder(Message.error(str(e)), exclude_none=True),
-            )
+            await self.error(401, str(e))(scope, receive, send)
+            return
 
         # 权限验证
         if admin_info.id != 1:
             results = []
             for path in [route_path, url_path]:
                 try:
-                    result = await auth_service.check_permission(path, request.method)
+                    result = await auth_service.check_permission(path, method)
                     results.append(result)
                 except Exception as e:
-                    return JSONResponse(
-                        status_code=500,
-                        content=jsonable_encoder(
-                            Message.error(str(e)), exclude_none=True
-                        ),
-                    )
+                    await self.error(500, str(e))(scope, receive, send)
+                    return
 
             if not any(results):
-                return JSONResponse(
-                    status_code=403,
-                    content=jsonable_encoder(
-                        Message.error("403 Forbidden"), exclude_none=True
-                    ),
-                )
-
-        # 记录操作日志
-        await ActionLogService().insert_get_id(
+                await self.error(403, "403 Forbidden")(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+        # 记录操作日志，由后台任务批量写入
+        await action_logger.put(
             ActionLog(
                 uid=admin_info.id,
                 username=admin_info.username,
@@ -91,4 +97,42 @@ class Middleware(BaseHTTPMiddleware):
             )
         )
 
-        return response
+        # 认证上下文查询统计
+        auth_stats = auth_service.get_context().stats()
+        logger.debug(
+            "auth context %s %s: lookups=%d saved=%d",
+            method,
+            url_path,
+            auth_stats["lookups"],
+            auth_stats["saved"],
+        )
+
+    def resolve_route_path(self, scope: Scope) -> str:
+        """解析请求对应的路由模板，未匹配时返回请求路径"""
+        key = (scope["method"], scope["path"])
+        route_path = self.route_cache.get(key)
+        if route_path is not None:
+            return route_path
+
+        route_path = scope["path"]
+        app = scope.get("app")
+        routes = getattr(getattr(app, "router", None), "routes", [])
+        for route in routes:
+            if not isinstance(route, Route):
+                continue
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                route_path = route.path
+                break
+
+        if len(self.route_cache) >= ROUTE_CACHE_SIZE:
+            self.route_cache.clear()
+        self.route_cache[key] = route_path
+        return route_path
+
+    def error(self, status_code: int, message: str) -> JSONResponse:
+        """错误响应"""
+        return JSONResponse(
+            status_code=status_code,
+            content=jsonable_encoder(Message.error(message), exclude_none=True),
+        )
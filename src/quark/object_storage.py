@@ -0,0 +1,290 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote, urlparse
+
+from .schemas import MinioConfig, OSSConfig
+
+# 对象存储引用前缀，私有空间的附件地址保存为 s3://bucket/key，读取时生成预签名地址
+SCHEME = "s3://"
+
+# 分片上传的最小分片大小（S3 协议限制）
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+ObjectConfig = Union[OSSConfig, MinioConfig]
+
+logger = logging.getLogger(__name__)
+
+# 客户端会话，首次使用时创建
+_session: Any = None
+
+# 客户端生命周期
+_stack: Optional[AsyncExitStack] = None
+
+# 连接参数 -> 客户端，跨请求复用连接池
+_clients: Dict[Tuple, Any] = {}
+
+# 存储空间 -> 配置，用于生成预签名地址
+_buckets: Dict[str, ObjectConfig] = {}
+
+# 是否已登记上传资源配置的存储空间
+_uploads_registered = False
+
+# 创建客户端锁
+_lock = asyncio.Lock()
+
+
+def client_options(config: ObjectConfig) -> Dict[str, Any]:
+    """将 OSS / MinIO 配置转换为 S3 客户端参数"""
+    if isinstance(config, OSSConfig):
+        scheme = "https" if config.is_https else "http"
+        endpoint = config.endpoint
+        access_key, secret_key = config.access_key_id, config.access_key_secret
+        addressing_style = "virtual"
+    else:
+        scheme = "https" if config.secure else "http"
+        endpoint = config.endpoint
+        access_key, secret_key = config.access_key, config.secret_key
+        addressing_style = "path"
+
+    if "://" not in endpoint:
+        endpoint = f"{scheme}://{endpoint}"
+
+    return {
+        "endpoint_url": endpoint,
+        "aws_access_key_id": access_key,
+        "aws_secret_access_key": secret_key,
+        "region_name": config.region or "us-east-1",
+        "addressing_style": addressing_style,
+    }
+
+
+def register(config: ObjectConfig) -> None:
+    """登记存储空间配置，登记后可为该空间的对象生成预签名地址"""
+    _buckets[config.bucket] = config
+
+
+async def register_uploads() -> None:
+    """
+    登记上传资源配置的存储空间
+
+    启动时调用，重启后或在其他 worker 中，已保存的 s3://bucket/key 无需先经过上传即可解析
+    """
+    global _uploads_registered
+    from starlette.requests import Request
+
+    from . import loader
+
+    _uploads_registered = True
+    request = Request(
+        {"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""}
+    )
+    for cls in loader.load_resource_classes("Upload"):
+        try:
+            upload = await cls().init(request)
+        except Exception:
+            logger.exception("failed to load upload resource %s", cls.__name__)
+            continue
+        for config in (upload.oss_config, upload.minio_config):
+            if config is not None:
+                register(config)
+
+
+async def get_client(config: ObjectConfig) -> Any:
+    """获取复用的 S3 客户端"""
+    global _session, _stack
+    register(config)
+    options = client_options(config)
+    key = tuple(sorted(options.items()))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    async with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            return client
+
+        from aiobotocore.config import AioConfig
+        from aiobotocore.session import get_session
+
+        if _session is None:
+            _session = get_session()
+            _stack = AsyncExitStack()
+
+        addressing_style = options.pop("addressing_style")
+        client = await _stack.enter_async_context(
+            _session.create_client(
+                "s3",
+                config=AioConfig(
+                    s3={"addressing_style": addressing_style},
+                    signature_version="s3v4",
+                    max_pool_connections=max(10, config.max_concurrency * 2),
+                ),
+                **options,
+            )
+        )
+        _clients[key] = client
+        return client
+
+
+async def close() -> None:
+    """关闭全部客户端"""
+    global _session, _stack
+    if _stack is not None:
+        await _stack.aclose()
+    _clients.clear()
+    _session = None
+    _stack = None
+
+
+def object_key(config: ObjectConfig, save_path: str, filename: str) -> str:
+    """按路径前缀、保存路径及文件名生成对象键"""
+    parts = [config.path_prefix or "", save_path or "", filename]
+    segments = []
+    for part in parts:
+        part = part.replace("\\", "/")
+        if part.startswith("./web/app/"):
+            part = part[len("./web/app/") :]
+        segments.extend(s for s in part.split("/") if s and s != ".")
+    return "/".join(segments)
+
+
+def public_url(config: ObjectConfig, key: str) -> str:
+    """对象的公开访问地址"""
+    options = client_options(config)
+    if config.domain:
+        domain = config.domain
+        if "://" not in domain:
+            scheme = urlparse(options["endpoint_url"]).scheme
+            domain = f"{scheme}://{domain}"
+        return f"{domain.rstrip('/')}/{quote(key)}"
+
+    endpoint = urlparse(options["endpoint_url"])
+    if options["addressing_style"] == "virtual":
+        return f"{endpoint.scheme}://{config.bucket}.{endpoint.netloc}/{quote(key)}"
+    return f"{endpoint.scheme}://{endpoint.netloc}/{config.bucket}/{quote(key)}"
+
+
+def reference(config: ObjectConfig, key: str) -> str:
+    """对象引用 s3://bucket/key"""
+    return f"{SCHEME}{config.bucket}/{key}"
+
+
+async def presign_url(value: str) -> str:
+    """
+    将 s3://bucket/key 转换为预签名地址
+
+    存储空间未登记时返回空字符串；未开启预签名时返回公开地址
+    """
+    bucket, _, key = value[len(SCHEME) :].partition("/")
+    config = _buckets.get(bucket)
+    if config is None and not _uploads_registered:
+        await register_uploads()
+        config = _buckets.get(bucket)
+    if config is None or not key:
+        return ""
+    if not config.presign_expires:
+        return public_url(config, key)
+
+    client = await get_client(config)
+    return await client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket, "Key": key},
+        ExpiresIn=config.presign_expires,
+    )
+
+
+class MultipartWriter:
+    """
+    分片上传
+
+    写入的数据按分片大小切分后并发上传，内存占用约为 分片大小 × 并发数；
+    总大小不足一个分片时使用单次 PutObject
+    """
+
+    def __init__(self, client: Any, config: ObjectConfig, key: str, content_type: str):
+        self.client = client
+        self.bucket = config.bucket
+        self.key = key
+        self.content_type = content_type
+        self.part_size = max(config.part_size, MIN_PART_SIZE)
+        self.semaphore = asyncio.Semaphore(config.max_concurrency)
+        self.extra: Dict[str, Any] = {}
+        if isinstance(config, OSSConfig) and config.acl not in ("", "default"):
+            self.extra["ACL"] = config.acl
+
+        self.buffer = bytearray()
+        self.upload_id: Optional[str] = None
+        self.tasks: List[asyncio.Task] = []
+
+    async def write(self, chunk: bytes) -> None:
+        """写入数据，凑满一个分片后提交上传"""
+        self.buffer.extend(chunk)
+        while len(self.buffer) >= self.part_size:
+            part = bytes(self.buffer[: self.part_size])
+            del self.buffer[: self.part_size]
+            await self.submit(part)
+
+    async def submit(self, part: bytes) -> None:
+        if self.upload_id is None:
+            response = await self.client.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType=self.content_type,
+                **self.extra,
+            )
+            self.upload_id = response["UploadId"]
+
+        # 等待空闲的并发名额，避免读取速度超过上传速度时堆积分片
+        await self.semaphore.acquire()
+        number = len(self.tasks) + 1
+        self.tasks.append(asyncio.create_task(self.upload_part(number, part)))
+
+    async def upload_part(self, number: int, part: bytes) -> Dict[str, Any]:
+        try:
+            response = await self.client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                PartNumber=number,
+                Body=part,
+            )
+            return {"PartNumber": number, "ETag": response["ETag"]}
+        finally:
+            self.semaphore.release()
+
+    async def finish(self) -> None:
+        """提交剩余数据并完成上传"""
+        if self.upload_id is None:
+            await self.client.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=bytes(self.buffer),
+                ContentType=self.content_type,
+                **self.extra,
+            )
+            return
+
+        if self.buffer:
+            await self.submit(bytes(self.buffer))
+            self.buffer = bytearray()
+
+        parts = await asyncio.gather(*self.tasks)
+        await self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": list(parts)},
+        )
+
+    async def abort(self) -> None:
+        """取消上传，清理已上传的分片"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.upload_id is not None:
+            await self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from . import cache
+from .models.permission import Permission
+from .models.role_menu import RoleMenu
+from .models.role_permission import RolePermission
+
+logger = logging.getLogger(__name__)
+
+# 两级缓存模式下，修改权限后删除该键，其他进程收到失效通知后重新加载
+CHANGED_KEY = "permission_index:changed"
+
+# 权限方法为 Any 时展开的 HTTP 方法
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS")
+
+# 权限ID -> 展开后的 (path, method) 集合
+_permissions: Dict[int, FrozenSet[Tuple[str, str]]] = {}
+
+# 角色ID -> 可访问的 (path, method) 集合
+_roles: Dict[int, FrozenSet[Tuple[str, str]]] = {}
+
+# 索引有效期（秒），其他 worker 修改权限时本进程不会收到通知，过期后重新加载；0 表示不过期
+TTL: float = 60
+
+# 加载时间，为 None 表示需要重新加载
+_loaded_at: Optional[float] = None
+
+# 失效版本号，加载期间发生变更时不标记为已加载
+_version = 0
+
+# 重建锁
+_lock = asyncio.Lock()
+
+
+def init(ttl: float = 60) -> None:
+    """设置索引有效期"""
+    global TTL
+    TTL = ttl
+
+
+def invalidate() -> None:
+    """标记索引失效，下次鉴权时重新加载"""
+    global _loaded_at, _version
+    _loaded_at = None
+    _version += 1
+
+
+def _expired() -> bool:
+    if _loaded_at is None:
+        return True
+    return bool(TTL) and time.monotonic() - _loaded_at > TTL
+
+
+def expand(path: str, method: str) -> FrozenSet[Tuple[str, str]]:
+    """将权限展开为 (path, method) 集合，Any 展开为全部方法"""
+    method = (method or "").upper()
+    if method == "ANY":
+        return frozenset((path, m) for m in HTTP_METHODS)
+    return frozenset({(path, method)})
+
+
+async def _load_permissions() -> None:
+    """加载后台权限定义"""
+    global _permissions
+    rows = await Permission.filter(guard_name="admin").values_list(
+        "id", "path", "method"
+    )
+    _permissions = {id: expand(path, method) for id, path, method in rows}
+
+
+def _compile(pairs: Iterable[Tuple[int, int]]) -> Dict[int, FrozenSet]:
+    """将 (role_id, permission_id) 编译为角色权限集合"""
+    compiled: Dict[int, Set[Tuple[str, str]]] = {}
+    for role_id, permission_id in pairs:
+        items = compiled.setdefault(role_id, set())
+        items.update(_permissions.get(permission_id, ()))
+    return {role_id: frozenset(items) for role_id, items in compiled.items()}
+
+
+async def load() -> None:
+    """全量构建权限索引"""
+    global _roles, _loaded_at
+    async with _lock:
+        if not _expired():
+            return
+
+        version = _version
+        loaded_at = time.monotonic()
+        await _load_permissions()
+        pairs = await RolePermission.all().values_list("role_id", "permission_id")
+        _roles = _compile(pairs)
+        if version == _version:
+            _loaded_at = loaded_at
+
+
+async def publish() -> None:
+    """
+    通知其他进程权限已修改
+
+    仅两级缓存模式（CACHE_DRIVER=redis 且 CACHE_LOCAL_SIZE > 0）会发送通知，
+    其他模式下其他进程在索引过期后重新加载
+    """
+    try:
+        await cache.delete(CHANGED_KEY)
+    except Exception as e:
+        logger.warning("permission index publish failed: %s", e)
+
+
+async def changed() -> None:
+    """权限定义已修改：重建本进程索引并通知其他进程"""
+    invalidate()
+    await load()
+    await publish()
+
+
+async def reload_roles(role_ids: List[int]) -> None:
+    """增量重建指定角色的权限集合，并通知其他进程"""
+    if _expired():
+        await load()
+    else:
+        async with _lock:
+            pairs = await RolePermission.filter(role_id__in=role_ids).values_list(
+                "role_id", "permission_id"
+            )
+            compiled = _compile(pairs)
+            for role_id in role_ids:
+                _roles[role_id] = compiled.get(role_id, frozenset())
+    await publish()
+
+
+async def reload_menu(menu_id: int) -> None:
+    """菜单权限变更后，重建关联该菜单的角色"""
+    role_ids = await RoleMenu.filter(menu_id=menu_id).values_list(
+        "role_id", flat=True
+    )
+    if role_ids:
+        await reload_roles(list(set(role_ids)))
+
+
+async def has_permission(role_ids: List[int], path: str, method: str) -> bool:
+    """判断角色是否拥有指定路径和方法的权限"""
+    if _expired():
+        await load()
+
+    key = (path, method.upper())
+    return any(key in _roles.get(role_id, ()) for role_id in role_ids)
+
+
+def stats() -> Dict[str, int]:
+    """索引统计"""
+    return {
+        "permissions": len(_permissions),
+        "roles": len(_roles),
+        "entries": sum(len(items) for items in _roles.values()),
+    }
+
+
+def _on_invalidate(names: List[str]) -> None:
+    if CHANGED_KEY in names:
+        invalidate()
+
+
+cache.on_invalidate(_on_invalidate)
@@ -12,7 +12,22 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from tortoise import Tortoise
 
-from . import cache, config, db
+from . import (
+    action_logger,
+    cache,
+    captcha_pool,
+    config,
+    config_cache,
+    db,
+    department_index,
+    executor,
+    loader,
+    object_storage,
+    permission_index,
+    schema_cache,
+    system_monitor,
+    token_cache,
+)
 from .install import setup_all
 from .middleware import Middleware
 from .routes import auth, dashboard, resource, upload
@@ -26,13 +41,40 @@ class Quark(FastAPI):
         "APP_VERSION": "0.2.3",
         "APP_SECRET_KEY": "your-secret-key",
         "CACHE_PREFIX": "quark-cache",
+        "CACHE_DRIVER": "memory",
+        "CACHE_URL": None,
+        "CACHE_POOL_SIZE": 10,
+        "CACHE_LOCAL_SIZE": 0,
+        "CACHE_LOCAL_TTL": 5,
         "MODULE_PATH": "",
+        "MODULE_DISCOVERY": True,
+        "MODULE_PRESCAN": True,
         "LOCALE": "zh-hans",
         "DB_CONFIG": None,
         "DB_URL": None,
         "DB_MODULES": {
             "models": [],
         },
+        "ACTION_LOG_QUEUE_SIZE": 10000,
+        "ACTION_LOG_BATCH_SIZE": 200,
+        "ACTION_LOG_FLUSH_INTERVAL": 1.0,
+        "ACTION_LOG_OVERFLOW": "drop_new",
+        "ACTION_LOG_BLOCK_TIMEOUT": 0.5,
+        "DEPARTMENT_INDEX_TTL": 300,
+        "PERMISSION_INDEX_TTL": 60,
+        "CONFIG_SYNC_INTERVAL": 1.0,
+        "CONFIG_CACHE_TTL": 60,
+        "EXECUTOR_THREADS": 8,
+        "EXECUTOR_PROCESSES": 0,
+        "EXECUTOR_MAX_PENDING": 256,
+        "CAPTCHA_POOL_SIZE": 200,
+        "CAPTCHA_POOL_WATERMARK": 50,
+        "TOKEN_CACHE_SIZE": 10000,
+        "TOKEN_CACHE_TTL": 300,
+        "USER_CACHE_TTL": 60,
+        "SYSTEM_SAMPLE_INTERVAL": 5.0,
+        "SCHEMA_CACHE_SIZE": 1000,
+        "SCHEMA_CACHE_TTL": 300,
     }
 
     def __init__(self, *args, **kwargs):
@@ -54,7 +96,17 @@ class Quark(FastAPI):
 
     def init_cache(self) -> None:
         """初始化缓存"""
-        cache.init(self.config["CACHE_PREFIX"])
+        cache.init(
+            prefix=self.config["CACHE_PREFIX"],
+            driver=self.config["CACHE_DRIVER"],
+            url=self.config["CACHE_URL"],
+            pool_size=self.config["CACHE_POOL_SIZE"],
+            local_size=self.config["CACHE_LOCAL_SIZE"],
+            local_ttl=self.config["CACHE_LOCAL_TTL"],
+        )
+
+        # 两级缓存订阅其他进程的失效通知
+        cache.start()
 
     # 初始化数据库
     async def init_db(self) -> None:
@@ -69,6 +121,16 @@ class Quark(FastAPI):
             modules=self.config["DB_MODULES"],
         )
 
+    def init_action_logger(self) -> None:
+        """初始化操作日志写入器"""
+        action_logger.init(
+            queue_size=self.config["ACTION_LOG_QUEUE_SIZE"],
+            batch_size=self.config["ACTION_LOG_BATCH_SIZE"],
+            flush_interval=self.config["ACTION_LOG_FLUSH_INTERVAL"],
+            overflow=self.config["ACTION_LOG_OVERFLOW"],
+            block_timeout=self.config["ACTION_LOG_BLOCK_TIMEOUT"],
+        )
+
     def init_locale(self) -> None:
         """初始化 locale"""
         locales_path = os.path.abspath(os.path.join(self.current_dir_path, "locales"))
@@ -86,6 +148,11 @@ class Quark(FastAPI):
         self.include_router(resource.router)
         self.include_router(upload.router)
 
+    def register_resources(self) -> None:
+        """构建资源注册表"""
+        loader.build_registry()
+        loader.log_import_report()
+
     def register_middleware(self) -> None:
         """注册中间件"""
         self.add_middleware(Middleware)
@@ -140,6 +207,9 @@ class Quark(FastAPI):
         # 注册路由
         self.register_routers()
 
+        # 构建资源注册表
+        self.register_resources()
+
         # 设置静态资源
         self.load_static()
 
@@ -149,8 +219,78 @@ class Quark(FastAPI):
         # 安装应用
         await setup_all()
 
+        # 构建权限索引
+        permission_index.init(ttl=self.config["PERMISSION_INDEX_TTL"])
+        await permission_index.load()
+
+        # 加载网站配置缓存
+        config_cache.init(
+            sync_interval=self.config["CONFIG_SYNC_INTERVAL"],
+            ttl=self.config["CONFIG_CACHE_TTL"],
+        )
+        await config_cache.load()
+
+        # 登记上传资源的对象存储空间，用于解析已保存的 s3:// 地址
+        await object_storage.register_uploads()
+
+        # 启动操作日志写入器
+        self.init_action_logger()
+
+        # 设置部门索引有效期
+        department_index.init(ttl=self.config["DEPARTMENT_INDEX_TTL"])
+
+        # 设置令牌及用户快照缓存
+        token_cache.init(
+            size=self.config["TOKEN_CACHE_SIZE"],
+            ttl=self.config["TOKEN_CACHE_TTL"],
+            user_ttl=self.config["USER_CACHE_TTL"],
+        )
+
+        # 设置密码哈希、图片处理等阻塞任务的执行池
+        executor.init(
+            threads=self.config["EXECUTOR_THREADS"],
+            processes=self.config["EXECUTOR_PROCESSES"],
+            max_pending=self.config["EXECUTOR_MAX_PENDING"],
+        )
+
+        # 后台预渲染验证码
+        captcha_pool.init(
+            size=self.config["CAPTCHA_POOL_SIZE"],
+            watermark=self.config["CAPTCHA_POOL_WATERMARK"],
+        )
+        captcha_pool.start()
+
+        # 设置页面结构缓存
+        schema_cache.init(
+            size=self.config["SCHEMA_CACHE_SIZE"],
+            ttl=self.config["SCHEMA_CACHE_TTL"],
+        )
+
+        # 后台采样系统 CPU 及内存使用率，供仪表盘读取
+        system_monitor.init(interval=self.config["SYSTEM_SAMPLE_INTERVAL"])
+        system_monitor.start()
+
     async def shutdown(self) -> Any:
         """关闭服务"""
+
+        # 写入剩余的操作日志
+        await action_logger.close()
+
+        # 关闭对象存储客户端
+        await object_storage.close()
+
+        # 停止验证码预渲染
+        await captcha_pool.close()
+
+        # 停止系统采样
+        await system_monitor.close()
+
+        # 关闭缓存连接
+        await cache.close()
+
+        # 关闭执行池
+        executor.shutdown()
+
         await Tortoise.close_connections()
 
     def run(
@@ -0,0 +1,132 @@
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from .message import Message
+
+
+def _encode(value: Any) -> bytes:
+    """通用编码，与 JSONResponse(jsonable_encoder(..., exclude_none=True)) 输出一致"""
+    return json.dumps(
+        jsonable_encoder(value, exclude_none=True),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _strip(value: Any) -> Any:
+    """
+    移除字典中值为 None 的键，以及 jsonable_encoder 默认跳过的 _sa 开头的键
+
+    表单初始值可能直接取自模型的 __dict__，Tortoise 内部状态 _saved_in_db 恰好以 _sa 开头
+    """
+    if isinstance(value, dict):
+        return {
+            k: _strip(v)
+            for k, v in value.items()
+            if v is not None and not (isinstance(k, str) and k.startswith("_sa"))
+        }
+    if isinstance(value, list):
+        return [_strip(v) for v in value]
+    return value
+
+
+def _encode_model(model: BaseModel) -> bytes:
+    """
+    组件树由 pydantic-core 直接序列化为 JSON
+
+    组件内嵌字典（如表格数据、表单初始值）中的 None 及 _sa 开头的键原先会被
+    jsonable_encoder 移除，出现 null 或 "_sa 时改为导出字典后移除再编码，保持输出一致
+    """
+    raw = model.model_dump_json(by_alias=True, exclude_none=True)
+    if ":null" not in raw and '"_sa' not in raw:
+        return raw.encode("utf-8")
+    return json.dumps(
+        _strip(model.model_dump(mode="json", by_alias=True, exclude_none=True)),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def dumps(content: Any) -> bytes:
+    """将组件树、消息及其数据编码为 JSON"""
+    if isinstance(content, BaseModel):
+        return _encode_model(content)
+
+    if isinstance(content, Message):
+        # 与原 jsonable_encoder(vars(message)) 结构一致：值为 None 的字段不输出
+        parts = [
+            b'{"code":',
+            _encode(content.code),
+            b',"msg":',
+            _encode(content.msg),
+        ]
+        if content.data is not None:
+            parts += [b',"data":', dumps(content.data)]
+        if content.url is not None:
+            parts += [b',"url":', _encode(content.url)]
+        parts.append(b"}")
+        return b"".join(parts)
+
+    if isinstance(content, (list, tuple)):
+        return b"[" + b",".join(dumps(item) for item in content) + b"]"
+
+    if isinstance(content, dict) and all(isinstance(k, str) for k in content):
+        # jsonable_encoder 默认跳过 _sa 开头的键（SQLAlchemy 内部状态）
+        items = [
+            _encode(k) + b":" + dumps(v)
+            for k, v in content.items()
+            if v is not None and not k.startswith("_sa")
+        ]
+        return b"{" + b",".join(items) + b"}"
+
+    return _encode(content)
+
+
+class ComponentResponse(Response):
+    """
+    组件响应
+
+    组件树不经过 jsonable_encoder 的逐层遍历，直接由 pydantic-core 编码为 JSON
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """If-None-Match 弱比较"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(
+        item.strip().removeprefix("W/") == tag for item in if_none_match.split(",")
+    )
+
+
+def etag_response(request: Request, content: Any) -> Response:
+    """
+    带 ETag 的组件响应
+
+    页面结构未变化时，请求头 If-None-Match 与内容摘要一致则返回 304，前端无需重新下载
+    """
+    body = dumps(content)
+    etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(etag, request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+    return ComponentResponse(body, headers=headers)
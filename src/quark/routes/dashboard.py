@@ -1,4 +1,4 @@
-from quark import APIRouter, JSONResponse, Request, jsonable_encoder
+from quark import APIRouter, ComponentResponse, Request
 
 from .. import loader
 
@@ -8,6 +8,4 @@ router = APIRouter(prefix="/api/admin", tags=["仪表盘"])
 @router.get("/dashboard/{resource}/index")
 async def index(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Dashboard")
-    return JSONResponse(
-        content=jsonable_encoder(await res.render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.render(request))
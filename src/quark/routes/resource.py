@@ -1,148 +1,121 @@
-from quark import APIRouter, JSONResponse, Request, jsonable_encoder
+from quark import APIRouter, ComponentResponse, Request, Response
 
 from .. import loader
+from ..response import etag_response
 
 router = APIRouter(prefix="/api/admin", tags=["后台增、删、改、查"])
 
 
-# 列表
+# 列表，页面结构缓存后内容稳定，支持 ETag 协商
 @router.get("/{resource}/index")
 async def index(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.index_render(request), exclude_none=True)
-    )
+    return etag_response(request, await res.index_render(request))
+
+
+# 列表数据，表格轮询及翻页时仅获取数据，内容未变化时返回 304
+@router.get("/{resource}/index/data")
+async def index_data(request: Request, resource: str):
+    res = await loader.load_resource_object(request, resource, "Resource")
+    return etag_response(request, await res.index_data_render(request))
 
 
 # 表格行内编辑
 @router.get("/{resource}/editable")
 async def editable(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.editable_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.editable_render(request))
 
 
 # 执行行为
 @router.get("/{resource}/action/{uriKey}")
 async def action_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.action_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.action_render(request))
 
 
 # 行为表单值
 @router.get("/{resource}/action/{uriKey}/values")
 async def action_values_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(
-            await res.action_values_render(request), exclude_none=True
-        )
-    )
+    return ComponentResponse(await res.action_values_render(request))
 
 
 # 创建页面
 @router.get("/{resource}/create")
 async def creation_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.creation_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.creation_render(request))
 
 
 # 创建方法
 @router.post("/{resource}/store")
 async def store_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.store_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.store_render(request))
 
 
 # 编辑页面
 @router.get("/{resource}/edit")
 async def edit_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.edit_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.edit_render(request))
 
 
 # 获取编辑表单值
 @router.get("/{resource}/edit/values")
 async def edit_values_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(
-            await res.edit_values_render(request), exclude_none=True
-        )
-    )
+    return ComponentResponse(await res.edit_values_render(request))
 
 
 # 保存编辑值
 @router.post("/{resource}/save")
 async def save_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.save_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.save_render(request))
 
 
 # 导入数据
 @router.post("/{resource}/import")
 async def import_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.import_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.import_render(request))
 
 
 # 导出数据
 @router.get("/{resource}/export")
 async def export_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.export_render(request), exclude_none=True)
-    )
+    result = await res.export_render(request)
+    if isinstance(result, Response):
+        return result
+    return ComponentResponse(result)
 
 
 # 详情页
 @router.get("/{resource}/detail")
 async def detail_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.detail_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.detail_render(request))
 
 
 # 获取详情页值
 @router.get("/{resource}/detail/values")
 async def detail_values_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(
-            await res.detail_values_render(request), exclude_none=True
-        )
-    )
+    return ComponentResponse(await res.detail_values_render(request))
 
 
 # 导入模板
 @router.get("/{resource}/import/template")
 async def import_template_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(
-            await res.import_template_render(request), exclude_none=True
-        )
-    )
+    return ComponentResponse(await res.import_template_render(request))
 
 
 # 表单页
 @router.get("/{resource}/form")
 async def form_render(request: Request, resource: str):
     res = await loader.load_resource_object(request, resource, "Resource")
-    return JSONResponse(
-        content=jsonable_encoder(await res.form_render(request), exclude_none=True)
-    )
+    return ComponentResponse(await res.form_render(request))
@@ -0,0 +1,137 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import i18n
+from fastapi import HTTPException, Request
+
+from . import cache
+from .services.auth import AuthService
+
+logger = logging.getLogger(__name__)
+
+# 两级缓存模式下，数据修改后删除该键，其他进程收到失效通知后清空页面结构缓存
+CHANGED_KEY = "schema_cache:changed"
+
+# 缓存的页面结构数量上限
+SIZE: int = 1000
+
+# 页面结构有效期（秒），字段选项等来自数据库的内容在管理后台以外修改、
+# 或未启用两级缓存时其他进程修改，过期后重新构建
+TTL: float = 300
+
+# (资源类, 页面, 请求路径, 角色ID, 语言) -> (页面结构, 过期时间)
+_schemas: "OrderedDict[Tuple, Tuple[Any, float]]" = OrderedDict()
+
+# 失效版本号，构建期间发生写入时不缓存构建结果
+_version = 0
+
+# 统计
+_hits = 0
+_misses = 0
+
+
+def init(size: int = 1000, ttl: float = 300) -> None:
+    """设置缓存上限及有效期"""
+    global SIZE, TTL
+    SIZE = size
+    TTL = ttl
+    invalidate()
+
+
+def invalidate() -> None:
+    """
+    清空页面结构缓存
+
+    资源的新增、保存、行内编辑、行为及导入执行后经 changed() 调用，
+    字段选项可能来自其他资源的数据，因此清空全部资源的缓存
+    """
+    global _version
+    _schemas.clear()
+    _version += 1
+
+
+async def publish() -> None:
+    """
+    通知其他进程清空页面结构缓存
+
+    仅两级缓存模式（CACHE_DRIVER=redis 且 CACHE_LOCAL_SIZE > 0）会发送通知，
+    其他模式下其他进程在页面结构过期后重新构建
+    """
+    try:
+        await cache.delete(CHANGED_KEY)
+    except Exception as e:
+        logger.warning("schema cache publish failed: %s", e)
+
+
+async def changed() -> None:
+    """资源数据已修改：清空本进程的页面结构缓存并通知其他进程"""
+    invalidate()
+    await publish()
+
+
+async def schema_key(resource: Any, request: Request, page: str) -> Optional[Tuple]:
+    """页面结构缓存键，无法获取当前管理员角色时返回 None，不缓存"""
+    try:
+        role_ids = await AuthService(request).get_current_role_ids()
+    except HTTPException:
+        return None
+    return (
+        type(resource),
+        page,
+        request.url.path,
+        tuple(sorted(role_ids)),
+        i18n.get("locale"),
+    )
+
+
+async def remember(
+    resource: Any,
+    request: Request,
+    page: str,
+    build: Callable[[Request], Awaitable[Any]],
+) -> Any:
+    """
+    读取或构建页面结构
+
+    资源开启 cache_schema 时按资源、页面、请求路径、角色及语言缓存，
+    缓存的页面结构在请求间共享，调用方填充数据前须先复制
+    """
+    global _hits, _misses
+    if not getattr(resource, "cache_schema", False) or not TTL or SIZE <= 0:
+        return await build(request)
+
+    key = await schema_key(resource, request, page)
+    if key is None:
+        return await build(request)
+
+    item = _schemas.get(key)
+    if item is not None:
+        if time.monotonic() < item[1]:
+            _schemas.move_to_end(key)
+            _hits += 1
+            return item[0]
+        del _schemas[key]
+
+    _misses += 1
+    version = _version
+    schema = await build(request)
+    if version == _version:
+        _schemas[key] = (schema, time.monotonic() + TTL)
+        while len(_schemas) > SIZE:
+            _schemas.popitem(last=False)
+    return schema
+
+
+def stats() -> Dict[str, int]:
+    """缓存统计"""
+    return {"schemas": len(_schemas), "hits": _hits, "misses": _misses}
+
+
+def _on_invalidate(names: List[str]) -> None:
+    if CHANGED_KEY in names:
+        invalidate()
+
+
+cache.on_invalidate(_on_invalidate)
@@ -30,6 +30,10 @@ class OSSConfig(BaseModel):
     is_https: bool = True
     path_prefix: Optional[str] = None
     acl: str = "default"
+    region: Optional[str] = None
+    presign_expires: int = 0
+    part_size: int = 8 * 1024 * 1024
+    max_concurrency: int = 4
 
 
 class MinioConfig(BaseModel):
@@ -45,6 +49,9 @@ class MinioConfig(BaseModel):
     region: Optional[str] = None
     domain: Optional[str] = None
     path_prefix: Optional[str] = None
+    presign_expires: int = 0
+    part_size: int = 8 * 1024 * 1024
+    max_concurrency: int = 4
 
 
 class FileInfo(BaseModel):
@@ -59,6 +66,7 @@ class FileInfo(BaseModel):
     mime_type: str
     url: str
     hash: str
+    sha256: Optional[str] = None
     extra: Optional[Dict[str, Any]] = None
 
 
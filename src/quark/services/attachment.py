@@ -1,11 +1,95 @@
 import json
+import time
+from collections import OrderedDict
 from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import openpyxl
+from tortoise.signals import post_delete, post_save
 
+from .. import object_storage
 from ..models.attachment import Attachment
 from ..services.config import ConfigService
 
+# 附件缓存上限
+ATTACHMENT_CACHE_SIZE = 10000
+
+# 附件缓存有效期（秒），其他进程删除或替换附件时不会收到通知，过期后重新查询
+ATTACHMENT_CACHE_TTL = 60
+
+# 附件ID -> ((url, path), 过期时间)，附件不存在或已禁用时为 (None, 过期时间)
+_attachments: "OrderedDict[int, Tuple[Optional[Tuple[str, str]], float]]" = (
+    OrderedDict()
+)
+
+
+def attachment_ids(value: Any) -> List[int]:
+    """解析值中引用的附件ID：整数、数字字符串或含 id 的 JSON 对象/数组"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value[:1] in ("[", "{"):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return []
+    if isinstance(value, dict):
+        value = value.get("id")
+    if isinstance(value, list):
+        return [id for item in value for id in attachment_ids(item)]
+    if isinstance(value, bool):
+        return []
+    if isinstance(value, int):
+        return [value]
+    if isinstance(value, str) and value.isdigit():
+        return [int(value)]
+    return []
+
+
+def attachment_id(value: Any) -> Optional[int]:
+    """解析值中引用的第一个附件ID"""
+    ids = attachment_ids(value)
+    return ids[0] if ids else None
+
+
+def forget(ids: Optional[Iterable[int]] = None) -> None:
+    """移除附件缓存，ids 为 None 时移除全部"""
+    if ids is None:
+        _attachments.clear()
+        return
+    for id in ids:
+        _attachments.pop(id, None)
+
+
+async def load_attachments(
+    ids: Iterable[int],
+) -> Dict[int, Optional[Tuple[str, str]]]:
+    """批量读取附件，未缓存的附件通过一次 id__in 查询加载"""
+    result: Dict[int, Optional[Tuple[str, str]]] = {}
+    missing = []
+    now = time.monotonic()
+    for id in dict.fromkeys(ids):
+        item = _attachments.get(id)
+        if item is not None and now < item[1]:
+            _attachments.move_to_end(id)
+            result[id] = item[0]
+        else:
+            missing.append(id)
+
+    if missing:
+        rows = await Attachment.filter(id__in=missing, status=1).values_list(
+            "id", "url", "path"
+        )
+        found = {id: (url, path) for id, url, path in rows}
+        expires_at = time.monotonic() + ATTACHMENT_CACHE_TTL
+        for id in missing:
+            result[id] = found.get(id)
+            _attachments[id] = (result[id], expires_at)
+            _attachments.move_to_end(id)
+        while len(_attachments) > ATTACHMENT_CACHE_SIZE:
+            _attachments.popitem(last=False)
+
+    return result
+
 
 class AttachmentService:
     def __init__(self):
@@ -27,6 +111,10 @@ class AttachmentService:
         attachments = await query.order_by("-id").offset((page - 1) * 8).limit(8)
 
         for attachment in attachments:
+            # 预签名地址的查询参数参与签名，不能追加时间戳
+            if attachment.url.startswith(object_storage.SCHEME):
+                attachment.url = await self.get_url(attachment.url)
+                continue
             attachment.url = (
                 await self.get_url(attachment.url)
                 + f"?timestamp={int(datetime.now().timestamp())}"
@@ -39,6 +127,7 @@ class AttachmentService:
         return attachment.id
 
     async def delete_by_id(self, attachment_id):
+        forget(attachment_ids(attachment_id))
         return await Attachment.filter(id=attachment_id).delete()
 
     async def get_info_by_id(self, attachment_id):
@@ -46,11 +135,52 @@ class AttachmentService:
         return attachment
 
     async def update_by_id(self, attachment_id, data: Attachment):
+        forget(attachment_ids(attachment_id))
         return await Attachment.filter(status=1, id=attachment_id).update(**data)
 
     async def get_info_by_hash(self, hash_value):
         return await Attachment.filter(status=1, hash=hash_value).first()
 
+    async def site_url(self) -> str:
+        """网站地址，未设置域名时为空"""
+        web_site_domain = await self.config_service.get_value("WEB_SITE_DOMAIN")
+        if not web_site_domain:
+            return ""
+        http = (
+            "https://"
+            if await self.config_service.get_value("SSL_OPEN") == "1"
+            else "http://"
+        )
+        return http + web_site_domain
+
+    async def resolve_url(self, site_url: str, path: str) -> str:
+        """访问地址，对象存储引用转换为预签名地址"""
+        if path.startswith(object_storage.SCHEME):
+            return await object_storage.presign_url(path)
+        return self.join_url(site_url, path)
+
+    def join_url(self, site_url: str, path: str) -> str:
+        """拼接访问地址"""
+        if "://" in path:
+            return path
+        if "./" in path:
+            path = path.replace("./web/app/", "/", 1)
+        return site_url + path if path else ""
+
+    async def prefetch(self, values: Iterable[Any]) -> None:
+        """
+        预加载一批值中引用的附件，之后的地址解析直接读取缓存
+
+        路径及 JSON 值自带访问地址，不需要查询附件
+        """
+        ids = []
+        for value in values:
+            if isinstance(value, str) and ("/" in value or "{" in value):
+                continue
+            ids.extend(attachment_ids(value))
+        if ids:
+            await load_attachments(ids)
+
     async def get_url(self, *params):
         id = None
         attachment_type = None
@@ -64,52 +194,37 @@ class AttachmentService:
         if id is None or id == "":
             return ""
 
-        http = ""
-        path = ""
-        web_site_domain = await self.config_service.get_value("WEB_SITE_DOMAIN")
-        if web_site_domain is not None and web_site_domain != "":
-            http = (
-                "https://"
-                if await self.config_service.get_value("SSL_OPEN") == "1"
-                else "http://"
-            )
-
+        site_url = await self.site_url()
         if isinstance(id, str):
+            if id.startswith(object_storage.SCHEME):
+                return await object_storage.presign_url(id)
             if "://" in id and "{" not in id:
                 return id
             if "./" in id and "{" not in id:
-                return http + web_site_domain + id.replace("./web/app/", "/", 1)
+                return site_url + id.replace("./web/app/", "/", 1)
             if "/" in id and "{" not in id:
-                return http + web_site_domain + id
+                return site_url + id
             if "{" in id:
+                path = ""
                 try:
                     json_data = json.loads(id)
                     if isinstance(json_data, dict):
                         path = json_data.get("url", "")
                     elif isinstance(json_data, list):
                         path = json_data[0].get("url", "")
-                except json.JSONDecodeError:
+                except (json.JSONDecodeError, IndexError, AttributeError):
                     pass
+                if path:
+                    return await self.resolve_url(site_url, path)
 
-            if "://" in path:
-                return path
-            if "./" in path:
-                path = path.replace("./web/app/", "/", 1)
-            if path:
-                return http + web_site_domain + path
-
-        attachment = await Attachment.filter(id=id, status=1).first()
-        if attachment and attachment.id != 0:
-            path = attachment.url
-            if "://" in path:
-                return path
-            if "./" in path:
-                path = path.replace("./web/app/", "/", 1)
-            if path:
-                return http + web_site_domain + path
+        pk = attachment_id(id)
+        if pk is not None:
+            attachment = (await load_attachments([pk]))[pk]
+            if attachment and attachment[0]:
+                return await self.resolve_url(site_url, attachment[0])
 
         if attachment_type == "IMAGE":
-            return http + web_site_domain + "/admin/default.png"
+            return site_url + "/admin/default.png"
         return ""
 
     async def get_file_url(self, id):
@@ -120,35 +235,33 @@ class AttachmentService:
 
     async def get_urls(self, id):
         paths = []
-        http = (
-            "https://"
-            if await self.config_service.get_value("SSL_OPEN") == "1"
-            else "http://"
-        )
-        web_site_domain = await self.config_service.get_value("WEB_SITE_DOMAIN")
+        site_url = await self.site_url()
 
         if isinstance(id, str):
             if "{" in id:
                 try:
                     json_data = json.loads(id)
                     if isinstance(json_data, list):
-                        for v in json_data:
+                        # 未记录 url 的项按附件ID批量解析
+                        ids = [
+                            None if v.get("url") else attachment_id(v)
+                            for v in json_data
+                        ]
+                        attachments = await load_attachments(
+                            id for id in ids if id is not None
+                        )
+                        for v, pk in zip(json_data, ids):
                             path = v.get("url", "")
-                            if "://" in path:
-                                paths.append(path)
-                            else:
-                                if "./" in path:
-                                    path = path.replace("./web/app/", "/", 1)
-                                if path:
-                                    path = http + web_site_domain + path
-                                paths.append(path)
+                            attachment = attachments.get(pk)
+                            if attachment:
+                                path = attachment[0]
+                            paths.append(await self.resolve_url(site_url, path))
                 except json.JSONDecodeError:
                     pass
 
         return paths
 
     async def get_path(self, id):
-        path = ""
         if isinstance(id, str):
             if "://" in id and "{" not in id:
                 return id
@@ -156,18 +269,12 @@ class AttachmentService:
                 return id
             if "/" in id and "{" not in id:
                 return id
-            if "{" in id:
-                try:
-                    json_data = json.loads(id)
-                    if isinstance(json_data, dict):
-                        id = json_data.get("id", "")
-                    elif isinstance(json_data, list):
-                        id = json_data[0].get("id", "")
-                except json.JSONDecodeError:
-                    pass
 
-        attachment = await Attachment.filter(id=id, status=1).first()
-        return attachment.path if attachment else ""
+        pk = attachment_id(id)
+        if pk is None:
+            return ""
+        attachment = (await load_attachments([pk]))[pk]
+        return attachment[1] if attachment else ""
 
     async def get_file_path(self, id):
         return await self.get_path(id)
@@ -182,8 +289,13 @@ class AttachmentService:
                 try:
                     json_data = json.loads(id)
                     if isinstance(json_data, list):
-                        for v in json_data:
-                            paths.append(await self.get_path(v["id"]))
+                        ids = [attachment_id(v["id"]) for v in json_data]
+                        attachments = await load_attachments(
+                            id for id in ids if id is not None
+                        )
+                        for id in ids:
+                            attachment = attachments.get(id)
+                            paths.append(attachment[1] if attachment else "")
                 except json.JSONDecodeError:
                     pass
         return paths
@@ -202,3 +314,13 @@ class AttachmentService:
 
     async def count_by_type(self, file_type):
         return await Attachment.filter(type=file_type).count()
+
+
+@post_save(Attachment)
+async def _on_save(sender, instance, created, using_db, update_fields) -> None:
+    forget([instance.id])
+
+
+@post_delete(Attachment)
+async def _on_delete(sender, instance, using_db) -> None:
+    forget([instance.id])
@@ -1,27 +1,66 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException, Request
 from jose import JWTError, jwt
 from tortoise.exceptions import DoesNotExist
 
-from quark.models.role_permission import RolePermission
 from quark.models.user_role import UserRole
 from quark.schemas import UserInfoResponse
 from quark.services.permission import PermissionService
 from quark.services.role import RoleService
 
-from .. import config
+from .. import config, executor, permission_index, token_cache
 from ..models.user import User
 from ..services.user import UserService
 from ..utils import verify_password
 
 
+class AuthContext:
+    """
+    请求级认证上下文
+
+    同一请求内只解析一次令牌、只查询一次用户和角色，
+    中间件、资源模板及上传模板通过 request.state 共享
+    """
+
+    def __init__(self):
+        # 已解析的令牌载荷
+        self.payload: Optional[Dict[str, Any]] = None
+
+        # 已加载的用户，按 guard_name 区分
+        self.users: Dict[str, User] = {}
+
+        # 已构建的管理员信息
+        self.admin_info: Optional[UserInfoResponse] = None
+
+        # 已加载的角色ID
+        self.role_ids: Optional[List[int]] = None
+
+        # 实际执行的数据库查询次数
+        self.lookups: int = 0
+
+        # 通过上下文复用而节省的数据库查询次数
+        self.saved: int = 0
+
+    def stats(self) -> Dict[str, int]:
+        """查询统计"""
+        return {"lookups": self.lookups, "saved": self.saved}
+
+
 class AuthService:
 
     def __init__(self, request: Request):
         self.request = request
 
+    def get_context(self) -> AuthContext:
+        """获取当前请求的认证上下文，不存在时创建"""
+        context = getattr(self.request.state, "auth_context", None)
+        if context is None:
+            context = AuthContext()
+            self.request.state.auth_context = context
+        return context
+
     def create_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
     ) -> str:
@@ -54,7 +93,10 @@ class AuthService:
         self, username: str, password: str, guard_name: str = "user"
     ) -> str:
         user = await UserService().get_info_by_username(username)
-        if not user or not verify_password(password, user.password):
+        # bcrypt 校验耗时较长，放入执行池避免阻塞事件循环
+        if not user or not await executor.run(
+            verify_password, password, user.password
+        ):
             raise HTTPException(status_code=401, detail="用户名或密码错误")
 
         # 更新最后登录
@@ -77,15 +119,32 @@ class AuthService:
         }
         return self.create_token(claims)
 
+    def decode_token(self) -> Dict[str, Any]:
+        """解析令牌，同一请求内只解析一次，跨请求复用已验证的载荷直至过期"""
+        context = self.get_context()
+        if context.payload is None:
+            token = self.get_token()
+            payload = token_cache.get_payload(token)
+            if payload is None:
+                payload = jwt.decode(token, config.get("APP_SECRET_KEY"))
+                token_cache.set_payload(token, payload)
+            context.payload = payload
+        return context.payload
+
     # 验证并返回当前用户
     async def get_current_user(self, guard_name: str = "user") -> User:
+        context = self.get_context()
+        if guard_name in context.users:
+            context.saved += 1
+            return context.users[guard_name]
+
         credentials_exception = HTTPException(
             status_code=401,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
         try:
-            payload = jwt.decode(self.get_token(), config.get("APP_SECRET_KEY"))
+            payload = self.decode_token()
             user_id: int = payload.get("id") or 0
             token_guard: str = payload.get("guard_name") or ""
             if user_id is None or token_guard != guard_name:
@@ -93,16 +152,30 @@ class AuthService:
         except JWTError:
             raise credentials_exception
 
-        try:
-            user = await User.get(id=user_id)
-        except DoesNotExist:
-            raise HTTPException(status_code=404, detail="User not found")
+        user = token_cache.get_user(user_id)
+        if user is None:
+            loaded_version = token_cache.version()
+            try:
+                context.lookups += 1
+                user = await User.get(id=user_id)
+            except DoesNotExist:
+                raise HTTPException(status_code=404, detail="User not found")
+            token_cache.set_user(user, loaded_version)
+        else:
+            context.saved += 1
 
         if user.status != 1:
             raise HTTPException(status_code=403, detail="User is disabled")
+
+        context.users[guard_name] = user
         return user
 
     async def get_current_admin(self) -> UserInfoResponse:
+        context = self.get_context()
+        if context.admin_info is not None:
+            context.saved += 1
+            return context.admin_info
+
         userInfo = await self.get_current_user("admin")
         getuser = UserInfoResponse(
             id=userInfo.id,
@@ -114,39 +187,28 @@ class AuthService:
             buttons=[],
             roles=["R_SUPER"],
         )
+        context.admin_info = getuser
         return getuser
 
-    async def check_permission(self, path: str, method: str) -> bool:
+    async def get_current_role_ids(self) -> List[int]:
+        """获取当前管理员的角色ID，同一请求内只查询一次"""
+        context = self.get_context()
+        if context.role_ids is not None:
+            context.saved += 1
+            return context.role_ids
+
         admin_info = await self.get_current_admin()
-        role_ids = await RoleService().get_role_ids_by_user_id(admin_info.id)
+        context.lookups += 1
+        context.role_ids = await RoleService().get_role_ids_by_user_id(admin_info.id)
+        return context.role_ids
+
+    async def check_permission(self, path: str, method: str) -> bool:
+        role_ids = await self.get_current_role_ids()
 
         if not role_ids:
             return False
 
-        placeholders = ",".join(str(role_id) for role_id in role_ids)
-        rows = await RolePermission.raw(
-            f"""
-            SELECT p.id, p.name, p.guard_name, p.path, p.method
-            FROM role_has_permissions rhp
-            JOIN permissions p ON rhp.permission_id = p.id
-            WHERE rhp.role_id IN ({placeholders}) AND p.guard_name = 'admin' AND p.path = '{path}' AND p.method = 'Any'
-            """
-        )
-        if rows:
-            return True
-
-        rows = await RolePermission.raw(
-            f"""
-            SELECT p.id, p.name, p.guard_name, p.path, p.method
-            FROM role_has_permissions rhp
-            JOIN permissions p ON rhp.permission_id = p.id
-            WHERE rhp.role_id IN ({placeholders}) AND p.guard_name = 'admin' AND p.path = '{path}' AND p.method = '{method}'
-            """
-        )
-
-        if rows:
-            return True
-        return False
+        return await permission_index.has_permission(role_ids, path, method)
 
     def get_real_ip(self, request: Request):
         forwarded_for = request.headers.get("X-Forwarded-For")
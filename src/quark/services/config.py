@@ -1,18 +1,23 @@
-import asyncio
 from typing import Dict
 
+from .. import config_cache
 from ..models.config import Config
 
 
 class ConfigService:
-    def __init__(self):
-        self.web_config: Dict[str, str] = {}
-        self._lock = asyncio.Lock()
+    """
+    网站配置
+
+    读取走进程级配置缓存，写入后使缓存失效并通知其他进程
+    """
+
+    @property
+    def web_config(self) -> Dict[str, str]:
+        return config_cache._values
 
     async def refresh(self):
-        configs = await Config.filter(status=1).all()
-        async with self._lock:
-            self.web_config = {config.name: config.value for config in configs}
+        await config_cache.changed()
+        await config_cache.load()
 
     async def set_value(self, key: str, value: str):
         config = await Config.get_or_none(name=key)
@@ -21,9 +26,9 @@ class ConfigService:
             await config.save()
         else:
             await Config.create(name=key, value=value, status=1)
-        await self.refresh()
+
+        # 模型信号已使缓存失效，这里直接重新加载
+        await config_cache.load()
 
     async def get_value(self, key: str) -> str:
-        if not self.web_config:
-            await self.refresh()
-        return self.web_config.get(key, "")
+        return await config_cache.get(key)
@@ -1,4 +1,5 @@
 from typing import List, Optional, Tuple
+from .. import department_index
 from ..models.department import Department
 from tortoise.expressions import Q
 
@@ -8,30 +9,20 @@ class DepartmentService:
         pass
 
     async def get_children_ids(self, pid: int) -> List[int]:
-        departments = await Department.filter(pid=pid, status=1).all()
-        if not departments:
-            return []
+        return await department_index.get_children_ids(pid)
 
-        ids = []
-        for department in departments:
-            children_ids = await self.get_children_ids(department.id)
-            if children_ids:
-                ids.extend(children_ids)
-            ids.append(department.id)
-        return ids
+    async def get_subtree_ids(self, ids: List[int]) -> List[int]:
+        """获取部门及其全部子部门ID"""
+        return await department_index.get_subtree_ids(ids)
 
     async def get_children_departments(self, pid: int) -> List[Department]:
-        departments = await Department.filter(pid=pid, status=1).all()
-        if not departments:
+        ids = await department_index.get_children_ids(pid)
+        if not ids:
             return []
 
-        children_departments = []
-        for department in departments:
-            children = await self.get_children_departments(department.id)
-            if children:
-                children_departments.extend(children)
-            children_departments.append(department)
-        return children_departments
+        departments = await Department.filter(id__in=ids, status=1).all()
+        positions = {id: index for index, id in enumerate(ids)}
+        return sorted(departments, key=lambda department: positions[department.id])
 
     async def get_info_by_id(
         self, department_id: int
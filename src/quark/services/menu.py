@@ -2,6 +2,7 @@ import uuid
 from typing import List
 
 from ..models.menu import Menu
+from ..utils import build_tree
 
 
 class MenuService:
@@ -120,22 +121,10 @@ class MenuService:
         return menus
 
     def list_to_tree(self, items, id_key, parent_key, children_key, root_id):
-        tree = []
-        lookup = {}
-
-        for item in items:
+        def factory(item, children):
             item_dict = item.__dict__.copy()
             item_dict.pop("_state", None)
-            lookup[item_dict[id_key]] = item_dict
-            item_dict[children_key] = []
-
-        for item in items:
-            item_dict = lookup[item.id]
-            parent_id = item_dict[parent_key]
-            if parent_id == root_id:
-                tree.append(item_dict)
-            else:
-                if parent_id in lookup:
-                    lookup[parent_id][children_key].append(item_dict)
-
-        return tree
+            item_dict[children_key] = children
+            return item_dict
+
+        return build_tree(items, id_key, parent_key, root_id, factory)
@@ -3,6 +3,7 @@ from typing import List
 from quark.models.menu_permission import MenuPermission
 from quark.models.role_permission import RolePermission
 
+from .. import permission_index
 from ..component.form.fields.transfer import DataSource
 from ..models.permission import Permission
 
@@ -55,3 +56,6 @@ class PermissionService:
                 for permission_id in permission_ids
             ]
         )
+
+        # 重建关联该菜单的角色权限索引
+        await permission_index.reload_menu(menu_id)
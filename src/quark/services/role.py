@@ -7,6 +7,7 @@ from quark.models.menu_permission import MenuPermission
 from quark.models.role_menu import RoleMenu
 from quark.models.role_permission import RolePermission
 
+from .. import permission_index
 from ..models import Role, UserRole
 
 
@@ -73,6 +74,9 @@ class RoleService:
                 )
                 await role_permission.save()
 
+        # 重建该角色的权限索引
+        await permission_index.reload_roles([role_id])
+
     async def add_department_to_role(
         self, role_id: int, department_ids: List[int], connection=None
     ):
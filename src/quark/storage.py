@@ -1,17 +1,26 @@
+import asyncio
 import base64
 import hashlib
 import os
+import tempfile
 import uuid
 from io import BytesIO
-from typing import List
+from typing import Any, AsyncIterator, Callable, List, Optional
 
 import filetype
 from fastapi import UploadFile
 from PIL import Image
 
+from quark import executor, object_storage
 from quark.schemas import FileInfo, MinioConfig, OSSConfig
 
 
+def image_size(source: Any) -> tuple:
+    """读取图片尺寸，只解析图片头"""
+    with Image.open(source) as img:
+        return img.size
+
+
 class Storage:
     """
     文件系统类
@@ -59,6 +68,9 @@ class Storage:
     # Minio配置
     minio_config: MinioConfig = None
 
+    # 流式读写的块大小
+    chunk_size: int = 1024 * 1024
+
     def __init__(
         self,
         file: UploadFile = None,
@@ -75,6 +87,7 @@ class Storage:
         minio_config: MinioConfig = None,
         driver: str = None,
         with_image_extra: bool = None,
+        chunk_size: int = None,
     ):
         self.file = file
         self.file_base64_str = file_base64_str
@@ -90,6 +103,13 @@ class Storage:
         self.rand_name = rand_name
         self.save_path = save_path
         self.save_name = save_name
+        if chunk_size:
+            self.chunk_size = chunk_size
+
+        # 文件内容的增量摘要与大小，首次完整读取后得到
+        self._content_md5 = None
+        self._content_sha256: Optional[str] = None
+        self._content_size: Optional[int] = None
 
     async def get_mime_type(self) -> str:
         if self.file is not None:
@@ -129,6 +149,9 @@ class Storage:
 
     async def get_size(self) -> int:
         if self.file is not None:
+            if self.file.size is None:
+                await self.digest()
+                return self._content_size
             return self.file.size
         elif self.file_base64_str is not None:
             return len(base64.b64decode(self.file_base64_str))
@@ -153,13 +176,72 @@ class Storage:
         else:
             return b""
 
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """
+        分块读取文件内容，上传文件不会整体读入内存
+        """
+        if self.file is not None and self.file_bytes is None:
+            await self.file.seek(0)
+            while True:
+                chunk = await self.file.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+            await self.file.seek(0)
+            return
+
+        data = memoryview(await self.get_bytes())
+        for start in range(0, len(data), self.chunk_size):
+            yield data[start : start + self.chunk_size]
+
+    async def stream(self, write: Optional[Callable[[bytes], Any]] = None) -> None:
+        """
+        分块读取文件，增量计算摘要，并可将每块交给 write 写入；
+        同步的 write 在线程池中执行
+        """
+        is_async = asyncio.iscoroutinefunction(write)
+        md5 = sha256 = None
+        if self._content_md5 is None:
+            md5 = hashlib.md5()
+            sha256 = hashlib.sha256()
+
+        size = 0
+        async for chunk in self.iter_chunks():
+            if md5 is not None:
+                md5.update(chunk)
+                sha256.update(chunk)
+            if is_async:
+                await write(chunk)
+            elif write is not None:
+                await asyncio.to_thread(write, chunk)
+            size += len(chunk)
+
+        if md5 is not None:
+            self._content_md5 = md5
+            self._content_sha256 = sha256.hexdigest()
+            self._content_size = size
+
+    async def digest(self) -> None:
+        """计算文件内容摘要，已计算时直接返回"""
+        if self._content_md5 is None:
+            await self.stream()
+
     async def get_hash(self) -> str:
         """
-        获取文件哈希值
+        获取文件哈希值，即 md5(文件内容 + 文件名)
+        """
+        await self.digest()
+        filename = self.save_name or (self.file.filename if self.file else "") or ""
+        md5 = self._content_md5.copy()
+        md5.update(filename.encode())
+        return md5.hexdigest()
+
+    async def get_sha256(self) -> str:
+        """
+        获取文件内容的 SHA-256
         """
-        file_bytes = await self.get_bytes()
-        filename = self.save_name or self.file.filename
-        return hashlib.md5(file_bytes + filename.encode()).hexdigest()
+        await self.digest()
+        return self._content_sha256
 
     async def check_limit(self):
         """
@@ -172,11 +254,19 @@ class Storage:
         if self.limit_type and not any(t in file_mime_type for t in self.limit_type):
             raise ValueError("文件类型不允许")
         if self.limit_image_width and self.limit_image_height:
-            # 检查图片尺寸
-            with Image.open(BytesIO(await self.get_bytes())) as img:
-                width, height = img.size
-                if width > self.limit_image_width or height > self.limit_image_height:
-                    raise ValueError("图片尺寸超出限制")
+            # 检查图片尺寸，只读取图片头
+            if self.file is not None and self.file_bytes is None:
+                await self.file.seek(0)
+                source = self.file.file
+            else:
+                source = BytesIO(await self.get_bytes())
+            try:
+                width, height = await executor.run(image_size, source)
+            finally:
+                if self.file is not None:
+                    await self.file.seek(0)
+            if width > self.limit_image_width or height > self.limit_image_height:
+                raise ValueError("图片尺寸超出限制")
 
     def path(self, path: str) -> "Storage":
         """
@@ -210,6 +300,13 @@ class Storage:
         except Exception as e:
             raise e
 
+    def get_filename(self, ext: str) -> str:
+        """保存文件名"""
+        if self.rand_name:
+            return f"{uuid.uuid4()}{ext}"
+        filename = self.save_name or (self.file.filename if self.file else "")
+        return filename or f"{uuid.uuid4()}{ext}"
+
     async def _save_local(self) -> FileInfo:
         """
         本地保存文件
@@ -218,11 +315,7 @@ class Storage:
         await self.check_limit()
 
         ext = await self.get_ext()
-        # 处理文件名
-        if self.rand_name:
-            filename = f"{uuid.uuid4()}{ext}"
-        else:
-            filename = self.save_name or self.file.filename or f"{uuid.uuid4()}{ext}"
+        filename = self.get_filename(ext)
 
         # 构建完整路径
         if self.save_path:
@@ -235,13 +328,23 @@ class Storage:
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
 
-        file_bytes = await self.get_bytes()
-        file_size = await self.get_size()
         file_mime_type = await self.get_mime_type()
 
-        # 保存文件
-        with open(save_path, "wb") as f:
-            f.write(file_bytes)
+        # 分块写入同目录下的临时文件，完成后原子替换
+        fd, temp_path = tempfile.mkstemp(
+            dir=directory or ".", prefix=".upload-", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                await self.stream(f.write)
+            os.chmod(temp_path, 0o644)
+            await asyncio.to_thread(os.replace, temp_path, save_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        file_size = await self.get_size()
 
         # 创建文件信息
         file_info = FileInfo(
@@ -252,21 +355,57 @@ class Storage:
             mime_type=file_mime_type,
             url=f"{save_path}",
             hash=await self.get_hash(),
+            sha256=await self.get_sha256(),
         )
         return file_info
 
     async def _save_oss(self) -> FileInfo:
         """
-        OSS保存文件（模拟实现）
+        OSS保存文件（S3 兼容接口）
         """
-        # 这里应该实现真实的OSS上传逻辑
-        # 为简化示例，仍然保存到本地
-        return await self._save_local()
+        return await self._save_object(self.oss_config)
 
     async def _save_minio(self) -> FileInfo:
         """
-        Minio保存文件（模拟实现）
+        Minio保存文件
+        """
+        return await self._save_object(self.minio_config)
+
+    async def _save_object(self, config: object_storage.ObjectConfig) -> FileInfo:
+        """
+        分片流式上传到对象存储
+
+        开启预签名时地址保存为 s3://bucket/key，读取时生成预签名地址
         """
-        # 这里应该实现真实的Minio上传逻辑
-        # 为简化示例，仍然保存到本地
-        return await self._save_local()
+        await self.check_limit()
+
+        ext = await self.get_ext()
+        filename = self.get_filename(ext)
+        key = object_storage.object_key(config, self.save_path, filename)
+        file_mime_type = await self.get_mime_type()
+
+        client = await object_storage.get_client(config)
+        writer = object_storage.MultipartWriter(client, config, key, file_mime_type)
+        try:
+            await self.stream(writer.write)
+            await writer.finish()
+        except BaseException:
+            await writer.abort()
+            raise
+
+        reference = object_storage.reference(config, key)
+        if config.presign_expires:
+            url = reference
+        else:
+            url = object_storage.public_url(config, key)
+
+        return FileInfo(
+            name=filename,
+            ext=ext,
+            path=reference,
+            size=await self.get_size(),
+            mime_type=file_mime_type,
+            url=url,
+            hash=await self.get_hash(),
+            sha256=await self.get_sha256(),
+        )
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import psutil
+
+from . import executor
+
+logger = logging.getLogger(__name__)
+
+# 采样间隔（秒）
+INTERVAL: float = 5.0
+
+# 最近一次采样结果
+_snapshot: Dict[str, Any] = {}
+
+# 后台采样任务
+_task: Optional[asyncio.Task] = None
+
+
+def init(interval: float = 5.0) -> None:
+    """设置采样间隔"""
+    global INTERVAL
+    INTERVAL = max(0.1, interval)
+
+
+def sample(interval: Optional[float] = None) -> Dict[str, Any]:
+    """
+    采集 CPU 及内存使用率
+
+    interval 为 None 时返回距上次采集以来的 CPU 使用率，不阻塞
+    """
+    cpu_percent = psutil.cpu_percent(interval=interval)
+    memory = psutil.virtual_memory()
+    return {
+        "cpu_percent": cpu_percent,
+        "memory_total": memory.total,
+        "memory_percent": memory.percent,
+        "sampled_at": time.time(),
+    }
+
+
+async def _run() -> None:
+    # 首次采样需要短暂等待以建立 CPU 使用率基准
+    interval: Optional[float] = 0.1
+    while True:
+        try:
+            _snapshot.update(await executor.run(sample, interval))
+            interval = None
+        except Exception:
+            logger.exception("system sampling failed")
+        await asyncio.sleep(INTERVAL)
+
+
+def start() -> None:
+    """启动后台采样，已启动时忽略"""
+    global _task
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_run())
+
+
+async def close() -> None:
+    """停止后台采样"""
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    _task = None
+    _snapshot.clear()
+
+
+async def snapshot() -> Dict[str, Any]:
+    """
+    最近一次采样结果
+
+    首次读取时在执行池中短暂采样作为基准，并启动后台采样
+    """
+    if not _snapshot:
+        _snapshot.update(await executor.run(sample, 0.1))
+    start()
+    return dict(_snapshot)
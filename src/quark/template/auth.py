@@ -1,18 +1,12 @@
-import base64
-import random
-import string
-import uuid
-from io import BytesIO
 from typing import Any, Optional
 
-from captcha.image import ImageCaptcha
 from pydantic import BaseModel, Field
 
 from quark import Message, Request
 from quark.services.auth import AuthService
 from quark.services.menu import MenuService
 
-from .. import cache
+from .. import cache, captcha_pool
 from ..component.auth.auth import Auth as AuthComponent
 from ..component.divider.divider import Divider
 from ..component.tabs.tabs import Tabs
@@ -44,22 +38,15 @@ class Auth(BaseModel):
         return self
 
     async def captcha(self, request: Request):
-        id = str(uuid.uuid4())
-        captcha_text = "".join(random.choices(string.digits, k=4))
+        # 从预渲染的验证码池中取出，池空时直接渲染
+        id, captcha_text, captcha_image = await captcha_pool.get()
         await cache.set(id, captcha_text, 60)
 
-        image = ImageCaptcha(width=170, height=50)
-        captcha_image = image.generate_image(captcha_text)
-
-        buffer = BytesIO()
-        captcha_image.save(buffer, format="PNG")
-        buffer.seek(0)
-
         return Message.success(
             "获取成功",
             {
                 "captchaEnabled": True,
-                "img": base64.b64encode(buffer.getvalue()).decode("utf-8"),
+                "img": captcha_image,
                 "uuid": id,
             },
         )
@@ -1,8 +1,10 @@
+import asyncio
 from typing import Any, List, Optional
 
 from quark import Message, Request
 from pydantic import BaseModel, Field
 
+from .. import metric_cache
 from ..component.card.card import Card
 from ..component.grid.col import Col
 from ..component.grid.row import Row
@@ -30,11 +32,17 @@ class Dashboard(BaseModel):
         body: List[Row] = []
         col_num = 0
 
+        # 并发计算各指标，设置了 cache_ttl 的指标在有效期内复用结果
+        indexes = [key for key, v in enumerate(cards) if hasattr(v, "calculate")]
+        results = await asyncio.gather(
+            *(metric_cache.evaluate(cards[key]) for key in indexes)
+        )
+        values = dict(zip(indexes, results))
+
         for key, v in enumerate(cards):
             # 断言 statistic 组件类型
             if hasattr(v, "calculate"):
-                value = await v.calculate()
-                item = Card().set_body(value)
+                item = Card().set_body(values[key])
             else:
                 item = Card()
 
@@ -9,5 +9,8 @@ class Descriptions(BaseModel):
     title: Optional[str] = None
     col: Optional[int] = None
 
+    # 结果缓存有效期（秒），0 表示每次重新计算
+    cache_ttl: float = 0
+
     def result(self, value: Any) -> DescriptionsComponent:
         return DescriptionsComponent().set_title(self.title).set_items(value)
@@ -10,6 +10,9 @@ class Value(BaseModel):
     col: Optional[int] = None
     precision: Optional[int] = None
 
+    # 结果缓存有效期（秒），0 表示每次重新计算
+    cache_ttl: float = 0
+
     # 记录条数
     def count(self, value: int) -> Statistic:
         return self.result(value)
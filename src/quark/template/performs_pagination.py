@@ -0,0 +1,234 @@
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from tortoise import fields
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+
+from .. import cache
+
+# 分页方式
+PAGINATION_OFFSET = "offset"
+PAGINATION_CURSOR = "cursor"
+
+# 总数统计方式
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATE = "estimate"
+
+# 估算行数低于该值时改用缓存的精确总数
+ESTIMATE_MIN_ROWS = 10000
+
+# 缓存键前缀
+CACHE_PREFIX = "quark:pagination:"
+
+# 各数据库的估算行数语句
+ESTIMATE_SQL = {
+    "mysql": (
+        "SELECT TABLE_ROWS AS estimate FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    ),
+    "postgres": (
+        "SELECT reltuples::bigint AS estimate FROM pg_class WHERE relname = $1"
+    ),
+}
+
+
+class PerformsPagination:
+    """
+    列表分页
+
+    offset 模式使用 limit/offset；cursor 模式按排序字段（补充主键保证唯一）
+    记录上一页末行的键值，翻页时以键值比较代替 offset
+    """
+
+    # 已筛选、未排序的查询
+    query: QuerySet
+
+    # 排序字段，倒序字段以 - 开头
+    order_fields: List[str]
+
+    # 分页方式
+    mode: str
+
+    # 总数统计方式
+    count_mode: str
+
+    # 总数及游标缓存时间（秒）
+    cache_ttl: int
+
+    def __init__(
+        self,
+        query: QuerySet,
+        order_fields: List[str],
+        mode: str = PAGINATION_OFFSET,
+        count_mode: str = COUNT_EXACT,
+        cache_ttl: int = 60,
+    ):
+        self.query = query
+        self.model = query.model
+        self.mode = mode
+        self.count_mode = count_mode
+        self.cache_ttl = cache_ttl
+
+        # 游标字段 [(字段名, 是否倒序)]，排序字段不支持游标时为 None
+        self.keys = self.keyset_fields(order_fields) if mode == PAGINATION_CURSOR else None
+        if self.keys:
+            order_fields = [("-" if desc else "") + name for name, desc in self.keys]
+        self.order_fields = order_fields
+
+        # 查询签名，用于缓存键
+        self.signature = hashlib.md5(
+            query.count().sql(params_inline=True).encode("utf-8")
+        ).hexdigest()
+
+    def keyset_fields(self, order_fields: List[str]) -> Optional[List[Tuple[str, bool]]]:
+        """解析游标字段，排序字段须为模型自身的数据字段"""
+        fields_map = self.model._meta.fields_map
+        keys = []
+        for order in order_fields:
+            desc = order.startswith("-")
+            name = order.lstrip("-+")
+            field = fields_map.get(name)
+            if field is None or field.has_db_field is False:
+                return None
+            keys.append((name, desc))
+
+        # 补充主键，保证排序唯一
+        pk = self.model._meta.pk_attr
+        if pk not in [name for name, _ in keys]:
+            keys.append((pk, keys[-1][1] if keys else True))
+        return keys
+
+    async def paginate(
+        self, current: int, page_size: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Any], int, Optional[str]]:
+        """
+        查询当前页数据，返回 (数据, 总数, 下一页游标)
+        """
+        total = await self.count()
+        query = self.query.order_by(*self.order_fields)
+        if not self.keys:
+            items = await query.limit(page_size).offset((current - 1) * page_size)
+            return items, total, None
+
+        # 未传入游标时使用上一次翻页缓存的游标
+        if not cursor and current > 1:
+            cursor = await cache.get(self.cursor_key(page_size, current))
+
+        keyset = self.keyset_filter(cursor) if cursor else None
+        if keyset is not None:
+            items = await query.filter(keyset).limit(page_size)
+        else:
+            items = await query.limit(page_size).offset((current - 1) * page_size)
+
+        next_cursor = None
+        if len(items) == page_size:
+            next_cursor = self.encode_cursor(items[-1])
+            if next_cursor:
+                await cache.set(
+                    self.cursor_key(page_size, current + 1),
+                    next_cursor,
+                    self.cache_ttl,
+                )
+
+        return items, total, next_cursor
+
+    def cursor_key(self, page_size: int, page: int) -> str:
+        orders = ",".join(self.order_fields)
+        return f"{CACHE_PREFIX}cursor:{self.signature}:{orders}:{page_size}:{page}"
+
+    def encode_cursor(self, item: Any) -> Optional[str]:
+        """将末行的游标字段编码为游标"""
+        values = []
+        for name, _ in self.keys:
+            value = getattr(item, name, None)
+            if value is None:
+                return None
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            values.append(value)
+
+        data = json.dumps(values, ensure_ascii=False, default=str)
+        return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, cursor: str) -> Optional[List[Any]]:
+        """解析游标，格式不正确时返回 None"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (ValueError, TypeError):
+            return None
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            return None
+
+        fields_map = self.model._meta.fields_map
+        result = []
+        for (name, _), value in zip(self.keys, values):
+            field = fields_map[name]
+            try:
+                if isinstance(field, fields.DatetimeField):
+                    value = datetime.fromisoformat(value)
+                elif isinstance(field, fields.DateField):
+                    value = date.fromisoformat(value)
+            except (ValueError, TypeError):
+                return None
+            result.append(value)
+        return result
+
+    def keyset_filter(self, cursor: str) -> Optional[Q]:
+        """
+        构建键值比较条件：
+        (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...，倒序字段使用 <
+        """
+        values = self.decode_cursor(cursor)
+        if values is None:
+            return None
+
+        conditions = []
+        for i, (name, desc) in enumerate(self.keys):
+            equals = {key: value for (key, _), value in zip(self.keys[:i], values)}
+            equals[f"{name}__{'lt' if desc else 'gt'}"] = values[i]
+            conditions.append(Q(**equals))
+        return Q(*conditions, join_type="OR")
+
+    async def count(self) -> int:
+        """按统计方式获取总数"""
+        if self.count_mode == COUNT_ESTIMATE:
+            estimate = await self.estimate_count()
+            if estimate is not None:
+                return estimate
+        if self.count_mode in (COUNT_CACHED, COUNT_ESTIMATE):
+            return await self.cached_count()
+        return await self.query.count()
+
+    async def cached_count(self) -> int:
+        """按查询签名缓存总数"""
+        key = f"{CACHE_PREFIX}count:{self.signature}"
+        total = await cache.get(key)
+        if total is None:
+            total = await self.query.count()
+            await cache.set(key, total, self.cache_ttl)
+        return int(total)
+
+    async def estimate_count(self) -> Optional[int]:
+        """
+        无筛选条件时读取数据库估算行数，不支持的数据库或行数较少时返回 None
+        """
+        unfiltered = self.model.all().count().sql(params_inline=True)
+        if self.query.count().sql(params_inline=True) != unfiltered:
+            return None
+
+        connection = self.model._meta.db
+        sql = ESTIMATE_SQL.get(connection.capabilities.dialect)
+        if not sql:
+            return None
+
+        rows = await connection.execute_query_dict(sql, [self.model._meta.db_table])
+        if not rows or rows[0]["estimate"] is None:
+            return None
+
+        estimate = int(rows[0]["estimate"])
+        return estimate if estimate >= ESTIMATE_MIN_ROWS else None
@@ -97,13 +97,17 @@ class PerformsQueries:
         return query
 
     def apply_index_orderings(self, query: QuerySet, orderings) -> QuerySet:
+        return query.order_by(*self.index_order_fields(orderings))
+
+    # 列表查询的排序字段，倒序字段以 - 开头
+    def index_order_fields(self, orderings) -> List[str]:
         default_order = self.query_order
         if not default_order or len(default_order) == 0:
             default_order = self.index_query_order
         if not default_order or len(default_order) == 0:
             default_order = ["-id"]
 
-        return self.apply_orderings(query, orderings, default_order)
+        return self.order_fields(orderings, default_order)
 
     def apply_export_orderings(self, query: QuerySet, orderings) -> QuerySet:
         default_order = self.query_order
@@ -117,14 +121,13 @@ class PerformsQueries:
     def apply_orderings(
         self, query: QuerySet, orderings, default_order: List[str]
     ) -> QuerySet:
+        return query.order_by(*self.order_fields(orderings, default_order))
+
+    # 解析排序字段
+    def order_fields(self, orderings, default_order: List[str]) -> List[str]:
         if not orderings:
-            return query.order_by(*default_order)
-        for key, v in orderings.items():
-            if v == "descend":
-                query = query.order_by(getattr(query, key).desc())
-            else:
-                query = query.order_by(getattr(query, key).asc())
-        return query
+            return list(default_order)
+        return [f"-{key}" if v == "descend" else key for key, v in orderings.items()]
 
     # 行为查询
     def action_query(self, query: QuerySet) -> QuerySet:
@@ -69,17 +69,8 @@ class PerformsValidation:
                         return rule.message
             elif rule.rule_type == "unique":
                 try:
-                    # 通过 Tortoise ORM 获取模型
-                    table: Type[Model] = Tortoise.apps.get("models").get(
-                        rule.unique_table
-                    )
+                    table = self.get_unique_table(rule)
                     if not table:
-                        # 如果通过表名找不到，尝试通过类名查找
-                        table = Tortoise.apps.get("models").get(
-                            rule.unique_table.rstrip("s").capitalize()
-                        )
-
-                    if not table or not issubclass(table, Model):
                         return f"验证规则错误: 找不到模型 {rule.unique_table}"
 
                     # 其余代码保持不变
@@ -111,6 +102,131 @@ class PerformsValidation:
                     return f"验证规则错误: {str(e)}"
         return None
 
+    def get_unique_table(self, rule: Rule) -> Optional[Type[Model]]:
+        """获取唯一性规则对应的模型"""
+
+        # 先按数据表名查找，找不到时按类名查找
+        models = list(Tortoise.apps.get_models_iterable())
+        class_name = rule.unique_table.rstrip("s").capitalize()
+        for model in models:
+            if model._meta.db_table == rule.unique_table:
+                return model
+        for model in models:
+            if model.__name__ in (rule.unique_table, class_name):
+                return model
+        return None
+
+    async def validator_for_import_rows(
+        self, data: List[Dict[str, Any]], seen: Optional[Dict[Any, set]] = None
+    ) -> List[Optional[str]]:
+        """
+        按列批量验证导入数据，返回每行的错误信息
+
+        seen 记录此前批次已通过验证的唯一值，用于检查文件内的重复数据
+        """
+        rules = await self.rules_for_import()
+        return await self.batch_validator(rules, data, seen)
+
+    async def batch_validator(
+        self,
+        rules: List[Rule],
+        data: List[Dict[str, Any]],
+        seen: Optional[Dict[Any, set]] = None,
+    ) -> List[Optional[str]]:
+        """
+        逐条规则对整列数据验证，每行保留第一条未通过规则的提示，
+        与 validator 逐行验证的结果一致；唯一性规则每批只查询一次
+        """
+        errors: List[Optional[str]] = [None] * len(data)
+        unique_rules = []
+        for rule in rules:
+            pending = [i for i, error in enumerate(errors) if error is None]
+            if not pending:
+                break
+
+            values = [data[i].get(rule.name) for i in pending]
+            if rule.rule_type == "required":
+                failed = [value is None or value == "" for value in values]
+            elif rule.rule_type == "min":
+                failed = [
+                    isinstance(value, str) and len(value) < rule.min_value
+                    for value in values
+                ]
+            elif rule.rule_type == "max":
+                failed = [
+                    isinstance(value, str) and len(value) > rule.max_value
+                    for value in values
+                ]
+            elif rule.rule_type == "regexp":
+                pattern = rule.pattern
+                if pattern.startswith("/") and pattern.endswith("/"):
+                    pattern = pattern[1:-1]
+                regexp = re.compile(pattern)
+                failed = [
+                    isinstance(value, str) and not regexp.fullmatch(value)
+                    for value in values
+                ]
+            elif rule.rule_type == "unique":
+                table = self.get_unique_table(rule)
+                if not table:
+                    message = f"验证规则错误: 找不到模型 {rule.unique_table}"
+                    for i in pending:
+                        errors[i] = message
+                    continue
+
+                field = rule.unique_table_field
+                model_field = table._meta.fields_map.get(field)
+                values = [self.unique_value(model_field, value) for value in values]
+                lookup = list({value for value in values if value is not None})
+                exists = set()
+                if lookup:
+                    rows = await table.filter(**{f"{field}__in": lookup}).values_list(
+                        field, flat=True
+                    )
+                    exists = {self.unique_value(model_field, value) for value in rows}
+                failed = [value in exists for value in values]
+                unique_rules.append((rule, model_field))
+            else:
+                continue
+
+            for i, fail in zip(pending, failed):
+                if fail:
+                    errors[i] = rule.message
+
+        # 检查文件内的重复数据，先出现的行有效
+        if seen is None:
+            seen = {}
+        for rule, model_field in unique_rules:
+            values_seen = seen.setdefault(
+                (rule.unique_table, rule.unique_table_field), set()
+            )
+            for i, item in enumerate(data):
+                value = self.unique_value(model_field, item.get(rule.name))
+                if errors[i] is not None or value is None:
+                    continue
+                if value in values_seen:
+                    errors[i] = rule.message
+                else:
+                    values_seen.add(value)
+
+        return errors
+
+    @staticmethod
+    def unique_value(model_field: Any, value: Any) -> Any:
+        """
+        唯一性比较前将值转换为数据库字段类型
+
+        表格中的数字（如手机号 13800000000）与文本字段中保存的字符串按同一类型比较
+        """
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if value is None or model_field is None:
+            return value
+        try:
+            return model_field.to_python_value(value)
+        except (TypeError, ValueError):
+            return value
+
     async def rules_for_creation(self) -> List[Rule]:
         rules = []
         for v in self.fields:
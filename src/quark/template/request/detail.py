@@ -1,5 +1,3 @@
-import json
-from datetime import datetime
 from typing import Any, Dict, Optional
 
 from tortoise.queryset import QuerySet
@@ -7,7 +5,7 @@ from tortoise.queryset import QuerySet
 from quark import Message, Request
 
 from ..performs_queries import PerformsQueries
-from ..resolves_actions import ResolvesActions
+from ..row_serializer import RowSerializer
 
 
 class DetailRequest:
@@ -52,61 +50,9 @@ class DetailRequest:
         result = (
             await PerformsQueries(self.request).build_detail_query(self.query).first()
         )
-        fields = {}
-        for field in self.fields:
-            component = getattr(field, "component", None)
-            name = getattr(field, "name", "")
-
-            if component == "actionField":
-                # 行为字段
-                items = getattr(field, "items", [])
-                callback = field.callback
-
-                if callback:
-                    items = await callback(result)
-
-                parsed_items = []
-                for action in items:
-                    parsed_items.append(
-                        await ResolvesActions(self.request).build_action(action)
-                    )
-
-                fields[name] = parsed_items
-
-            else:
-                # 普通字段
-                callback = field.callback
-                if callback:
-                    fields[name] = await callback(result)
-                else:
-                    value = getattr(result, name, None)
-                    if value is None:
-                        continue
-
-                    if isinstance(value, str):
-                        # JSON 解析
-                        try:
-                            value = json.loads(value)
-                        except json.JSONDecodeError:
-                            pass
-
-                    # 时间字段处理
-                    if component in ("datetimeField", "dateField"):
-                        format_str = getattr(field, "format", "%Y-%m-%d %H:%M:%S")
-                        format_str = (
-                            format_str.replace("YYYY", "%Y")
-                            .replace("MM", "%m")
-                            .replace("DD", "%d")
-                            .replace("HH", "%H")
-                            .replace("mm", "%M")
-                            .replace("ss", "%S")
-                        )
-                        if isinstance(value, datetime):
-                            value = value.strftime(format_str)
-
-                    fields[name] = value
-
-        return fields
+        return await RowSerializer(
+            self.request, self.fields, image_url=False
+        ).serialize(result)
 
     async def values(self) -> Any:
         """
@@ -1,16 +1,101 @@
+import asyncio
+import csv
 import json
-from datetime import datetime
-from io import BytesIO
+import os
+import tempfile
+from datetime import date, datetime
+from io import StringIO
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from starlette.background import BackgroundTask
 from tortoise.queryset import QuerySet
 
-from quark import Request, Response
+from quark import Request, StreamingResponse
 
 from ...services.attachment import AttachmentService
 from ..performs_queries import PerformsQueries
-from ..resolves_actions import ResolvesActions
+from ..row_serializer import (
+    DATE_COMPONENTS,
+    IMAGE_COMPONENTS,
+    RowSerializer,
+    date_format,
+)
+
+# 导出格式
+FORMAT_XLSX = "xlsx"
+FORMAT_CSV = "csv"
+
+MEDIA_TYPES = {
+    FORMAT_XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    FORMAT_CSV: "text/csv; charset=utf-8",
+}
+
+# 需要转换为选项标签的组件
+OPTION_COMPONENTS = ("selectField", "checkboxField", "radioField", "switchField")
+
+# 文件读取块大小
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def remove_file(path: str) -> None:
+    """删除临时文件，已删除时忽略"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def option_transform(field: Any) -> Callable[[Any], Any]:
+    """选项列：值转换为标签，同一列内相同的值只计算一次"""
+    get_option_label = field.get_option_label
+    labels: Dict[Any, Any] = {}
+
+    def transform(value: Any) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value)
+        label = labels.get(value)
+        if label is None:
+            label = labels[value] = get_option_label(value)
+        return label
+
+    return transform
+
+
+def date_transform(field: Any) -> Callable[[Any], Any]:
+    """日期列：按字段格式输出字符串"""
+    format = date_format(getattr(field, "format", None) or "YYYY-MM-DD HH:mm:ss")
+
+    def transform(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.strftime(format)
+        return value
+
+    return transform
+
+
+def cell_value(value: Any) -> Any:
+    """将值转换为单元格可写入的类型"""
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def compile_transform(field: Any) -> Optional[Callable[[Any], Any]]:
+    """按组件类型编译列转换函数，无需转换时返回 None"""
+    component = field.component
+    if component in OPTION_COMPONENTS and hasattr(field, "get_option_label"):
+        return option_transform(field)
+    if component in DATE_COMPONENTS:
+        return date_transform(field)
+    return None
 
 
 class ExportRequest:
@@ -18,183 +103,248 @@ class ExportRequest:
     # 请求对象
     request: Request
 
+    # 资源对象
+    resource: Any
+
     # 查询对象
     query: QuerySet
 
-    # 列表页字段
+    # 导出字段
     fields: list
 
     # 搜索项
     searches: list
 
     # 全局数据排序规则
-    query_order: str
+    query_order: List[str]
+
+    # 导出数据的排序规则
+    export_query_order: List[str]
+
+    # 导出格式，xlsx 或 csv
+    format: str
 
-    # 列表页面的排序规则
-    export_query_order: str
+    # 每批查询的数据条数
+    chunk_size: int
 
     def __init__(
         self,
         request: Request,
+        resource: Any,
         query: QuerySet,
-        query_order: str,
-        export_query_order: str,
+        query_order: List[str],
+        export_query_order: List[str],
         fields: list,
         searches: list,
+        format: str = FORMAT_XLSX,
+        chunk_size: int = 1000,
     ):
         self.request = request
+        self.resource = resource
         self.query = query
         self.query_order = query_order
         self.export_query_order = export_query_order
-        self.fields = fields
+        self.fields = [field for field in fields if field.component != "actionField"]
         self.searches = searches
+        self.format = format if format in MEDIA_TYPES else FORMAT_XLSX
+        self.chunk_size = chunk_size
 
-    def handle(self):
+        # 每列的转换函数
+        self.transforms = [compile_transform(field) for field in self.fields]
+
+    async def handle(self) -> StreamingResponse:
         """
         处理导出逻辑
         """
-        data = self.query_data()
-        fields = self.fields
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Sheet1"
-
-        # 写入表头
-        for col_idx, field in enumerate(fields, start=1):
-            label = field.get("label", "")
-            ws[f"{get_column_letter(col_idx)}1"] = label
-
-        # 写入数据行
-        for row_idx, item in enumerate(data, start=2):
-            for col_idx, field in enumerate(fields, start=1):
-                name = field.get("name")
-                component = field.get("component")
-
-                value = None
-                if component == "inputNumberField" or component == "textField":
-                    value = item.get(name)
-                elif component in ["selectField", "checkboxField", "radioField"]:
-                    option_label = field.get("getOptionLabel")(item.get(name))
-                    value = option_label
-                elif component == "switchField":
-                    option_label = field.get("getOptionLabel")(item.get(name))
-                    value = option_label
-                else:
-                    value = item.get(name)
-
-                # 特殊格式处理
-                if component in ["datetimeField", "dateField"]:
-                    format_str = field.get("format", "")
-                    format_str = (
-                        format_str.replace("YYYY", "%Y")
-                        .replace("MM", "%m")
-                        .replace("DD", "%d")
-                        .replace("HH", "%H")
-                        .replace("mm", "%M")
-                        .replace("ss", "%S")
-                    )
-                    if isinstance(value, datetime):
-                        value = value.strftime(format_str)
-
-                ws[f"{get_column_letter(col_idx)}{row_idx}"] = value
-
-        # 返回 Excel 文件流
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        filename = f"data_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
-        headers = {
-            "Content-Disposition": f"attachment; filename={filename}",
-            "Content-Type": "application/octet-stream",
-        }
-
-        return Response(
-            output.getvalue(),
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers=headers,
+        path = None
+        if self.format == FORMAT_CSV:
+            content = self.csv_content()
+        else:
+            path = await self.build_xlsx()
+            content = self.file_content(path)
+
+        # 客户端提前断开等情况下文件内容未被读取，响应结束后删除临时文件
+        filename = f"data_{datetime.now().strftime('%Y%m%d%H%M%S')}.{self.format}"
+        response = StreamingResponse(
+            content,
+            media_type=MEDIA_TYPES[self.format],
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+            background=BackgroundTask(remove_file, path) if path else None,
         )
 
-    async def query_data(self):
+        try:
+            return await self.resource.after_exporting(self.request, response)
+        except BaseException:
+            if path:
+                remove_file(path)
+            raise
+
+    async def build_xlsx(self) -> str:
         """
-        查询数据
+        分批写入只写模式工作簿，返回临时文件路径
         """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Sheet1")
+        ws.append([field.label for field in self.fields])
 
-        # 获取列过滤条件
-        column_filters = self.column_filters()
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        try:
+            async for columns in self.query_columns():
+                await asyncio.to_thread(self.append_rows, ws, columns)
+            await asyncio.to_thread(wb.save, path)
+        except BaseException:
+            remove_file(path)
+            raise
+
+        return path
+
+    def append_rows(self, ws: Any, columns: List[List[Any]]) -> None:
+        """写入一批数据行"""
+        columns = [list(map(cell_value, column)) for column in columns]
+        for row in zip(*columns):
+            ws.append(row)
+
+    async def file_content(self, path: str) -> AsyncIterator[bytes]:
+        """读取导出文件，读取完成后删除"""
+        try:
+            with open(path, "rb") as file:
+                while True:
+                    chunk = await asyncio.to_thread(file.read, FILE_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            remove_file(path)
+
+    async def csv_content(self) -> AsyncIterator[bytes]:
+        """逐批生成 CSV 内容"""
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+
+        # 带 BOM 以便 Excel 识别编码
+        buffer.write("\ufeff")
+        writer.writerow([field.label for field in self.fields])
+        async for columns in self.query_columns():
+            writer.writerows(zip(*columns))
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    async def query_columns(self) -> AsyncIterator[List[List[Any]]]:
+        """
+        分批查询数据，按列返回转换后的值
+        """
+        attachment_service = AttachmentService()
+        async for rows in self.query_chunks():
+            rows = await self.resource.before_exporting(self.request, rows)
+
+            columns = []
+            for field, transform in zip(self.fields, self.transforms):
+                column = [row.get(field.name) for row in rows]
+                if field.component in IMAGE_COMPONENTS:
+                    await attachment_service.prefetch(column)
+                    column = [
+                        await attachment_service.get_image_url(value)
+                        if value is not None
+                        else None
+                        for value in column
+                    ]
+                if transform is not None:
+                    column = list(map(transform, column))
+                columns.append(column)
+
+            yield columns
+
+    async def query_chunks(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        分批查询数据
 
-        # 获取排序规则
+        默认按主键排序时使用主键游标分页，否则使用偏移分页；
+        字段均为数据表字段且没有回调时直接查询字典，不实例化模型
+        """
         orderings = self.orderings()
+        query = self.build_query(orderings)
+        model = query.model
+        pk = model._meta.pk_attr
+        names = [field.name for field in self.fields]
+        use_values = all(
+            field.name in model._meta.fields_map and not field.callback
+            for field in self.fields
+        )
 
+        serializer = RowSerializer(self.request, self.fields, transform=False)
+        descending = self.keyset_direction(query, orderings)
+        offset = 0
+        last = None
+        while True:
+            chunk_query = query
+            if descending is None:
+                chunk_query = chunk_query.offset(offset)
+            elif last is not None:
+                lookup = "lt" if descending else "gt"
+                chunk_query = chunk_query.filter(**{f"{pk}__{lookup}": last})
+            chunk_query = chunk_query.limit(self.chunk_size)
+
+            if use_values:
+                rows = await chunk_query.values(*dict.fromkeys([*names, pk]))
+                if rows:
+                    last = rows[-1][pk]
+            else:
+                items = await chunk_query
+                rows = await serializer.serialize_all(items)
+                if items:
+                    last = getattr(items[-1], pk)
+
+            if not rows:
+                break
+            yield rows
+            if len(rows) < self.chunk_size:
+                break
+            offset += len(rows)
+
+    def build_query(self, orderings: Dict[str, Any]) -> QuerySet:
+        """
+        构建导出查询
+
+        偏移分页要求排序唯一，排序字段不含主键时追加主键，
+        否则排序值相同的数据可能在批次之间重复或遗漏
+        """
         query = PerformsQueries(
             request=self.request,
             query=self.query,
-        ).build_export_query(self.searches, column_filters)
+        ).build_export_query(self.searches, self.column_filters())
 
-        query = PerformsQueries(
-            request=self.request,
-            query_order=self.query_order,
-            export_query_order=self.export_query_order,
-        ).apply_index_orderings(query, orderings)
-
-        result = query.all()
-
-        return await self.performs_list(result)
-
-    async def performs_list(self, items):
-        """
-        处理列表字段
-        """
-        result = []
-        index_fields = self.fields
-        for item in items:
-            fields = {}
-
-            for field in index_fields:
-                component = field.component
-                name = field.name
-
-                if component == "actionField":
-                    items_callback = field.callback
-                    if items_callback:
-                        action_items = await items_callback(item)
-                    else:
-                        action_items = field.items
-
-                    rendered_actions = []
-                    for action in action_items:
-                        rendered_actions.append(
-                            await ResolvesActions(self.request).build_action(action)
-                        )
-
-                    fields[name] = rendered_actions
-                else:
-                    callback = field.callback
-                    if callback:
-                        fields[name] = await callback(item)
-                    else:
-                        value = getattr(item, name, None)
-                        if value is None:
-                            continue
-
-                        # JSON 字符串解析
-                        if isinstance(value, str):
-                            if value.startswith("[") or value.startswith("{"):
-                                try:
-                                    value = json.loads(value)
-                                except:
-                                    pass
-
-                        # 图片字段处理
-                        if component in ["imageField", "imagePickerField"]:
-                            value = AttachmentService().get_image_url(value)
-
-                        fields[name] = value
-
-            result.append(fields)
-
-        return result
+        default_order = self.query_order or self.export_query_order or ["-id"]
+        order_fields = PerformsQueries(request=self.request).order_fields(
+            orderings, default_order
+        )
+        pk = query.model._meta.pk_attr
+        if pk not in [field.lstrip("-") for field in order_fields]:
+            descending = bool(order_fields) and order_fields[-1].startswith("-")
+            order_fields.append(f"-{pk}" if descending else pk)
+
+        return query.order_by(*order_fields)
+
+    def keyset_direction(
+        self, query: QuerySet, orderings: Dict[str, Any]
+    ) -> Optional[bool]:
+        """
+        仅按主键排序时返回是否倒序，其余情况返回 None
+        """
+        if orderings:
+            return None
+
+        default_order = self.query_order or self.export_query_order or ["-id"]
+        pk = query.model._meta.pk_attr
+        if list(default_order) == [f"-{pk}"]:
+            return True
+        if list(default_order) == [pk]:
+            return False
+        return None
 
     def column_filters(self):
         """
@@ -1,223 +1,305 @@
+import asyncio
 import json
 import os
 import random
 import string
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import pandas as pd
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
 from tortoise.models import Model
+from tortoise.transactions import in_transaction
 
 from quark import Message, Request
 
+from ...models.attachment import Attachment
+from ..performs_validation import PerformsValidation
+from ..resource_form import ResourceForm
+
+# 需要将标签转换为选项值的组件
+OPTION_COMPONENTS = ("selectField", "checkboxField", "radioField", "switchField")
+
+# 失败数据保存目录
+FAILED_IMPORT_PATH = "./web/app/storage/failImports/"
+
+
+def option_value_transform(field: Any) -> Callable[[Any], Any]:
+    """选项列：标签转换为选项值，同一列内相同的标签只计算一次"""
+    get_option_value = field.get_option_value
+    values: Dict[str, Any] = {}
+
+    def transform(label: Any) -> Any:
+        if label is None:
+            return None
+        label = str(label)
+        if label not in values:
+            values[label] = get_option_value(label)
+        return values[label]
+
+    return transform
+
+
+def text_transform(value: Any) -> Any:
+    """文本列：转换为字符串并去除换行"""
+    return str(value).strip("\n") if value else None
+
+
+def compile_transform(field: Any) -> Optional[Callable[[Any], Any]]:
+    """按组件类型编译列转换函数，无需转换时返回 None"""
+    component = field.component
+    if component in OPTION_COMPONENTS and hasattr(field, "get_option_value"):
+        return option_value_transform(field)
+    if component == "textField":
+        return text_transform
+    return None
+
 
 class ImportRequest:
 
     # 请求对象
-    request: Request = None
+    request: Request
+
+    # 资源对象
+    resource: Any
+
+    # 模型
+    model: Model
 
-    # 查询对象
-    query: Model = None
+    # 导入字段
+    fields: list
 
-    # 列表页字段
-    fields: list = None
+    # 每批读取的行数
+    chunk_size: int
+
+    # 每次批量写入的行数
+    batch_size: int
 
     def __init__(
         self,
         request: Request,
-        query: Model,
+        resource: Any,
+        model: Model,
         fields: list,
+        chunk_size: int = 1000,
+        batch_size: int = 500,
     ):
         self.request = request
-        self.query = query
+        self.resource = resource
+        self.model = model
         self.fields = fields
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+        # 每列的转换函数
+        self.transforms = [compile_transform(field) for field in fields]
 
-    def handle(self, index_route):
+        # 统计
+        self.total_num = 0
+        self.success_num = 0
+        self.failed_num = 0
+
+        # 失败数据表头及工作簿
+        self.failed_head: List[Any] = []
+        self.failed_workbook: Optional[Workbook] = None
+        self.failed_sheet: Any = None
+
+    async def handle(self) -> Any:
         """
         处理导入请求
         """
-        body_bytes = self.request.body()
-        data = json.loads(body_bytes)
+        data = await self.request.json()
         file_ids = data.get("fileId", [])
-
-        if not file_ids or not isinstance(file_ids, list) or len(file_ids) == 0:
+        if not file_ids or not isinstance(file_ids, list):
             return Message.error("参数错误")
 
-        file_id_info = file_ids[0]
-        file_id = file_id_info.get("id")
+        file_id = file_ids[0].get("id") if isinstance(file_ids[0], dict) else None
         if not file_id:
             return Message.error("参数错误")
 
-        # 获取Excel数据
-        import_data = self.get_excel_data(file_id)
-        if not import_data:
+        attachment = await Attachment.filter(id=file_id, status=1).first()
+        if not attachment or not os.path.exists(attachment.path):
+            return Message.error("文件不存在")
+
+        rows = self.read_rows(attachment.path)
+        head = await asyncio.to_thread(next, rows, None)
+        if head is None:
             return Message.error("文件数据为空")
 
-        # 表头与数据分离
-        import_head = import_data[0]
-        import_data = import_data[1:]
-
-        # 导入前回调
-        lists = template.before_importing(import_data)
-
-        import_result = True
-        total_num = len(lists)
-        success_num = 0
-        failed_num = 0
-        failed_data = []
-
-        fields = self.fields
-
-        for item in lists:
-            form_values = self.transform_form_values(fields, item)
-
-            # 验证器
-            validator = template.validator_for_import(form_values)
-            if validator:
-                import_result = False
-                failed_num += 1
-                padding_len = len(fields) - len(item)
-                item += [None] * padding_len
-                item.append(validator.error())
-                failed_data.append(item)
-                continue
+        self.failed_head = list(head) + ["错误信息"]
+        validation = PerformsValidation(request=self.request, fields=self.fields)
+        seen: Dict[Any, set] = {}
+        while True:
+            chunk = await asyncio.to_thread(self.next_chunk, rows)
+            if not chunk:
+                break
+            await self.import_chunk(chunk, validation, seen)
+
+        if self.failed_num == 0:
+            redirect_url = "/layout/index?api=/api/admin/{resource}/index".replace(
+                "{resource}", self.request.path_params.get("resource", "")
+            )
+            return Message.redirect_to("导入成功", redirect_url)
+
+        file_url = await asyncio.to_thread(self.save_failed)
+        html = (
+            f"<div style='margin: 20px;'>"
+            f"<p>导入总量: {self.total_num}</p>"
+            f"<p>成功数量: {self.success_num}</p>"
+            f"<p>失败数量: <span style='color:#ff4d4f'>{self.failed_num}</span> "
+            f"<a href='{file_url}' target='_blank'>下载失败数据</a></p>"
+            f"</div>"
+        )
+        return Message.success("导入完成", {"html": html})
 
-            # BeforeSaving 回调
+    def read_rows(self, path: str) -> Iterator[List[Any]]:
+        """
+        逐行读取表格，xlsx 使用只读模式，其余格式交给 pandas
+        """
+        if path.lower().endswith((".xlsx", ".xlsm")):
+            wb = load_workbook(path, read_only=True, data_only=True)
             try:
-                submit_data, err = template.before_saving(form_values)
-                if err:
-                    raise Exception(err)
-            except Exception as e:
-                import_result = False
-                failed_num += 1
-                padding_len = len(fields) - len(item)
-                item += [None] * padding_len
-                item.append(str(e))
-                failed_data.append(item)
+                for row in wb.active.iter_rows(values_only=True):
+                    yield list(row)
+            finally:
+                wb.close()
+            return
+
+        df = pd.read_excel(path, header=None, dtype=object)
+        df = df.astype(object).where(df.notna(), None)
+        for row in df.itertuples(index=False, name=None):
+            yield list(row)
+
+    def next_chunk(self, rows: Iterator[List[Any]]) -> List[List[Any]]:
+        """读取下一批非空行，并按字段数补齐或截断"""
+        size = len(self.fields)
+        chunk = []
+        for row in islice(rows, self.chunk_size):
+            if all(value is None or value == "" for value in row):
                 continue
+            chunk.append((row + [None] * size)[:size])
+        return chunk
 
-            # 提交数据
-            data_to_submit = self.get_submit_data(fields, submit_data)
+    async def import_chunk(
+        self,
+        chunk: List[List[Any]],
+        validation: PerformsValidation,
+        seen: Dict[Any, set],
+    ) -> None:
+        """验证并写入一批数据"""
+        chunk = await self.resource.before_importing(self.request, chunk)
+        self.total_num += len(chunk)
+
+        names = [field.name for field in self.fields]
+        form_values = [dict(zip(names, row)) for row in chunk]
+
+        # 按列验证
+        errors = await validation.validator_for_import_rows(form_values, seen)
+
+        # 保存前回调
+        valid = []
+        for row, values, error in zip(chunk, form_values, errors):
+            if error:
+                self.add_failed(row, error)
+                continue
             try:
-                record = YourModel(**data_to_submit)
-                db.session.add(record)
-                db.session.commit()
-
-                # AfterImported 回调
-                last_id = record.id
-                after_err = template.after_imported(last_id, data_to_submit)
-                if after_err:
-                    raise Exception(after_err)
-
-                success_num += 1
+                values = await self.resource.before_saving(self.request, values)
             except Exception as e:
-                db.session.rollback()
-                import_result = False
-                failed_num += 1
-                padding_len = len(fields) - len(item)
-                item += [None] * padding_len
-                item.append(str(e))
-                failed_data.append(item)
-
-        # 返回失败数据
-        if not import_result:
-            static_path = app.config["STATIC_PATH"]
-            storage_dir = os.path.join(static_path, "app", "storage", "failImports")
-            file_name = self.generate_random_filename(40) + ".xlsx"
-            file_url = f"//{request.host}/storage/failImports/{file_name}"
-
-            if not os.path.exists(storage_dir):
-                os.makedirs(storage_dir)
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Sheet1"
-
-            # 写入表头
-            import_head.append("错误信息")
-            for col_idx, title in enumerate(import_head, start=1):
-                ws[f"{generate_column_label(col_idx)}1"] = title
-
-            # 写入失败数据
-            for row_idx, row in enumerate(failed_data, start=2):
-                for col_idx, cell_value in enumerate(row, start=1):
-                    ws[f"{generate_column_label(col_idx)}{row_idx}"] = cell_value
-                    if col_idx == len(row):
-                        cell = ws[f"{generate_column_label(col_idx)}{row_idx}"]
-                        cell.font = Font(color="FF0000")
-
-            # 保存文件
-            file_path = os.path.join(storage_dir, file_name)
-            wb.save(file_path)
-
-            response_html = (
-                f"<div style='margin: 20px;'>"
-                f"<p>导入总量: {total_num}</p>"
-                f"<p>成功数量: {success_num}</p>"
-                f"<p>失败数量: <span style='color:#ff4d4f'>{failed_num}</span> "
-                f"<a href='{file_url}' target='_blank'>下载失败数据</a></p>"
-                f"</div>"
+                self.add_failed(row, str(e))
+                continue
+            valid.append((row, values))
+
+        # 按列转换提交数据
+        submit_data = self.get_submit_data([values for _, values in valid])
+        for start in range(0, len(valid), self.batch_size):
+            await self.insert_batch(
+                valid[start : start + self.batch_size],
+                submit_data[start : start + self.batch_size],
             )
 
-            return jsonify({"html": response_html}), 200
+    def get_submit_data(self, form_values: List[Dict[str, Any]]) -> List[Dict]:
+        """将表格值转换为模型字段值"""
+        model_fields = self.model._meta.fields_map
+        result = [
+            {name: value for name, value in values.items() if name in model_fields}
+            for values in form_values
+        ]
+        for field, transform in zip(self.fields, self.transforms):
+            name = field.name
+            if name not in model_fields:
+                continue
 
-        return redirect(
-            f"/layout/index?api={index_route.replace(':resource', request.view_args.get('resource'))}"
-        )
+            column = [values.get(name) for values in form_values]
+            if transform is not None:
+                column = list(map(transform, column))
+            for item, value in zip(result, column):
+                item[name] = value
 
-    def get_excel_data(self, file_id):
-        """
-        获取附件服务中的 Excel 数据（需根据你的业务系统实现）
-        """
-        from your_app.models import Attachment
-
-        attachment = Attachment.query.get(file_id)
-        if not attachment:
-            return []
-        file_path = attachment.file_path
-        if not os.path.exists(file_path):
-            return []
-        # 使用 openpyxl 或 pandas 读取 Excel 数据
-
-        df = pd.read_excel(file_path, header=None)
-        return df.values.tolist()
-
-    def transform_form_values(self, fields, data):
-        result = {}
-        for idx, field in enumerate(fields):
-            name = field.get("name")
-            if idx < len(data):
-                result[name] = data[idx]
+        for item in result:
+            for name, value in item.items():
+                if isinstance(value, (list, dict)):
+                    item[name] = json.dumps(value, ensure_ascii=False)
         return result
 
-    def get_submit_data(self, fields, submit_data):
-        result = {}
-
-        for field in fields:
-            component = field.get("component")
-            name = field.get("name")
-            value = submit_data.get(name)
-
-            if component == "inputNumberField":
-                result[name] = value
-            elif component == "textField":
-                result[name] = str(value).strip("\n") if value else None
-            elif component in ["selectField", "checkboxField", "radioField"]:
-                label = value
-                option_value = field.get("getOptionValue")(label)
-                result[name] = option_value
-            elif component == "switchField":
-                label = value
-                option_value = field.get("getOptionValue")(label)
-                result[name] = option_value
-            else:
-                result[name] = value
-
-            # 转换复杂类型为 JSON 字符串
-            if isinstance(result[name], (list, dict)):
-                result[name] = json.dumps(result[name])
+    async def insert_batch(self, batch: List[tuple], submit_data: List[Dict]) -> None:
+        """
+        在事务中写入一批数据
 
-        return result
+        未重写 after_imported 时使用 bulk_create；批量写入失败后逐行写入以定位失败行
+        """
+        if not self.has_after_imported():
+            try:
+                async with in_transaction():
+                    await self.model.bulk_create(
+                        [self.model(**data) for data in submit_data],
+                        batch_size=self.batch_size,
+                    )
+                self.success_num += len(batch)
+                return
+            except Exception:
+                pass
+
+        for (row, _), data in zip(batch, submit_data):
+            try:
+                async with in_transaction():
+                    instance = await self.model.create(**data)
+                    await self.resource.after_imported(
+                        self.request, instance.pk, data, instance
+                    )
+                self.success_num += 1
+            except Exception as e:
+                self.add_failed(row, str(e))
+
+    def has_after_imported(self) -> bool:
+        """资源是否重写了导入后回调"""
+        return type(self.resource).after_imported is not ResourceForm.after_imported
+
+    def add_failed(self, row: List[Any], error: str) -> None:
+        """写入失败数据"""
+        self.failed_num += 1
+        if self.failed_workbook is None:
+            self.failed_workbook = Workbook(write_only=True)
+            self.failed_sheet = self.failed_workbook.create_sheet("Sheet1")
+            self.failed_sheet.append(self.failed_head)
+
+        cell = WriteOnlyCell(self.failed_sheet, value=error)
+        cell.font = Font(color="FF0000")
+        values = [
+            json.dumps(value) if isinstance(value, (list, dict)) else value
+            for value in row
+        ]
+        self.failed_sheet.append(values + [cell])
+
+    def save_failed(self) -> str:
+        """保存失败数据，返回下载地址"""
+        if not os.path.exists(FAILED_IMPORT_PATH):
+            os.makedirs(FAILED_IMPORT_PATH)
+
+        file_name = self.generate_random_filename(40) + ".xlsx"
+        self.failed_workbook.save(os.path.join(FAILED_IMPORT_PATH, file_name))
+        return f"//{self.request.url.netloc}/storage/failImports/{file_name}"
 
     def generate_random_filename(self, length=40):
         chars = string.ascii_letters + string.digits
@@ -5,9 +5,9 @@ from tortoise.queryset import QuerySet
 
 from quark import Request
 
-from ...services.attachment import AttachmentService
+from ..performs_pagination import PerformsPagination
 from ..performs_queries import PerformsQueries
-from ..resolves_actions import ResolvesActions
+from ..row_serializer import RowSerializer
 
 
 class IndexRequest:
@@ -100,20 +100,21 @@ class IndexRequest:
         current = int(search_params.get("current", 1))
         page_size = int(search_params.get("pageSize", page_size))
 
-        # 获取总数
-        total = await query.count()
-
-        # 获取排序规则
-        index_query = PerformsQueries(
+        # 获取排序字段
+        order_fields = PerformsQueries(
             request=self.request,
             query_order=self.query_order,
             index_query_order=self.index_query_order,
-        ).apply_index_orderings(query, orderings)
+        ).index_order_fields(orderings)
 
-        # 获取当前页数据
-        results = (
-            await index_query.limit(page_size).offset((current - 1) * page_size).all()
-        )
+        # 获取总数及当前页数据
+        results, total, cursor = await PerformsPagination(
+            query,
+            order_fields,
+            mode=self.resource.pagination_mode,
+            count_mode=self.resource.count_mode,
+            cache_ttl=self.resource.pagination_cache_ttl,
+        ).paginate(current, page_size, search_params.get("cursor"))
 
         # 解析列表数据
         parsed_items = await self.performs_list(results)
@@ -126,6 +127,8 @@ class IndexRequest:
             "total": total,
             "items": parsed_items,
         }
+        if cursor:
+            data["cursor"] = cursor
 
         return data
 
@@ -157,64 +160,6 @@ class IndexRequest:
         """
         处理列表字段
         """
-        result = []
-        index_fields = self.fields
-        for item in items:
-            fields = {}
-
-            for field in index_fields:
-                component = field.component
-                name = field.name
-
-                if component == "actionField":
-                    items_callback = field.callback
-                    if items_callback:
-                        action_items = await items_callback(item)
-                    else:
-                        action_items = field.items
-
-                    rendered_actions = []
-                    for action in action_items:
-                        rendered_actions.append(
-                            await ResolvesActions(self.request).build_action(action)
-                        )
-
-                    fields[name] = rendered_actions
-                else:
-                    callback = field.callback
-                    if callback:
-                        fields[name] = await callback(item)
-                    else:
-                        value = getattr(item, name, None)
-                        if value is None:
-                            continue
-
-                        # JSON 字符串解析
-                        if isinstance(value, str):
-                            if value.startswith("[") or value.startswith("{"):
-                                try:
-                                    value = json.loads(value)
-                                except:
-                                    pass
-
-                        # 单独解析时间和日期组件
-                        if component in ["datetimeField", "dateField"]:
-                            format_str = field.format
-                            format_str = format_str.replace("YYYY", "%Y")
-                            format_str = format_str.replace("MM", "%m")
-                            format_str = format_str.replace("DD", "%d")
-                            format_str = format_str.replace("HH", "%H")
-                            format_str = format_str.replace("mm", "%M")
-                            format_str = format_str.replace("ss", "%S")
-
-                            value = value.strftime(format_str)
-
-                        # 图片字段处理
-                        if component in ["imageField", "imagePickerField"]:
-                            value = await AttachmentService().get_image_url(value)
-
-                        fields[name] = value
-
-            result.append(fields)
+        result = await RowSerializer(self.request, self.fields).serialize_all(items)
 
         return await self.resource.before_index_showing(self.request, result)
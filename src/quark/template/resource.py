@@ -1,4 +1,6 @@
-from typing import Any, Dict, List, Optional
+import functools
+import importlib
+from typing import Any, ClassVar, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 from tortoise.models import Model
@@ -6,6 +8,7 @@ from tortoise.queryset import QuerySet
 
 from quark import Message, Request
 
+from .. import schema_cache
 from ..component.form.form import Form
 from ..component.table.column import Column
 from ..component.table.search import Search
@@ -16,6 +19,7 @@ from .request.action import ActionRequest
 from .request.detail import DetailRequest
 from .request.edit import EditRequest
 from .request.editable import EditableRequest
+from .request.export import ExportRequest
 from .request.index import IndexRequest
 from .request.update import UpdateRequest
 from .resolves_fields import ResolvesFields
@@ -25,12 +29,77 @@ from .resource_edit import ResourceEdit
 from .resource_form import ResourceForm
 from .resource_index import ResourceIndex
 
+# 模块名 import 为关键字，需通过 importlib 导入
+ImportRequest = importlib.import_module(".request.import", __package__).ImportRequest
+
+
+def copy_component(value: Any) -> Any:
+    """
+    复制组件，供按请求改写使用
+
+    列表属性（如 rules）单独复制，body、when 等子组件递归复制
+    """
+    if isinstance(value, list):
+        return [copy_component(item) for item in value]
+    if not isinstance(value, BaseModel):
+        return value
+
+    copied = value.model_copy()
+    for name, child in copied.__dict__.items():
+        if name in ("body", "when", "items"):
+            copied.__dict__[name] = copy_component(child)
+        elif isinstance(child, list):
+            copied.__dict__[name] = list(child)
+    return copied
+
+
+def memoize_fields(method: Any) -> Any:
+    """缓存静态字段列表，每次调用返回副本"""
+    cache: Dict[type, List[Any]] = {}
+
+    @functools.wraps(method)
+    async def wrapper(self, request: Request) -> List[Any]:
+        cls = type(self)
+        if cls not in cache:
+            cache[cls] = await method(self, request)
+        return copy_component(cache[cls])
+
+    wrapper.__memoized__ = True
+    wrapper.cache = cache
+    return wrapper
+
 
 class Resource(
     BaseModel, ResourceIndex, ResourceForm, ResourceCreate, ResourceEdit, ResourceDetail
 ):
     """资源：增删改查"""
 
+    # 是否缓存资源原型，init 与请求无关时开启，之后每个请求复制原型而不再重新初始化
+    cache_prototype: ClassVar[bool] = False
+
+    # 是否为静态字段，fields 与请求无关时开启，字段列表只构建一次
+    static_fields: ClassVar[bool] = False
+
+    # 是否缓存页面结构，fields、searches、actions 只与管理员角色相关时开启，
+    # 列表、创建、编辑及详情页的结构按资源、角色及语言缓存，每次请求只填充数据
+    cache_schema: ClassVar[bool] = False
+
+    # 每个请求复制原型时需要单独复制的组件属性
+    prototype_components: ClassVar[List[str]] = [
+        "form",
+        "table",
+        "table_search",
+        "table_column",
+        "table_tool_bar",
+        "table_tree_bar",
+    ]
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        if cls.static_fields and not getattr(cls.fields, "__memoized__", False):
+            cls.fields = memoize_fields(cls.fields)
+
     # 页面标题
     title: str = Field(default="")
 
@@ -49,12 +118,33 @@ class Resource(
     # 导出接口的路径
     export_path: str = Field(default="/api/admin/{resource}/export")
 
+    # 导出文件格式，xlsx 或 csv
+    export_format: str = Field(default="xlsx")
+
+    # 导出时每批查询的数据条数
+    export_chunk_size: int = Field(default=1000)
+
+    # 导入时每批读取的行数
+    import_chunk_size: int = Field(default=1000)
+
+    # 导入时每次批量写入的行数
+    import_batch_size: int = Field(default=500)
+
     # 每页显示的数据条数，默认为 10
     page_size: Any = Field(default=10)
 
     # 可选的每页条数选项
     page_size_options: List[int] = Field(default_factory=lambda: [10, 20, 50, 100])
 
+    # 分页方式，offset 或 cursor（按排序字段的键值翻页）
+    pagination_mode: str = Field(default="offset")
+
+    # 总数统计方式，exact 精确统计、cached 按查询缓存、estimate 无筛选时使用数据库估算行数
+    count_mode: str = Field(default="exact")
+
+    # 分页总数及游标的缓存时间（秒）
+    pagination_cache_ttl: int = Field(default=60)
+
     # 全局数据排序规则
     query_order: List[str] = Field(default_factory=lambda: [])
 
@@ -104,6 +194,15 @@ class Resource(
         """初始化"""
         return self
 
+    def clone(self) -> "Resource":
+        """复制资源原型，组件属性单独复制，请求间互不影响"""
+        copied = self.model_copy()
+        for name in self.prototype_components:
+            component = getattr(self, name, None)
+            if isinstance(component, BaseModel):
+                setattr(copied, name, copy_component(component))
+        return copied
+
     async def fields(self, request: Request) -> List[Any]:
         """字段定义"""
         return []
@@ -180,8 +279,14 @@ class Resource(
         """
         return await self.query(request)
 
-    async def index_render(self, request: Request) -> Any:
-        """列表页渲染"""
+    async def export_query(self, request: Request) -> QuerySet:
+        """
+        导出查询
+        """
+        return await self.query(request)
+
+    async def index_query_data(self, request: Request) -> Any:
+        """列表页数据"""
 
         # 获取搜索项
         searches = await self.searches(request)
@@ -207,11 +312,25 @@ class Resource(
             page_size_options=self.page_size_options,
         ).query_data()
 
+        return index_data
+
+    async def index_render(self, request: Request) -> Any:
+        """列表页渲染"""
+        index_data = await self.index_query_data(request)
+
         # 页面组件渲染
         return Message.success(
             "ok", await self.index_component_render(request, index_data)
         )
 
+    async def index_data_render(self, request: Request) -> Any:
+        """列表页数据渲染，仅返回数据及分页信息，用于表格轮询及翻页"""
+        index_data = await self.index_query_data(request)
+
+        return Message.success(
+            "ok", await self.index_table_data(request, index_data)
+        )
+
     async def creation_render(self, request: Request) -> Any:
         """列表页渲染"""
 
@@ -228,7 +347,9 @@ class Resource(
 
         data = await request.json()
 
-        return await self.form_handle(request, model, data)
+        result = await self.form_handle(request, model, data)
+        await schema_cache.changed()
+        return result
 
     async def edit_render(self, request: Request) -> Any:
         """编辑页渲染"""
@@ -265,25 +386,31 @@ class Resource(
 
         query = await self.query(request)
 
-        return await UpdateRequest(
+        result = await UpdateRequest(
             request=request, resource=self, model=model, query=query, fields=fields
         ).handle()
+        await schema_cache.changed()
+        return result
 
     async def editable_render(self, request: Request) -> Any:
         """表格行内编辑"""
-        return await EditableRequest(
+        result = await EditableRequest(
             request=request, resource=self, query=await self.query(request)
         ).handle()
+        await schema_cache.changed()
+        return result
 
     async def action_render(self, request: Request) -> Any:
         """行为渲染"""
-        return await ActionRequest(
+        result = await ActionRequest(
             request=request,
             resource=self,
             query=await self.query(request),
             actions=await self.actions(request),
             fields=await self.fields(request),
         ).handle()
+        await schema_cache.changed()
+        return result
 
     async def action_values_render(self, request: Request) -> Any:
         """行为值渲染"""
@@ -295,6 +422,56 @@ class Resource(
             fields=await self.fields(request),
         ).values()
 
+    async def export_render(self, request: Request) -> Any:
+        """导出数据"""
+
+        # 获取搜索项
+        searches = await self.searches(request)
+
+        # 获取导出查询
+        query = await self.export_query(request)
+
+        # 获取导出字段
+        export_fields = ResolvesFields(
+            request=request,
+            fields=await self.fields(request),
+        ).export_fields()
+
+        try:
+            return await ExportRequest(
+                request=request,
+                resource=self,
+                query=query,
+                query_order=self.query_order,
+                export_query_order=self.export_query_order,
+                fields=export_fields,
+                searches=searches,
+                format=self.export_format,
+                chunk_size=self.export_chunk_size,
+            ).handle()
+        except Exception as e:
+            return Message.error(str(e))
+
+    async def import_render(self, request: Request) -> Any:
+        """导入数据"""
+
+        # 获取导入字段
+        import_fields = ResolvesFields(
+            request=request,
+            fields=await self.fields(request),
+        ).import_fields_without_when()
+
+        result = await ImportRequest(
+            request=request,
+            resource=self,
+            model=self.model,
+            fields=import_fields,
+            chunk_size=self.import_chunk_size,
+            batch_size=self.import_batch_size,
+        ).handle()
+        await schema_cache.changed()
+        return result
+
     async def detail_render(self, request: Request) -> Any:
         """详情页渲染"""
 
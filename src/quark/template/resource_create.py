@@ -1,7 +1,8 @@
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from quark import Request
 
+from .. import schema_cache
 from ..utils import replace_last
 from .resolves_actions import ResolvesActions
 from .resolves_fields import ResolvesFields
@@ -30,11 +31,9 @@ class ResourceCreate:
 
         return replace_last(request.url.path, "/create", "/store")
 
-    async def creation_component_render(
-        self, request: Request, data: Dict[str, Any]
-    ) -> Any:
+    async def creation_form_schema(self, request: Request) -> Tuple:
         """
-        渲染创建页面组件
+        创建页面结构：标题、右上角行为、提交接口、表单项及表单行为
         """
         title = await self.form_title(request)
         actions = await self.actions(request)
@@ -50,9 +49,18 @@ class ResourceCreate:
             request=request, actions=actions
         ).form_actions()
 
-        return await self.form_component_render(
-            request, title, form_extra_actions, api, fields, form_actions, data
+        return title, form_extra_actions, api, fields, form_actions
+
+    async def creation_component_render(
+        self, request: Request, data: Dict[str, Any]
+    ) -> Any:
+        """
+        渲染创建页面组件
+        """
+        schema = await schema_cache.remember(
+            self, request, "creation", self.creation_form_schema
         )
+        return await self.form_component_render(request, *schema, data)
 
     async def before_creating(self, request: Request) -> Dict[str, Any]:
         """
@@ -1,7 +1,8 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from quark import Request
 
+from .. import schema_cache
 from ..component.card.card import Card
 from ..component.tabs.tabs import Tabs
 from ..utils import replace_last
@@ -27,11 +28,9 @@ class ResourceDetail:
         """
         return f"{self.title}详情"
 
-    async def detail_component_render(
-        self, request: Request, data: Dict[str, Any]
-    ) -> Card:
+    async def detail_schema(self, request: Request) -> Tuple:
         """
-        渲染详情页组件
+        详情页结构：标题、右上角行为及详情行为；详情字段包含数据，按请求构建
         """
         title = await self.detail_title(request)
         actions = await self.actions(request)
@@ -43,6 +42,18 @@ class ResourceDetail:
             request=request, actions=actions
         ).detail_actions()
 
+        return title, detail_extra_actions, detail_actions
+
+    async def detail_component_render(
+        self, request: Request, data: Dict[str, Any]
+    ) -> Card:
+        """
+        渲染详情页组件
+        """
+        title, detail_extra_actions, detail_actions = await schema_cache.remember(
+            self, request, "detail", self.detail_schema
+        )
+
         fields = ResolvesFields(
             request=request,
             fields=await self.fields(request),
@@ -1,7 +1,8 @@
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from quark import Request
 
+from .. import schema_cache
 from ..utils import replace_last
 from .resolves_actions import ResolvesActions
 from .resolves_fields import ResolvesFields
@@ -33,11 +34,9 @@ class ResourceEdit:
 
         return replace_last(request.url.path, "/edit", "/edit/values?id=${id}")
 
-    async def update_component_render(
-        self, request: Request, data: Dict[str, Any]
-    ) -> Any:
+    async def update_form_schema(self, request: Request) -> Tuple:
         """
-        渲染编辑页组件
+        编辑页面结构：标题、右上角行为、提交接口、表单项及表单行为
         """
         title = await self.form_title(request)
         actions = await self.actions(request)
@@ -53,9 +52,18 @@ class ResourceEdit:
             request=request, actions=actions
         ).form_actions()
 
-        return await self.form_component_render(
-            request, title, form_extra_actions, api, fields, form_actions, data
+        return title, form_extra_actions, api, fields, form_actions
+
+    async def update_component_render(
+        self, request: Request, data: Dict[str, Any]
+    ) -> Any:
+        """
+        渲染编辑页组件
+        """
+        schema = await schema_cache.remember(
+            self, request, "update", self.update_form_schema
         )
+        return await self.form_component_render(request, *schema, data)
 
     async def before_editing(
         self, request: Request, data: Dict[str, Any]
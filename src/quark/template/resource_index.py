@@ -2,6 +2,8 @@ from typing import Any, Dict, List
 
 from quark import Request
 
+from .. import schema_cache
+from ..component.table.table import Table
 from ..utils import list_to_tree
 from .resolves_actions import ResolvesActions
 from .resolves_fields import ResolvesFields
@@ -85,9 +87,9 @@ class ResourceIndex:
         # 返回表格菜单
         return {"type": "tab", "items": items}
 
-    async def index_component_render(self, request: Request, data: Any) -> Any:
+    async def index_table_schema(self, request: Request) -> Table:
         """
-        列表页组件渲染主逻辑
+        列表页表格结构：列、搜索、工具栏及行内行为，不含数据
         """
         table_title = await self.index_table_title(request)
         table_extra_render = await self.index_table_extra_render(request)
@@ -111,12 +113,8 @@ class ResourceIndex:
             request=request, search=self.table_search, searches=searches
         ).index_searches()
 
-        # 是否开启树形表格
-        if self.table_list_to_tree is not None:
-            data = await self.index_table_list_to_tree(request, data)
-
         # 构建表格配置
-        table = (
+        return (
             self.table.set_polling(self.table_polling)
             .set_title(table_title)
             .set_table_extra_render(table_extra_render)
@@ -126,6 +124,21 @@ class ResourceIndex:
             .set_searches(index_searches)
         )
 
+    async def index_component_render(self, request: Request, data: Any) -> Any:
+        """
+        列表页组件渲染主逻辑
+        """
+        # 表格结构可能在请求间共享，复制后再填充数据
+        table = (
+            await schema_cache.remember(
+                self, request, "index", self.index_table_schema
+            )
+        ).model_copy()
+
+        # 是否开启树形表格
+        if self.table_list_to_tree is not None:
+            data = await self.index_table_list_to_tree(request, data)
+
         page_size = self.page_size
         if page_size is None:
             return table.set_datasource(data)
@@ -141,9 +154,41 @@ class ResourceIndex:
             items = data.get("items")
 
             return table.set_pagination(
-                current, page_size_val, int(total), 1, page_size_options
+                current,
+                page_size_val,
+                int(total),
+                1,
+                page_size_options,
+                data.get("cursor"),
             ).set_datasource(items)
 
+    async def index_table_data(self, request: Request, data: Any) -> Any:
+        """
+        列表页数据：不含表格结构，仅返回数据及分页信息
+        """
+        # 是否开启树形表格
+        if self.table_list_to_tree is not None:
+            if isinstance(data, dict):
+                data["items"] = await self.index_table_list_to_tree(
+                    request, data.get("items")
+                )
+            else:
+                data = await self.index_table_list_to_tree(request, data)
+
+        # 未分页时直接返回数据
+        if not isinstance(data, dict):
+            return {"items": data}
+
+        result = {
+            "items": data.get("items"),
+            "total": int(data.get("total") or 0),
+            "current": data.get("current"),
+            "pageSize": data.get("pageSize"),
+        }
+        if data.get("cursor"):
+            result["cursor"] = data["cursor"]
+        return result
+
     async def before_index_showing(
         self, request: Request, list: List[Dict[str, Any]]
     ) -> List[Any]:
@@ -0,0 +1,205 @@
+import json
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from quark import Request
+
+from ..services.attachment import AttachmentService
+from .resolves_actions import ResolvesActions
+
+# 值以 JSON 字符串存储的组件，列表页、详情页默认解析
+JSON_COMPONENTS = (
+    "cascaderField",
+    "checkboxField",
+    "dateRangeField",
+    "datetimeRangeField",
+    "fileField",
+    "geofenceField",
+    "listField",
+    "mapField",
+    "selectField",
+    "timeRangeField",
+    "transferField",
+    "treeField",
+    "treeSelectField",
+)
+
+# 需要格式化的日期组件
+DATE_COMPONENTS = ("datetimeField", "dateField")
+
+# 图片组件
+IMAGE_COMPONENTS = ("imageField", "imagePickerField")
+
+# 缺省值标记，列函数返回该值时不输出字段
+MISSING = object()
+
+# 列函数：(数据行) -> 值，同步或异步
+ColumnFn = Callable[[Any], Any]
+
+
+def date_format(format: str) -> str:
+    """将前端日期格式转换为 strftime 格式"""
+    return (
+        format.replace("YYYY", "%Y")
+        .replace("MM", "%m")
+        .replace("DD", "%d")
+        .replace("HH", "%H")
+        .replace("mm", "%M")
+        .replace("ss", "%S")
+    )
+
+
+def json_decodable(field: Any) -> bool:
+    """
+    字段是否解析 JSON 字符串，未声明时按组件类型判断
+
+    图片组件不转换为访问地址时（详情页）同样解析，多图的值为 [{"id":..,"url":..}]
+    """
+    json_decode = getattr(field, "json_decode", None)
+    if json_decode is None:
+        return field.component in JSON_COMPONENTS + IMAGE_COMPONENTS
+    return json_decode
+
+
+def decode_json(value: Any) -> Any:
+    if isinstance(value, str) and value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+class RowSerializer:
+    """
+    列表、详情及导出数据的行序列化
+
+    按字段编译每列的取值函数，所有数据行共用；
+    未设置回调的行为列只构建一次，各行共享
+    """
+
+    # 请求对象
+    request: Request
+
+    # 字段
+    fields: list
+
+    # 是否转换值，为 False 时仅读取原始值（导出时由列转换函数处理）
+    transform: bool
+
+    # 是否将图片字段转换为访问地址
+    image_url: bool
+
+    def __init__(
+        self,
+        request: Request,
+        fields: list,
+        transform: bool = True,
+        image_url: bool = True,
+    ):
+        self.request = request
+        self.fields = fields
+        self.transform = transform
+        self.image_url = image_url
+        self.resolves_actions = ResolvesActions(request)
+        self.attachment_service = AttachmentService()
+
+        # 需要解析访问地址的图片字段
+        self.image_names: List[str] = []
+
+        # [(字段名, 列函数, 是否异步)]
+        self.columns: List[Tuple[str, ColumnFn, bool]] = [
+            self.compile(field) for field in fields
+        ]
+
+    def compile(self, field: Any) -> Tuple[str, ColumnFn, bool]:
+        """编译单列的取值函数"""
+        name = field.name
+        component = field.component
+        callback = field.callback
+
+        if component == "actionField":
+            return name, self.compile_actions(field), True
+        if callback:
+            return name, callback, True
+
+        def get_value(item: Any) -> Any:
+            value = getattr(item, name, None)
+            return MISSING if value is None else value
+
+        if not self.transform:
+            return name, get_value, False
+
+        if self.image_url and component in IMAGE_COMPONENTS:
+            get_image_url = self.attachment_service.get_image_url
+            self.image_names.append(name)
+
+            async def image_value(item: Any) -> Any:
+                value = getattr(item, name, None)
+                if value is None:
+                    return MISSING
+                return await get_image_url(value)
+
+            return name, image_value, True
+
+        steps: List[Callable[[Any], Any]] = []
+        if json_decodable(field):
+            steps.append(decode_json)
+        if component in DATE_COMPONENTS:
+            format = date_format(
+                getattr(field, "format", None) or "YYYY-MM-DD HH:mm:ss"
+            )
+            steps.append(
+                lambda value: value.strftime(format)
+                if isinstance(value, (datetime, date))
+                else value
+            )
+        if not steps:
+            return name, get_value, False
+
+        def transform_value(item: Any) -> Any:
+            value = getattr(item, name, None)
+            if value is None:
+                return MISSING
+            for step in steps:
+                value = step(value)
+            return value
+
+        return name, transform_value, False
+
+    def compile_actions(self, field: Any) -> Callable[[Any], Awaitable[Any]]:
+        """编译行为列，未设置回调时只构建一次"""
+        callback = field.callback
+        build_action = self.resolves_actions.build_action
+        built: Dict[str, List[Any]] = {}
+
+        async def build(actions: List[Any]) -> List[Any]:
+            return [await build_action(action) for action in actions]
+
+        async def action_value(item: Any) -> Any:
+            if callback:
+                return await build(await callback(item))
+            if "items" not in built:
+                built["items"] = await build(field.items)
+            return built["items"]
+
+        return action_value
+
+    async def serialize(self, item: Any) -> Dict[str, Any]:
+        """序列化单行数据"""
+        row: Dict[str, Any] = {}
+        for name, column, is_async in self.columns:
+            value = column(item)
+            if is_async:
+                value = await value
+            if value is not MISSING:
+                row[name] = value
+        return row
+
+    async def serialize_all(self, items: List[Any]) -> List[Dict[str, Any]]:
+        """序列化多行数据，图片字段引用的附件一次查询预加载"""
+        if self.image_names:
+            await self.attachment_service.prefetch(
+                getattr(item, name, None) for item in items for name in self.image_names
+            )
+        return [await self.serialize(item) for item in items]
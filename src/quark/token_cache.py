@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from tortoise.signals import post_delete, post_save
+
+from . import cache
+from .models.user import User
+
+logger = logging.getLogger(__name__)
+
+# 两级缓存模式下，用户修改后删除对应的键，其他进程收到失效通知后移除用户快照
+USER_KEY = "token_cache:user:"
+
+# 移除全部用户快照的键
+ALL_USERS_KEY = "token_cache:users"
+
+# 缓存的令牌数量上限
+SIZE: int = 10000
+
+# 令牌载荷缓存有效期（秒），不超过令牌自身的 exp；0 表示不缓存
+TTL: float = 300
+
+# 用户快照有效期（秒），批量 update/delete 不触发模型信号，过期后重新查询；0 表示不缓存
+USER_TTL: float = 60
+
+# 令牌摘要 -> (载荷, 过期时间)
+_tokens: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+# 用户ID -> (用户, 过期时间)，用户快照只读，不应修改后保存
+_users: "OrderedDict[int, Tuple[User, float]]" = OrderedDict()
+
+# 失效版本号，查询期间发生写入时不缓存查询结果
+_version = 0
+
+# 统计
+_token_hits = 0
+_token_misses = 0
+_user_hits = 0
+_user_misses = 0
+
+
+def init(size: int = 10000, ttl: float = 300, user_ttl: float = 60) -> None:
+    """设置缓存上限及有效期"""
+    global SIZE, TTL, USER_TTL
+    SIZE = size
+    TTL = ttl
+    USER_TTL = user_ttl
+    clear()
+
+
+def clear() -> None:
+    """清空缓存"""
+    global _version
+    _tokens.clear()
+    _users.clear()
+    _version += 1
+
+
+def digest(token: str) -> str:
+    """令牌摘要，缓存中不保存原始令牌"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_payload(token: str) -> Optional[Dict[str, Any]]:
+    """读取已验证的令牌载荷，未缓存或已过期时返回 None"""
+    global _token_hits, _token_misses
+    key = digest(token)
+    item = _tokens.get(key)
+    if item is not None:
+        payload, expires_at = item
+        if time.time() < expires_at:
+            _tokens.move_to_end(key)
+            _token_hits += 1
+            return payload
+        del _tokens[key]
+    _token_misses += 1
+    return None
+
+
+def set_payload(token: str, payload: Dict[str, Any]) -> None:
+    """缓存已验证的令牌载荷，有效期不超过令牌的 exp"""
+    if not TTL or SIZE <= 0:
+        return
+    expires_at = time.time() + TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, exp)
+    key = digest(token)
+    _tokens[key] = (payload, expires_at)
+    _tokens.move_to_end(key)
+    while len(_tokens) > SIZE:
+        _tokens.popitem(last=False)
+
+
+def version() -> int:
+    """当前失效版本号，查询用户前读取，写入缓存时传入"""
+    return _version
+
+
+def get_user(user_id: int) -> Optional[User]:
+    """读取用户快照，未缓存或已过期时返回 None"""
+    global _user_hits, _user_misses
+    item = _users.get(user_id)
+    if item is not None:
+        user, expires_at = item
+        if time.monotonic() < expires_at:
+            _users.move_to_end(user_id)
+            _user_hits += 1
+            return user
+        del _users[user_id]
+    _user_misses += 1
+    return None
+
+
+def set_user(user: User, loaded_version: int) -> None:
+    """缓存用户快照，查询期间用户被修改时不缓存"""
+    if not USER_TTL or SIZE <= 0 or loaded_version != _version:
+        return
+    _users[user.id] = (user, time.monotonic() + USER_TTL)
+    _users.move_to_end(user.id)
+    while len(_users) > SIZE:
+        _users.popitem(last=False)
+
+
+def forget_users(ids: Optional[Iterable[Any]] = None) -> None:
+    """移除用户快照，用户被修改、禁用或删除后调用；ids 为 None 时移除全部"""
+    global _version
+    if ids is None:
+        _users.clear()
+        ids = []
+    for id in ids:
+        try:
+            _users.pop(int(id), None)
+        except (TypeError, ValueError):
+            continue
+    _version += 1
+
+
+async def publish_users(ids: Optional[Iterable[Any]] = None) -> None:
+    """
+    通知其他进程移除用户快照
+
+    仅两级缓存模式（CACHE_DRIVER=redis 且 CACHE_LOCAL_SIZE > 0）会发送通知，
+    其他模式下其他进程在快照过期后重新查询
+    """
+    keys = [ALL_USERS_KEY] if ids is None else [USER_KEY + str(id) for id in ids]
+    if not keys:
+        return
+    try:
+        await cache.delete(*keys)
+    except Exception as e:
+        logger.warning("user snapshot publish failed: %s", e)
+
+
+async def users_changed(ids: Optional[Iterable[Any]] = None) -> None:
+    """用户已修改、禁用或删除：移除本进程的用户快照并通知其他进程"""
+    ids = None if ids is None else list(ids)
+    forget_users(ids)
+    await publish_users(ids)
+
+
+def stats() -> Dict[str, int]:
+    """缓存统计"""
+    return {
+        "tokens": len(_tokens),
+        "token_hits": _token_hits,
+        "token_misses": _token_misses,
+        "users": len(_users),
+        "user_hits": _user_hits,
+        "user_misses": _user_misses,
+    }
+
+
+def _on_invalidate(names: List[str]) -> None:
+    if ALL_USERS_KEY in names:
+        forget_users()
+        return
+    ids = [name[len(USER_KEY) :] for name in names if name.startswith(USER_KEY)]
+    if ids:
+        forget_users(ids)
+
+
+cache.on_invalidate(_on_invalidate)
+
+
+@post_save(User)
+async def _on_save(sender, instance, created, using_db, update_fields) -> None:
+    await users_changed([instance.id])
+
+
+@post_delete(User)
+async def _on_delete(sender, instance, using_db) -> None:
+    await users_changed([instance.id])
@@ -1,4 +1,5 @@
-import json
+from typing import Any, Callable, Dict, Iterable, List
+
 from bcrypt import hashpw, gensalt, checkpw
 from fastapi import Request
 
@@ -13,6 +14,61 @@ def verify_password(password: str, hashed: str) -> bool:
     return checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
 
 
+def get_item_value(item: Any, key: str, default: Any = None) -> Any:
+    """读取字典或对象的字段值"""
+    if isinstance(item, dict):
+        return item.get(key, default)
+    return getattr(item, key, default)
+
+
+def build_tree(
+    items: Iterable[Any],
+    pk: str,
+    pid: str,
+    root: Any,
+    factory: Callable[[Any, List[Any]], Any],
+) -> List[Any]:
+    """
+    单次遍历构建树结构，列表项可以是字典或对象
+    :param items: 列表数据
+    :param pk: 主键字段名
+    :param pid: 父级字段名
+    :param root: 根节点的父级值
+    :param factory: 节点构造函数，参数为列表项及其已构建的子节点列表
+    :return: 树形结构列表，同级节点保持原列表顺序
+    """
+
+    # 父级值 -> 子项列表
+    groups: Dict[Any, List[Any]] = {}
+    for item in items:
+        groups.setdefault(get_item_value(item, pid), []).append(item)
+
+    # 使用显式栈后序构建，避免深层树触发递归上限
+    path = {root}
+    tree: List[Any] = []
+    stack = [(None, root, iter(groups.get(root, ())), tree)]
+    while stack:
+        parent, parent_key, children, built = stack[-1]
+        item = next(children, None)
+        if item is None:
+            stack.pop()
+            path.discard(parent_key)
+            if stack:
+                stack[-1][3].append(factory(parent, built))
+            continue
+
+        key = get_item_value(item, pk)
+        if key in path:
+            raise ValueError(f"树结构存在循环引用：{pk}={key}")
+        if key in groups:
+            path.add(key)
+            stack.append((item, key, iter(groups[key]), []))
+        else:
+            built.append(factory(item, []))
+
+    return tree
+
+
 def list_to_tree(data, pk: str, pid: str, child: str, root: int):
     """
     将列表数据转换为树形结构
@@ -23,19 +79,13 @@ def list_to_tree(data, pk: str, pid: str, child: str, root: int):
     :param root: 根节点的父级值（通常为0）
     :return: 树形结构列表
     """
-    result = json.loads(json.dumps(data))  # 模拟深拷贝，处理嵌套结构
-    tree_list = []
 
-    for item in result:
-        if item.get(pid) == root:
-            children = list_to_tree(data, pk, pid, child, item.get(pk))
-            if children:
-                item[child] = children
-            else:
-                item[child] = None
-            tree_list.append(item)
+    def factory(item, children):
+        node = dict(item)
+        node[child] = children or None
+        return node
 
-    return tree_list
+    return build_tree(data, pk, pid, root, factory)
 
 
 def tree_to_ordered_list(tree, level: int, field: str, child: str):
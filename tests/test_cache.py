@@ -0,0 +1,438 @@
+import asyncio
+import json
+
+import pytest
+
+from quark import (
+    cache,
+    config_cache,
+    department_index,
+    permission_index,
+    schema_cache,
+    token_cache,
+)
+
+
+class Clock:
+    """可控时钟，替换 cache 模块中的 time"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedis") -> None:
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return command
+
+    async def execute(self):
+        self.client.calls += 1
+        results = []
+        for name, args, kwargs in self.commands:
+            results.append(await getattr(self.client, name)(*args, **kwargs))
+            self.client.calls -= 1
+        return results
+
+
+class FakeRedis:
+    """Redis 客户端替身，只实现缓存后端用到的命令"""
+
+    def __init__(self, clock: Clock) -> None:
+        self.clock = clock
+        self.data = {}
+        self.published = []
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        item = self.data.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= self.clock.now:
+            del self.data[key]
+            return None
+        return item[0]
+
+    async def mget(self, keys):
+        self.calls += 1
+        values = []
+        for key in keys:
+            values.append(await self.get(key))
+            self.calls -= 1
+        return values
+
+    async def pttl(self, key):
+        self.calls += 1
+        if await self.get(key) is None:
+            self.calls -= 1
+            return -2
+        self.calls -= 1
+        deadline = self.data[key][1]
+        return -1 if deadline is None else int((deadline - self.clock.now) * 1000)
+
+    async def set(self, key, value, ex=None):
+        assert isinstance(value, bytes)
+        assert ex is None or isinstance(ex, int)
+        self.data[key] = (value, self.clock.now + ex if ex else None)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def redis_backend(client: FakeRedis) -> cache.RedisBackend:
+    backend = cache.RedisBackend.__new__(cache.RedisBackend)
+    backend.client = client
+    return backend
+
+
+@pytest.fixture(params=["memory", "redis", "tiered"])
+def backend(request, clock):
+    if request.param == "memory":
+        return cache.MemoryBackend()
+    remote = redis_backend(FakeRedis(clock))
+    if request.param == "redis":
+        return remote
+    return cache.TieredBackend(remote, 100, 5, "test:invalidate")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_get_set_delete(backend):
+    async def main():
+        assert await backend.get("a") is None
+        await backend.set("a", {"name": "值", "items": (1, 2)})
+        assert await backend.get("a") == {"name": "值", "items": [1, 2]}
+        await backend.delete("a")
+        assert await backend.get("a") is None
+
+    run(main())
+
+
+def test_get_many_set_many(backend):
+    async def main():
+        await backend.set_many({"a": 1, "b": "2", "c": [3]}, 60)
+        assert await backend.get_many(["a", "b", "c", "missing"]) == {
+            "a": 1,
+            "b": "2",
+            "c": [3],
+        }
+        assert await backend.get_many([]) == {}
+        await backend.delete("a", "b")
+        assert await backend.get_many(["a", "b", "c"]) == {"c": [3]}
+
+    run(main())
+
+
+def test_expiry(backend, clock):
+    async def main():
+        await backend.set("short", "x", 1.5)
+        await backend.set("forever", "y")
+        clock.now += 1.9
+        assert await backend.get("short") == "x"
+        clock.now += 0.2
+        assert await backend.get("short") is None
+        clock.now += 3600
+        assert await backend.get("forever") == "y"
+
+    run(main())
+
+
+def test_values_are_copies(backend):
+    """各驱动读取到的都是值的副本，修改不影响缓存"""
+
+    async def main():
+        value = {"items": [1]}
+        await backend.set("a", value)
+        value["items"].append(2)
+        cached = await backend.get("a")
+        cached["items"].append(3)
+        assert await backend.get("a") == {"items": [1]}
+
+    run(main())
+
+
+def test_non_json_value_rejected(backend):
+    async def main():
+        with pytest.raises(TypeError):
+            await backend.set("a", object())
+
+    run(main())
+
+
+def test_memcached_exptime(clock):
+    assert cache.MemcachedBackend._exptime(None) == 0
+    assert cache.MemcachedBackend._exptime(0.5) == 1
+    assert cache.MemcachedBackend._exptime(60) == 60
+    assert cache.MemcachedBackend._exptime(31 * 24 * 3600) == int(clock.now) + (
+        31 * 24 * 3600
+    )
+
+
+def test_memcached_key():
+    assert cache.MemcachedBackend._key("quark:a") == b"quark:a"
+    hashed = cache.MemcachedBackend._key("a b")
+    assert hashed.startswith(b"sha1:") and b" " not in hashed
+    assert len(cache.MemcachedBackend._key("x" * 300)) < 250
+
+
+def test_tiered_reads_from_local(clock):
+    client = FakeRedis(clock)
+    backend = cache.TieredBackend(redis_backend(client), 100, 5, "test:invalidate")
+
+    async def main():
+        await backend.set("a", 1, 60)
+        client.calls = 0
+        assert await backend.get("a") == 1
+        assert await backend.get_many(["a"]) == {"a": 1}
+        assert client.calls == 0
+
+        # 本地副本过期后回源
+        clock.now += 6
+        assert await backend.get("a") == 1
+        assert client.calls == 1
+
+    run(main())
+
+
+def test_tiered_local_copy_follows_remote_ttl(clock):
+    """其他进程写入的短期值，本地副本不超过远端的剩余有效期"""
+    client = FakeRedis(clock)
+    writer = cache.TieredBackend(redis_backend(client), 100, 5, "test:invalidate")
+    reader = cache.TieredBackend(redis_backend(client), 100, 5, "test:invalidate")
+
+    async def main():
+        await writer.set("a", 1, 2)
+        assert await reader.get_many(["a"]) == {"a": 1}
+        clock.now += 1.5
+        assert await reader.get("a") == 1
+        clock.now += 1
+        assert await reader.get("a") is None
+
+    run(main())
+
+
+def test_tiered_cross_instance_invalidation(clock):
+    client = FakeRedis(clock)
+    notified = []
+    worker = cache.TieredBackend(
+        redis_backend(client), 100, 5, "test:invalidate", notified.extend
+    )
+    other = cache.TieredBackend(redis_backend(client), 100, 5, "test:invalidate")
+
+    async def main():
+        await other.set("a", "old", 60)
+        assert await worker.get("a") == "old"
+
+        await other.set("a", "new", 60)
+        # 未收到通知前读取本地副本
+        assert await worker.get("a") == "old"
+
+        channel, message = client.published[-1]
+        assert channel == "test:invalidate"
+        worker.receive(message)
+        assert await worker.get("a") == "new"
+        assert notified == ["a"]
+
+        await other.delete("a")
+        worker.receive(client.published[-1][1])
+        assert await worker.get("a") is None
+
+    run(main())
+
+
+def test_tiered_ignores_own_messages(clock):
+    client = FakeRedis(clock)
+    notified = []
+    backend = cache.TieredBackend(
+        redis_backend(client), 100, 5, "test:invalidate", notified.extend
+    )
+
+    async def main():
+        await backend.set("a", 1, 60)
+        backend.receive(client.published[-1][1])
+        client.calls = 0
+        assert await backend.get("a") == 1
+        assert client.calls == 0
+        assert notified == []
+
+    run(main())
+
+
+def test_tiered_lru_limit(clock):
+    backend = cache.TieredBackend(
+        redis_backend(FakeRedis(clock)), 2, 5, "test:invalidate"
+    )
+
+    async def main():
+        await backend.set_many({"a": 1, "b": 2, "c": 3}, 60)
+        assert list(backend._local) == ["b", "c"]
+
+    run(main())
+
+
+def test_module_api_namespaces_keys():
+    async def main():
+        cache.init("test-prefix")
+        try:
+            await cache.set("a", 1, 60)
+            await cache.set_many({"b": 2, "c": 3})
+            assert await cache.get("a") == 1
+            assert await cache.get_many(["a", "b", "missing"]) == {"a": 1, "b": 2}
+            assert "test-prefix:a" in cache.backend()._values
+            await cache.delete("a", "b")
+            assert await cache.get_many(["a", "b", "c"]) == {"c": 3}
+        finally:
+            await cache.close()
+
+    run(main())
+
+
+def test_invalidation_reloads_permission_index(monkeypatch):
+    """其他进程修改权限后，本进程的权限索引标记为失效"""
+    monkeypatch.setattr(cache, "PREFIX", "test-prefix")
+    monkeypatch.setattr(permission_index, "_loaded_at", 1.0)
+
+    message = json.dumps(
+        {"id": "other", "keys": [cache.namespaced(permission_index.CHANGED_KEY)]}
+    )
+    backend = cache.TieredBackend(None, 10, 5, "test:invalidate", cache._notify)
+    backend.receive(message)
+
+    assert permission_index._loaded_at is None
+
+
+def test_invalidation_forgets_user_snapshots(monkeypatch):
+    """其他进程禁用或删除用户后，本进程移除对应的用户快照"""
+    monkeypatch.setattr(cache, "PREFIX", "test-prefix")
+    monkeypatch.setattr(token_cache, "USER_TTL", 60)
+    token_cache.clear()
+    for id in (1, 2):
+        token_cache.set_user(token_cache.User(id=id), token_cache.version())
+
+    backend = cache.TieredBackend(None, 10, 5, "test:invalidate", cache._notify)
+    message = json.dumps(
+        {"id": "other", "keys": [cache.namespaced(token_cache.USER_KEY + "1")]}
+    )
+    backend.receive(message)
+    assert token_cache.get_user(1) is None
+    assert token_cache.get_user(2) is not None
+
+    message = json.dumps(
+        {"id": "other", "keys": [cache.namespaced(token_cache.ALL_USERS_KEY)]}
+    )
+    backend.receive(message)
+    assert token_cache.get_user(2) is None
+
+
+def test_invalidation_clears_schema_cache(monkeypatch):
+    """其他进程修改资源数据后，本进程清空页面结构缓存"""
+    monkeypatch.setattr(cache, "PREFIX", "test-prefix")
+    schema_cache._schemas["key"] = ("schema", float("inf"))
+    version = schema_cache._version
+
+    message = json.dumps(
+        {"id": "other", "keys": [cache.namespaced(schema_cache.CHANGED_KEY)]}
+    )
+    backend = cache.TieredBackend(None, 10, 5, "test:invalidate", cache._notify)
+    backend.receive(message)
+
+    assert not schema_cache._schemas
+    assert schema_cache._version == version + 1
+
+
+def test_invalidation_reloads_department_index(monkeypatch):
+    """其他进程修改部门后，本进程的部门索引标记为失效"""
+    monkeypatch.setattr(cache, "PREFIX", "test-prefix")
+    monkeypatch.setattr(department_index, "_loaded_at", 1.0)
+
+    message = json.dumps(
+        {"id": "other", "keys": [cache.namespaced(department_index.CHANGED_KEY)]}
+    )
+    backend = cache.TieredBackend(None, 10, 5, "test:invalidate", cache._notify)
+    backend.receive(message)
+
+    assert department_index._loaded_at is None
+
+
+def test_invalidation_reloads_config_cache(monkeypatch):
+    """两级缓存模式下，其他进程修改配置后，本进程的配置缓存标记为失效"""
+    monkeypatch.setattr(cache, "PREFIX", "test-prefix")
+    monkeypatch.setattr(config_cache, "_loaded_at", 1.0)
+
+    message = json.dumps(
+        {"id": "other", "keys": [cache.namespaced(config_cache.VERSION_KEY)]}
+    )
+    backend = cache.TieredBackend(None, 10, 5, "test:invalidate", cache._notify)
+    backend.receive(message)
+
+    assert config_cache._loaded_at is None
+
+
+def test_config_cache_polls_shared_version(monkeypatch, clock):
+    """共享驱动没有失效通知时，按间隔检查共享版本号"""
+    monkeypatch.setattr(cache, "DRIVER", "redis")
+    monkeypatch.setattr(cache, "_backend", redis_backend(FakeRedis(clock)))
+    monkeypatch.setattr(config_cache, "time", clock)
+    config_cache.init(sync_interval=1, ttl=60)
+    monkeypatch.setattr(config_cache, "_loaded_at", clock.now)
+    assert config_cache._polling()
+
+    async def main():
+        await config_cache._sync()
+        assert config_cache._loaded_at is not None
+
+        # 其他进程修改配置
+        await cache.set(config_cache.VERSION_KEY, "other")
+        await config_cache._sync()
+        assert config_cache._loaded_at is not None
+
+        clock.now += 1
+        await config_cache._sync()
+        assert config_cache._loaded_at is None
+
+        # 本进程写入的版本号不会使缓存再次失效
+        config_cache._loaded_at = clock.now
+        await config_cache.publish()
+        clock.now += 1
+        await config_cache._sync()
+        assert config_cache._loaded_at is not None
+
+    run(main())
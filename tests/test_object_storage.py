@@ -0,0 +1,170 @@
+import asyncio
+import socket
+import urllib.request
+
+import pytest
+from moto.server import ThreadedMotoServer
+
+from quark import loader, object_storage
+from quark.schemas import MinioConfig
+
+BUCKET = "quark-test"
+
+
+@pytest.fixture(scope="module")
+def endpoint():
+    """本地 moto S3 服务"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    yield f"127.0.0.1:{port}"
+    server.stop()
+
+
+@pytest.fixture(autouse=True)
+def reset_buckets():
+    object_storage._buckets.clear()
+    object_storage._uploads_registered = False
+    yield
+    object_storage._buckets.clear()
+    object_storage._uploads_registered = False
+
+
+def make_config(endpoint: str, **kwargs) -> MinioConfig:
+    return MinioConfig(
+        endpoint=endpoint,
+        access_key="test",
+        secret_key="test",
+        bucket=BUCKET,
+        secure=False,
+        **kwargs,
+    )
+
+
+def run(coro):
+    """每个用例在独立事件循环中执行，结束时关闭客户端"""
+
+    async def main():
+        try:
+            return await coro
+        finally:
+            await object_storage.close()
+
+    return asyncio.run(main())
+
+
+async def create_bucket(config: MinioConfig):
+    client = await object_storage.get_client(config)
+    try:
+        await client.create_bucket(Bucket=BUCKET)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+    return client
+
+
+async def read_object(client, key: str) -> bytes:
+    response = await client.get_object(Bucket=BUCKET, Key=key)
+    async with response["Body"] as body:
+        return await body.read()
+
+
+def test_multipart_upload(endpoint):
+    config = make_config(
+        endpoint, part_size=object_storage.MIN_PART_SIZE, max_concurrency=2
+    )
+    data = bytes(range(256)) * (12 * 1024 * 1024 // 256)
+
+    async def main():
+        client = await create_bucket(config)
+        writer = object_storage.MultipartWriter(
+            client, config, "files/big.bin", "application/octet-stream"
+        )
+        for i in range(0, len(data), 1024 * 1024):
+            await writer.write(data[i : i + 1024 * 1024])
+        await writer.finish()
+
+        assert writer.upload_id is not None
+        assert len(writer.tasks) == 3
+        assert await read_object(client, "files/big.bin") == data
+
+    run(main())
+
+
+def test_small_upload_uses_put_object(endpoint):
+    config = make_config(endpoint)
+
+    async def main():
+        client = await create_bucket(config)
+        writer = object_storage.MultipartWriter(client, config, "small.txt", "text/plain")
+        await writer.write(b"hello")
+        await writer.finish()
+
+        assert writer.upload_id is None
+        assert await read_object(client, "small.txt") == b"hello"
+
+    run(main())
+
+
+def test_abort_removes_parts(endpoint):
+    config = make_config(endpoint)
+
+    async def main():
+        client = await create_bucket(config)
+        writer = object_storage.MultipartWriter(
+            client, config, "aborted.bin", "application/octet-stream"
+        )
+        await writer.write(b"x" * (object_storage.MIN_PART_SIZE + 1))
+        await writer.abort()
+
+        uploads = await client.list_multipart_uploads(Bucket=BUCKET)
+        assert not uploads.get("Uploads")
+
+    run(main())
+
+
+def test_presign_url(endpoint):
+    config = make_config(endpoint, presign_expires=600)
+
+    async def main():
+        client = await create_bucket(config)
+        await client.put_object(Bucket=BUCKET, Key="images/a.png", Body=b"png")
+        return await object_storage.presign_url(f"s3://{BUCKET}/images/a.png")
+
+    url = run(main())
+    assert "X-Amz-Signature=" in url
+    with urllib.request.urlopen(url) as response:
+        assert response.read() == b"png"
+
+
+def test_public_url_without_presign(endpoint):
+    config = make_config(endpoint)
+    object_storage.register(config)
+
+    url = run(object_storage.presign_url(f"s3://{BUCKET}/images/a%20b.png"))
+    assert url == f"http://{endpoint}/{BUCKET}/images/a%2520b.png"
+
+
+def test_presign_url_registers_upload_buckets(endpoint, monkeypatch):
+    """重启后未经过上传，也能通过上传资源的配置解析已保存的地址"""
+    config = make_config(endpoint, presign_expires=600)
+
+    class Upload:
+        oss_config = None
+        minio_config = config
+
+        async def init(self, request):
+            return self
+
+    monkeypatch.setattr(loader, "load_resource_classes", lambda class_type: [Upload])
+
+    url = run(object_storage.presign_url(f"s3://{BUCKET}/images/a.png"))
+    assert url.startswith(f"http://{endpoint}/{BUCKET}/images/a.png?")
+    assert "X-Amz-Signature=" in url
+
+
+def test_presign_url_unknown_bucket(monkeypatch):
+    monkeypatch.setattr(loader, "load_resource_classes", lambda class_type: [])
+
+    assert run(object_storage.presign_url("s3://missing/a.png")) == ""
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+from tortoise import Tortoise
+
+from quark import config, loader
+from quark.install import setup_all
+from quark.models import User
+from quark.response import dumps
+from quark.services.auth import AuthService
+
+# (资源, 渲染方法, 路径, 查询参数)
+PAGES = [
+    ("user", "index_render", "/api/admin/user/index", ""),
+    ("user", "creation_render", "/api/admin/user/create", ""),
+    ("user", "edit_render", "/api/admin/user/edit", "id=1"),
+    ("user", "detail_render", "/api/admin/user/detail", "id=1"),
+    ("role", "index_render", "/api/admin/role/index", ""),
+    ("role", "creation_render", "/api/admin/role/create", ""),
+    ("menu", "index_render", "/api/admin/menu/index", ""),
+    ("menu", "creation_render", "/api/admin/menu/create", ""),
+    ("department", "index_render", "/api/admin/department/index", ""),
+    ("permission", "index_render", "/api/admin/permission/index", ""),
+    ("config", "index_render", "/api/admin/config/index", ""),
+    ("account", "form_render", "/api/admin/account/form", ""),
+]
+
+
+def make_request(path: str, query_string: str = "", headers=None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query_string.encode(),
+            "headers": [
+                (key.lower().encode(), value.encode())
+                for key, value in (headers or {}).items()
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("127.0.0.1", 8000),
+            "state": {},
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def app_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config.init(
+        {
+            "APP_NAME": "QuarkPy",
+            "APP_VERSION": "test",
+            "APP_SECRET_KEY": "test-secret-key",
+            "MODULE_PATH": str(tmp_path / "app"),
+        }
+    )
+
+
+async def render(resource: str, method: str, path: str, query_string: str):
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={"models": ["quark.models"]},
+        use_tz=False,
+    )
+    try:
+        await Tortoise.generate_schemas()
+        await setup_all()
+        user = await User.get(username="administrator")
+        token = AuthService(make_request("/")).create_token(
+            {"id": user.id, "username": user.username, "guard_name": "admin"}
+        )
+        request = make_request(
+            path, query_string, {"Authorization": f"Bearer {token}"}
+        )
+        res = await loader.load_resource_object(request, resource, "Resource")
+        return await getattr(res, method)(request)
+    finally:
+        await Tortoise.close_connections()
+
+
+@pytest.mark.parametrize("resource,method,path,query_string", PAGES)
+def test_dumps_matches_jsonable_encoder(resource, method, path, query_string):
+    """组件响应的编码结果与 JSONResponse(jsonable_encoder(..., exclude_none=True)) 一致"""
+    page = asyncio.run(render(resource, method, path, query_string))
+
+    expected = JSONResponse(content=jsonable_encoder(page, exclude_none=True)).body
+    assert dumps(page) == expected
+
+
+def test_dumps_skips_model_state():
+    """表单初始值取自模型 __dict__ 时，不输出 Tortoise 内部状态 _saved_in_db"""
+    page = asyncio.run(render("account", "form_render", "/api/admin/account/form", ""))
+
+    body = dumps(page)
+    assert b'"username":"administrator"' in body
+    assert b"_saved_in_db" not in body